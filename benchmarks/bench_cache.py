@@ -0,0 +1,49 @@
+"""Benchmark parsing a repetitive feed with and without the parse cache.
+
+Run with `python benchmarks/bench_cache.py`.
+"""
+
+import random
+import timeit
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import parse_cache as rx_parse_cache
+from optom_tools.visual_acuity import parse_cache as va_parse_cache
+
+NUMBER = 20_000
+RXS = [
+    "pl/-0.50x180",
+    "+1.00/-0.25x90",
+    "-2.00 DS",
+    "+0.75/-1.00x10 Add +2.00",
+]
+VAS = ["6/6", "6/9", "6/12", "6/7.5", "20/20"]
+
+
+def main() -> None:
+    """Print the time per record with the cache off and on."""
+    rng = random.Random(0)
+    rxs = rng.choices(RXS, k=NUMBER)
+    vas = rng.choices(VAS, k=NUMBER)
+    cases = [
+        ("Prescription(text)", lambda: [Prescription(rx) for rx in rxs]),
+        ("VisualAcuity(text)", lambda: [VisualAcuity(va) for va in vas]),
+    ]
+    for name, build in cases:
+        timings = []
+        for enabled in (False, True):
+            if enabled:
+                rx_parse_cache.enable()
+                va_parse_cache.enable()
+            timings.append(min(timeit.repeat(build, number=1, repeat=3)))
+            rx_parse_cache.disable()
+            va_parse_cache.disable()
+        uncached, cached = (t / NUMBER * 1e6 for t in timings)
+        print(
+            f"{name:20} {uncached:6.1f} -> {cached:6.1f} us"
+            f"  ({uncached / cached:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
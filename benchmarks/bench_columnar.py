@@ -0,0 +1,52 @@
+"""Compare parsing text with loading a saved batch.
+
+Run with `python benchmarks/bench_columnar.py [rows]`.
+"""
+
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from optom_tools import PrescriptionBatch
+from optom_tools.prescription import PrescriptionGenerator
+
+ROWS = 1_000_000
+# Rows read at random from a loaded batch.
+SAMPLES = 1_000
+
+
+def timed(name: str, func: Callable[[], Any]) -> Any:
+    """Print how long `func` took and give its result."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:28} {(time.perf_counter() - start) * 1e3:10.2f} ms")
+    return result
+
+
+def main(rows: int = ROWS) -> None:
+    """Parse, save and load a batch of `rows` prescriptions."""
+    texts = PrescriptionGenerator(seed=0).batch(rows).to_strings().tolist()
+    batch = timed(
+        "from_strings", lambda: PrescriptionBatch.from_strings(texts)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        timed("save", lambda: batch.save(directory))
+        timed(
+            "load(mmap=False)",
+            lambda: PrescriptionBatch.load(directory, False),
+        )
+        loaded = timed("load", lambda: PrescriptionBatch.load(directory))
+        index = np.random.default_rng(0).integers(0, rows, SAMPLES)
+        timed(
+            f"{SAMPLES} random rows",
+            lambda: [loaded[i] for i in index.tolist()],
+        )
+        timed("slice of 1000 to_strings", lambda: loaded[-1000:].to_strings())
+        timed("mean_sphere", lambda: loaded.mean_sphere.mean())
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
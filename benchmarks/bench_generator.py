@@ -0,0 +1,28 @@
+"""Benchmark generating random prescriptions.
+
+Run with `python benchmarks/bench_generator.py`.
+"""
+
+import timeit
+
+from optom_tools import Prescription
+from optom_tools.prescription import PrescriptionGenerator
+
+SIZE = 1_000_000
+
+
+def main() -> None:
+    """Print prescriptions generated per second."""
+    per_call = min(
+        timeit.repeat(lambda: Prescription().random(), number=2000, repeat=3)
+    )
+    print(f"Prescription.random()        {2000 / per_call:12,.0f} /s")
+    generator = PrescriptionGenerator(seed=0)
+    per_batch = min(
+        timeit.repeat(lambda: generator.batch(SIZE), number=1, repeat=3)
+    )
+    print(f"PrescriptionGenerator.batch  {SIZE / per_batch:12,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
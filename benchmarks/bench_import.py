@@ -0,0 +1,62 @@
+"""Measure import time with `python -X importtime` against a budget.
+
+Run with `python benchmarks/bench_import.py`. Exits with status 1 when a
+statement takes longer than its budget, so it can guard against regressions.
+"""
+
+import statistics
+import subprocess
+import sys
+from typing import List
+
+REPEAT = 7
+
+# Median cumulative import time budgets in milliseconds.
+BUDGETS_MS = {
+    "import optom_tools": 60.0,
+    "from optom_tools import Prescription": 200.0,
+    "from optom_tools import PrescriptionBatch": 400.0,
+}
+
+
+def import_time_ms(statement: str) -> float:
+    """Give the total time spent on imports when running `statement`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top level imports are not indented; nested ones are counted in them.
+        if name.startswith(" ") and not name.startswith("  "):
+            try:
+                total_us += int(cumulative)
+            except ValueError:
+                continue
+    return total_us / 1000
+
+
+def main() -> int:
+    """Print the median import time of each statement against its budget."""
+    failures: List[str] = []
+    for statement, budget in BUDGETS_MS.items():
+        median = statistics.median(
+            import_time_ms(statement) for _ in range(REPEAT)
+        )
+        status = "ok" if median <= budget else "OVER BUDGET"
+        print(
+            f"{statement:42} {median:7.1f} ms"
+            f"  (budget {budget:.0f} ms)  {status}"
+        )
+        if median > budget:
+            failures.append(statement)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Compare deduplicating with scalar canonical keys and with the index.
+
+Run with `python benchmarks/bench_index.py`.
+"""
+
+import time
+
+import numpy as np
+
+from optom_tools.prescription import PrescriptionGenerator, PrescriptionIndex
+
+ROWS = 1_000_000
+# Rows converted to models for the scalar baseline.
+SCALAR_ROWS = 50_000
+CHUNK = 100_000
+
+
+def main() -> None:
+    """Group an order history with heavy repetition."""
+    batch = PrescriptionGenerator(seed=0).batch(ROWS)
+    # Whole-degree axes in 5 degree steps, like most written prescriptions.
+    batch.axis = np.maximum(np.round(batch.axis / 5) * 5, 5)
+
+    start = time.perf_counter()
+    keys = {}
+    for rx in batch[:SCALAR_ROWS].to_prescriptions():
+        keys.setdefault(rx.canonical_key(), len(keys))
+    seconds = time.perf_counter() - start
+    print(f"scalar keys   {seconds / SCALAR_ROWS * 1e6:6.2f} us/row")
+
+    start = time.perf_counter()
+    index = PrescriptionIndex.from_batch(batch)
+    seconds = time.perf_counter() - start
+    print(f"index         {seconds / ROWS * 1e6:6.2f} us/row  {index}")
+
+    start = time.perf_counter()
+    chunked = PrescriptionIndex()
+    for first in range(0, ROWS, CHUNK):
+        chunked.add(batch[first : first + CHUNK])
+    seconds = time.perf_counter() - start
+    print(f"index chunked {seconds / ROWS * 1e6:6.2f} us/row  {chunked}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare memory of plain and interned models across a long history.
+
+Run with `python benchmarks/bench_intern.py`.
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import FrozenPrescription, PrescriptionGenerator
+from optom_tools.visual_acuity import FrozenVisualAcuity
+
+ROWS = 200_000
+# Distinct prescriptions in the history.
+DISTINCT = 500
+VAS = ["6/6", "6/9", "6/12", "6/7.5", "6/18", "20/20", "20/40", "6/60"]
+
+
+def measure(name: str, build: Callable[[str], Any], texts: List[str]) -> None:
+    """Print bytes held per row and build time.
+
+    The pools start empty, so frozen timings include filling them.
+    """
+    start = time.perf_counter()
+    rows = [build(text) for text in texts]
+    seconds = time.perf_counter() - start
+    del rows
+    gc.collect()
+    tracemalloc.start()
+    rows = [build(text) for text in texts]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:20} {current / len(rows):8.0f} B/row"
+        f"  {seconds / len(rows) * 1e6:6.1f} us/row"
+        f"  {len({id(row) for row in rows}):8} objects"
+    )
+
+
+def main() -> None:
+    """Build the same history with mutable and frozen models."""
+    distinct = PrescriptionGenerator(seed=0).batch(DISTINCT).to_strings()
+    rxs = [distinct[i % DISTINCT] for i in range(ROWS)]
+    vas = [VAS[i % len(VAS)] for i in range(ROWS)]
+    measure("VisualAcuity", VisualAcuity, vas)
+    measure("FrozenVisualAcuity", FrozenVisualAcuity, vas)
+    measure("Prescription", Prescription, rxs)
+    measure("FrozenPrescription", FrozenPrescription, rxs)
+    print(FrozenPrescription.pool.info())
+
+
+if __name__ == "__main__":
+    main()
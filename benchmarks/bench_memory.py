@@ -0,0 +1,69 @@
+"""Report the memory held by each `Prescription`.
+
+Run with `python benchmarks/bench_memory.py`.
+"""
+
+import gc
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Set
+
+from optom_tools import Prescription
+
+NUMBER = 10_000
+
+
+def deep_getsizeof(obj: Any, seen: Set[int]) -> int:
+    """Give the size of an object and everything it holds, counted once."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_getsizeof(key, seen) + deep_getsizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_getsizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_getsizeof(obj.__dict__, seen)
+        size += deep_getsizeof(getattr(obj, "__fields_set__", None), seen)
+    return size
+
+
+def traced_bytes(build: Callable[[], Any]) -> float:
+    """Give the bytes allocated per object still held after construction."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build() for _ in range(NUMBER)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / NUMBER
+
+
+def main() -> None:
+    """Print the memory footprint and construction time of prescriptions."""
+    cases = [
+        ("Plain sphere", lambda: Prescription(sphere=-2)),
+        ("Sphere and add", lambda: Prescription(sphere=1, add={"add": 2})),
+    ]
+    # Objects shared by every instance (interned strings, small ints, ...)
+    # are counted once here, not once per instance.
+    warm = [build() for _, build in cases]
+    for (name, build), rx in zip(cases, warm):
+        seen: Set[int] = set()
+        for shared in warm:
+            if shared is not rx:
+                deep_getsizeof(shared, seen)
+        print(
+            f"{name:16} getsizeof {deep_getsizeof(rx, seen):6} B"
+            f"  tracemalloc {traced_bytes(build):8.0f} B"
+            f"  construct {min(timeit.repeat(build, number=NUMBER, repeat=3)) / NUMBER * 1e6:6.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare nearest neighbour search by linear scan and with the index.
+
+Run with `python benchmarks/bench_neighbours.py`.
+"""
+
+import time
+
+import numpy as np
+
+from optom_tools.prescription import NeighbourIndex, PrescriptionGenerator
+
+ROWS = 1_000_000
+QUERIES = 10_000
+# Queries answered by the linear scan baseline.
+SCAN_QUERIES = 100
+K = 5
+RADIUS = 0.1
+
+
+def main() -> None:
+    """Find the nearest stock lenses of a day of orders."""
+    stock = PrescriptionGenerator(seed=0).batch(ROWS)
+    orders = PrescriptionGenerator(seed=1).batch(QUERIES)
+
+    start = time.perf_counter()
+    vectors = stock.power_vectors
+    for rx in orders[:SCAN_QUERIES].to_prescriptions():
+        distances = np.linalg.norm(vectors - rx.power_vector, axis=1)
+        np.argpartition(distances, K)[:K]
+    seconds = time.perf_counter() - start
+    print(f"linear scan   {seconds / SCAN_QUERIES * 1e6:9.1f} us/query")
+
+    start = time.perf_counter()
+    index = NeighbourIndex(stock)
+    seconds = time.perf_counter() - start
+    print(f"build         {seconds / ROWS * 1e6:9.2f} us/row    {index}")
+
+    start = time.perf_counter()
+    index.query(orders, k=K)
+    seconds = time.perf_counter() - start
+    print(f"k-NN          {seconds / QUERIES * 1e6:9.1f} us/query")
+
+    start = time.perf_counter()
+    index.query_radius(orders, RADIUS)
+    seconds = time.perf_counter() - start
+    print(f"radius        {seconds / QUERIES * 1e6:9.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
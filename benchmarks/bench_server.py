@@ -0,0 +1,63 @@
+"""Compare server throughput with and without micro-batching.
+
+Run with `python benchmarks/bench_server.py [clients] [requests]`.
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from optom_tools.server import OptomServer
+
+CLIENTS = 50
+REQUESTS = 100
+BODY = json.dumps({"va": "6/60"}).encode()
+REQUEST = (
+    b"POST /va/logmar HTTP/1.1\r\n"
+    + f"Content-Length: {len(BODY)}\r\n\r\n".encode()
+    + BODY
+)
+
+
+async def client(port: int, requests: int) -> None:
+    """Send requests one after another on a kept-alive connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(requests):
+        writer.write(REQUEST)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+    writer.close()
+
+
+async def measure(max_batch_size: int, clients: int, requests: int) -> None:
+    """Print throughput and latency for one batch size."""
+    async with OptomServer(port=0, max_batch_size=max_batch_size) as server:
+        port = server.address[1]
+        start = time.perf_counter()
+        await asyncio.gather(*(client(port, requests) for _ in range(clients)))
+        seconds = time.perf_counter() - start
+        stats = server.stats()
+    print(
+        f"max_batch_size={max_batch_size:<4} "
+        f"{clients * requests / seconds:8.0f} requests/s"
+        f"  mean batch {stats.mean_batch_size:6.1f}"
+        f"  p50 {stats.p50_ms:5.2f} ms  p99 {stats.p99_ms:5.2f} ms"
+    )
+
+
+def main(clients: int = CLIENTS, requests: int = REQUESTS) -> None:
+    """Run the clients against servers with and without batching."""
+    for max_batch_size in (1, 256):
+        asyncio.run(measure(max_batch_size, clients, requests))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
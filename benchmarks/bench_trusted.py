@@ -0,0 +1,78 @@
+"""Benchmark validated against trusted construction, transpose and parse.
+
+Run with `python benchmarks/bench_trusted.py`.
+"""
+
+import timeit
+from typing import List
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import parse_rx
+from optom_tools.utils import no_assignment_validation
+
+NUMBER = 20_000
+RX = "+1.00/-1.00x90 Add +2.00@40"
+FIELDS = {"sphere": 1.0, "cylinder": -1.0, "axis": 90.0, "add": {"add": 2.0}}
+
+
+def _transpose(rxs: List[Prescription]) -> None:
+    for rx in rxs:
+        rx.transpose()
+
+
+def _transpose_trusted(rxs: List[Prescription]) -> None:
+    with no_assignment_validation():
+        for rx in rxs:
+            rx.transpose()
+
+
+def _parse() -> Prescription:
+    return Prescription(RX)
+
+
+def _parse_trusted() -> Prescription:
+    return Prescription.from_trusted(**parse_rx(RX).to_kwargs())
+
+
+def _time(func, per_call: int = 1) -> float:
+    """Give the best time per record in microseconds."""
+    number = NUMBER // per_call
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return best / (number * per_call) * 1e6
+
+
+def main() -> None:
+    """Print timings for each operation."""
+    rxs = [Prescription(**FIELDS) for _ in range(100)]
+    cases = [
+        (
+            "Prescription construct",
+            lambda: Prescription(**FIELDS),
+            lambda: Prescription.from_trusted(**FIELDS),
+        ),
+        (
+            "VisualAcuity construct",
+            lambda: VisualAcuity(numerator=6, denominator=12),
+            lambda: VisualAcuity.from_trusted(numerator=6, denominator=12),
+        ),
+        (
+            "Prescription transpose",
+            lambda: _transpose(rxs),
+            lambda: _transpose_trusted(rxs),
+        ),
+        ("Prescription parse", _parse, _parse_trusted),
+    ]
+    print(
+        f"{'operation':<24}{'validated us':>14}{'trusted us':>12}{'speedup':>9}"
+    )
+    for name, validated, trusted in cases:
+        per_call = len(rxs) if "transpose" in name else 1
+        before = _time(validated, per_call)
+        after = _time(trusted, per_call)
+        print(
+            f"{name:<24}{before:>14.2f}{after:>12.2f}{before / after:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
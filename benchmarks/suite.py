@@ -0,0 +1,419 @@
+"""Benchmark suite covering the public hot paths.
+
+Times each case at several input sizes, recording throughput and peak
+memory, and saves the results as JSON. With `--compare` the results are
+checked against a stored baseline and the exit status is 1 on regression.
+
+Run with `make bench`, or directly:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+import optom_tools
+from optom_tools import (
+    Prescription,
+    PrescriptionBatch,
+    VisualAcuity,
+    VisualAcuityBatch,
+)
+from optom_tools.prescription import FrozenPrescription, PrescriptionGenerator
+from optom_tools.stats import PrescriptionStats
+from optom_tools.utils import strip_decimal
+from optom_tools.visual_acuity import ETDRS, numeric_backend
+
+DEFAULT_SIZES = (1, 100, 10_000)
+DEFAULT_THRESHOLD = 0.15
+# Peak memory below this many bytes is too noisy to compare.
+MEMORY_SLACK_BYTES = 4096
+
+VAS = ["6/6", "6/9", "6/12", "6/7.5", "6/18", "20/20", "20/40", "6/60"]
+FIELDS = {"sphere": 1.0, "cylinder": -1.0, "axis": 90.0, "add": {"add": 2.0}}
+
+Setup = Callable[[int], Callable[[], Any]]
+
+
+class Result(NamedTuple):
+    """Timing of one case at one input size."""
+
+    name: str
+    size: int
+    seconds: float
+    ops_per_sec: float
+    peak_bytes: int
+
+
+def _rx_strings(size: int) -> List[str]:
+    """Give realistic prescription strings."""
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    return batch.to_strings().tolist()
+
+
+def _va_strings(size: int) -> List[str]:
+    """Give common visual acuity strings."""
+    return [VAS[i % len(VAS)] for i in range(size)]
+
+
+def _prescriptions(size: int) -> List[Prescription]:
+    """Give validated prescriptions."""
+    return [Prescription(rx) for rx in _rx_strings(size)]
+
+
+def _visual_acuities(size: int) -> List[VisualAcuity]:
+    """Give validated visual acuities."""
+    return [VisualAcuity(va) for va in _va_strings(size)]
+
+
+def _construct(size: int) -> Callable[[], Any]:
+    return lambda: [Prescription(**FIELDS) for _ in range(size)]
+
+
+def _parse(size: int) -> Callable[[], Any]:
+    rxs = _rx_strings(size)
+    return lambda: [Prescription(rx) for rx in rxs]
+
+
+def _parse_frozen(size: int) -> Callable[[], Any]:
+    rxs = _rx_strings(size)
+    return lambda: [FrozenPrescription(rx) for rx in rxs]
+
+
+def _parse_method(size: int) -> Callable[[], Any]:
+    pairs = list(zip(_prescriptions(size), _rx_strings(size)))
+    return lambda: [rx.parse(text) for rx, text in pairs]
+
+
+def _transpose(size: int) -> Callable[[], Any]:
+    rxs = _prescriptions(size)
+    return lambda: [rx.transpose() for rx in rxs]
+
+
+def _vertex(size: int) -> Callable[[], Any]:
+    rxs = _prescriptions(size)
+
+    def run() -> None:
+        for rx in rxs:
+            rx.vertex_compensate(0)
+            rx.vertex_compensate(12)
+
+    return run
+
+
+def _random(size: int) -> Callable[[], Any]:
+    rxs = [Prescription() for _ in range(size)]
+    return lambda: [rx.random(seed=i) for i, rx in enumerate(rxs)]
+
+
+def _rx_str(size: int) -> Callable[[], Any]:
+    rxs = _prescriptions(size)
+    return lambda: [str(rx) for rx in rxs]
+
+
+def _va_parse(size: int) -> Callable[[], Any]:
+    vas = _va_strings(size)
+    return lambda: [VisualAcuity(va) for va in vas]
+
+
+def _logmar(size: int) -> Callable[[], Any]:
+    vas = _visual_acuities(size)
+    return lambda: [va.logmar for va in vas]
+
+
+def _decimal(size: int) -> Callable[[], Any]:
+    vas = _visual_acuities(size)
+    return lambda: [va.decimal for va in vas]
+
+
+def _convert_unit(size: int) -> Callable[[], Any]:
+    vas = _visual_acuities(size)
+
+    def run() -> None:
+        for va in vas:
+            va.convert_unit("ft")
+            va.convert_unit("m")
+
+    return run
+
+
+def _ft_m(size: int) -> Callable[[], Any]:
+    vas = _visual_acuities(size)
+    return lambda: [(va.ft, va.m) for va in vas]
+
+
+def _strip_decimal(size: int) -> Callable[[], Any]:
+    values = [i / 4 for i in range(size)]
+    return lambda: [strip_decimal(value) for value in values]
+
+
+def _batch_from_strings(size: int) -> Callable[[], Any]:
+    rxs = _rx_strings(size)
+    return lambda: PrescriptionBatch.from_strings(rxs)
+
+
+def _batch_transpose(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    return lambda: batch.transpose()
+
+
+def _batch_to_strings(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    return batch.to_strings
+
+
+def _batch_vertex(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+
+    def run() -> None:
+        batch.vertex_compensate(0)
+        batch.vertex_compensate(12)
+
+    return run
+
+
+def _batch_mean(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    return batch.mean
+
+
+def _batch_distance(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    other = PrescriptionGenerator(seed=1).batch(size)
+    return lambda: batch.distance(other)
+
+
+def _va_batch_logmar(size: int) -> Callable[[], Any]:
+    batch = VisualAcuityBatch.from_strings(_va_strings(size))
+    return lambda: batch.logmar
+
+
+def _va_batch_decimal(size: int) -> Callable[[], Any]:
+    batch = VisualAcuityBatch.from_strings(_va_strings(size))
+    return lambda: batch.decimal
+
+
+def _va_batch_ft_m(size: int) -> Callable[[], Any]:
+    batch = VisualAcuityBatch.from_strings(_va_strings(size))
+    return lambda: (batch.ft, batch.m)
+
+
+def _va_batch_snap(size: int) -> Callable[[], Any]:
+    batch = VisualAcuityBatch.from_logmar(np.linspace(-1.3, 0.3, size))
+    return batch.snap_to_chart
+
+
+def _etdrs_table(size: int) -> Callable[[], Any]:
+    table = np.random.default_rng(0).integers(0, 6, (size, 14))
+    return lambda: ETDRS.score_table(table)
+
+
+def _generator(size: int) -> Callable[[], Any]:
+    generator = PrescriptionGenerator(seed=0)
+    return lambda: generator.batch(size)
+
+
+def _stats(size: int) -> Callable[[], Any]:
+    batch = PrescriptionGenerator(seed=0).batch(size)
+    return lambda: PrescriptionStats().update(batch)
+
+
+def _in_mode(setup: Setup, mode: str) -> Setup:
+    """Run a case with `numeric_backend` in another mode."""
+
+    def wrapped(size: int) -> Callable[[], Any]:
+        func = setup(size)
+
+        def run() -> Any:
+            with numeric_backend.use(mode):  # type: ignore[arg-type]
+                return func()
+
+        return run
+
+    return wrapped
+
+
+CASES: Dict[str, Setup] = {
+    "Prescription(**kwargs)": _construct,
+    "Prescription(text)": _parse,
+    "FrozenPrescription(text)": _parse_frozen,
+    "Prescription.parse": _parse_method,
+    "Prescription.transpose": _transpose,
+    "Prescription.vertex_compensate": _vertex,
+    "Prescription.random": _random,
+    "Prescription.__str__": _rx_str,
+    "VisualAcuity(text)": _va_parse,
+    "VisualAcuity.logmar": _logmar,
+    "VisualAcuity.logmar[decimal]": _in_mode(_logmar, "decimal"),
+    "VisualAcuity.logmar[fraction]": _in_mode(_logmar, "fraction"),
+    "VisualAcuity.decimal": _decimal,
+    "VisualAcuity.decimal[decimal]": _in_mode(_decimal, "decimal"),
+    "VisualAcuity.decimal[fraction]": _in_mode(_decimal, "fraction"),
+    "VisualAcuity.convert_unit": _convert_unit,
+    "VisualAcuity.ft/.m": _ft_m,
+    "strip_decimal": _strip_decimal,
+    "PrescriptionBatch.from_strings": _batch_from_strings,
+    "PrescriptionBatch.transpose": _batch_transpose,
+    "PrescriptionBatch.to_strings": _batch_to_strings,
+    "PrescriptionBatch.vertex_compensate": _batch_vertex,
+    "PrescriptionBatch.mean": _batch_mean,
+    "PrescriptionBatch.distance": _batch_distance,
+    "VisualAcuityBatch.logmar": _va_batch_logmar,
+    "VisualAcuityBatch.logmar[decimal]": _in_mode(_va_batch_logmar, "decimal"),
+    "VisualAcuityBatch.logmar[fraction]": _in_mode(
+        _va_batch_logmar, "fraction"
+    ),
+    "VisualAcuityBatch.decimal": _va_batch_decimal,
+    "VisualAcuityBatch.decimal[decimal]": _in_mode(
+        _va_batch_decimal, "decimal"
+    ),
+    "VisualAcuityBatch.decimal[fraction]": _in_mode(
+        _va_batch_decimal, "fraction"
+    ),
+    "VisualAcuityBatch.ft/.m": _va_batch_ft_m,
+    "VisualAcuityBatch.snap_to_chart": _va_batch_snap,
+    "LetterChart.score_table": _etdrs_table,
+    "PrescriptionGenerator.batch": _generator,
+    "PrescriptionStats.update": _stats,
+}
+
+
+def run_case(name: str, setup: Setup, size: int, repeat: int) -> Result:
+    """Time one case, taking the best of `repeat` runs.
+
+    Peak memory is measured on a separate run, as tracing slows the code.
+    """
+    func = setup(size)
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(name, size, seconds, size / seconds, peak)
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    names: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+) -> List[Result]:
+    """Run the suite, printing each result as it is measured."""
+    results = []
+    for name, setup in CASES.items():
+        if names and not any(part in name for part in names):
+            continue
+        for size in sizes:
+            result = run_case(name, setup, size, repeat)
+            print(
+                f"{name:36} n={size:<7} {result.ops_per_sec:14,.0f} ops/s"
+                f"  peak {result.peak_bytes / 1024:10,.1f} KiB"
+            )
+            results.append(result)
+    return results
+
+
+def to_json(results: List[Result]) -> Dict[str, Any]:
+    """Give the results with details of the environment."""
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "optom_tools": optom_tools.__version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": [result._asdict() for result in results],
+    }
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Compare results with a baseline, giving a line per regression.
+
+    A regression is throughput lower, or peak memory higher, than the
+    baseline by more than `threshold` (a fraction).
+    """
+    stored = {(row["name"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for result in results:
+        row = stored.get((result.name, result.size))
+        if row is None:
+            continue
+        speed = result.ops_per_sec / row["ops_per_sec"]
+        growth = result.peak_bytes / max(row["peak_bytes"], 1)
+        flags = []
+        if speed < 1 - threshold:
+            flags.append(f"throughput {speed:.2f}x")
+        if (
+            result.peak_bytes - row["peak_bytes"] > MEMORY_SLACK_BYTES
+            and growth > 1 + threshold
+        ):
+            flags.append(f"peak memory {growth:.2f}x")
+        label = f"{result.name} n={result.size}"
+        print(
+            f"{label:42} {speed:5.2f}x speed"
+            f"  {'REGRESSION: ' + ', '.join(flags) if flags else 'ok'}"
+        )
+        if flags:
+            regressions.append(f"{label}: {', '.join(flags)}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Input sizes to run each case at.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="Only run cases whose name contains one of these.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Save the results to this file.")
+    parser.add_argument(
+        "--compare", help="Compare the results with this baseline file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown or memory growth as a fraction.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.only, args.repeat)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(to_json(results), file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            print("\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,36 @@
-"""Project level init file."""
+"""Project level init file.
 
-from .main import Prescription, VisualAcuity
+Exports are imported on first use, so `import optom_tools` does not load
+NumPy, pydantic or rich.
+"""
 
-__all__ = ["VisualAcuity", "Prescription"]
+from typing import TYPE_CHECKING
+
+from optom_tools.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .main import (
+        Prescription,
+        PrescriptionBatch,
+        VisualAcuity,
+        VisualAcuityBatch,
+    )
+
+__all__ = [
+    "VisualAcuity",
+    "Prescription",
+    "PrescriptionBatch",
+    "VisualAcuityBatch",
+]
 
 __version__ = "0.3.0"
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Prescription": ".prescription",
+        "PrescriptionBatch": ".prescription",
+        "VisualAcuity": ".visual_acuity",
+        "VisualAcuityBatch": ".visual_acuity",
+    },
+)
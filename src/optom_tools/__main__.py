@@ -1 +1,8 @@
 """Project main."""
+
+import sys
+
+from optom_tools.main import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,366 @@
-"""Main entry point for optom_tools."""
+"""Main entry point for optom_tools.
 
-from optom_tools.prescription import Prescription
-from optom_tools.utils import log
-from optom_tools.visual_acuity import VisualAcuity
+`python -m optom_tools` converts prescriptions or visual acuities in bulk,
+streaming text, CSV or JSONL in and writing CSV or JSONL out:
 
-__all__ = ["Prescription", "VisualAcuity", "log"]
+    $ printf '+1.00/-1.00x90\\n' | python -m optom_tools rx --transpose
+    rx
+    plano / +1.00 x 180
+"""
 
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
-def main():
-    """Entry function."""
-    pass
+from optom_tools.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from optom_tools.prescription import Prescription, PrescriptionBatch
+    from optom_tools.utils import log
+    from optom_tools.visual_acuity import VisualAcuity, VisualAcuityBatch
+
+__all__ = [
+    "Prescription",
+    "PrescriptionBatch",
+    "VisualAcuity",
+    "VisualAcuityBatch",
+    "log",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Prescription": "optom_tools.prescription",
+        "PrescriptionBatch": "optom_tools.prescription",
+        "VisualAcuity": "optom_tools.visual_acuity",
+        "VisualAcuityBatch": "optom_tools.visual_acuity",
+        "log": "optom_tools.utils",
+    },
+)
+
+STDIN = "-"
+
+
+class _Convert(NamedTuple):
+    """Operations applied to each batch, picklable for worker processes."""
+
+    kind: str
+    output: str
+    transpose: bool = False
+    transpose_flag: Optional[str] = None
+    vertex_mm: Optional[float] = None
+    round_to: Optional[float] = None
+    unit: Optional[str] = None
+    snap: bool = False
+    logmar: bool = False
+
+    @property
+    def fields(self) -> List[str]:
+        """Give the names of the output columns."""
+        if self.kind == "rx":
+            return ["rx"]
+        return ["va", "logmar"] if self.logmar else ["va"]
+
+    def _columns(self, batch: Any) -> List[List[Any]]:
+        """Apply the operations and give the output columns."""
+        if self.kind == "rx":
+            if self.transpose:
+                batch.transpose(self.transpose_flag)
+            if self.vertex_mm is not None:
+                batch.vertex_compensate(self.vertex_mm, self.round_to)
+            return [batch.to_strings().tolist()]
+        if self.snap:
+            batch.snap_to_chart()
+        if self.unit is not None:
+            batch.convert_unit(self.unit)
+        columns = [batch.to_strings().tolist()]
+        if self.logmar:
+            columns.append(batch.logmar.tolist())
+        return columns
+
+    def run(self, batch: Any) -> Tuple[int, str]:
+        """Convert a batch, giving its number of rows and output text."""
+        rows = zip(*self._columns(batch))
+        if self.output == "jsonl":
+            text = "".join(
+                json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows
+            )
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(rows)
+            text = buffer.getvalue()
+        return len(batch), text
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="optom_tools",
+        description="Convert prescriptions or visual acuities in bulk.",
+    )
+    commands = parser.add_subparsers(dest="kind", required=True)
+    rx = commands.add_parser("rx", help="Convert prescriptions.")
+    rx.add_argument(
+        "--transpose",
+        nargs="?",
+        const=None,
+        default=False,
+        choices=["n", "p"],
+        help="Transpose every prescription, or only to negative (n) or positive (p) cylinder.",
+    )
+    rx.add_argument(
+        "--vertex",
+        type=float,
+        metavar="MM",
+        dest="vertex_mm",
+        help="Vertex compensate to this distance in mm, e.g. 0 for contact lenses.",
+    )
+    rx.add_argument(
+        "--round-to",
+        type=float,
+        metavar="STEP",
+        help="Round vertex compensated powers to this step, e.g. 0.25.",
+    )
+    va = commands.add_parser("va", help="Convert visual acuities.")
+    va.add_argument(
+        "--unit", choices=["ft", "m"], help="Convert to this unit."
+    )
+    va.add_argument(
+        "--snap",
+        action="store_true",
+        help="Snap to the nearest line of a logMAR chart.",
+    )
+    va.add_argument(
+        "--logmar", action="store_true", help="Add a logmar column."
+    )
+    for command in (rx, va):
+        command.add_argument(
+            "inputs",
+            nargs="*",
+            metavar="FILE",
+            help="Files to read, or - for stdin. Defaults to stdin.",
+        )
+        command.add_argument(
+            "--format",
+            choices=["csv", "jsonl", "text"],
+            help="Input format. Inferred from the file extension, otherwise one value per line.",
+        )
+        command.add_argument(
+            "--column", help="Input column holding the values."
+        )
+        command.add_argument(
+            "--output",
+            choices=["csv", "jsonl"],
+            default="csv",
+            help="Output format. Defaults to csv.",
+        )
+        command.add_argument(
+            "--on-error",
+            choices=["raise", "skip"],
+            default="raise",
+            help="Stop at the first bad row, or skip bad rows. Defaults to raise.",
+        )
+        command.add_argument("--chunk-size", type=int, help="Rows per batch.")
+        command.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes converting files. Defaults to 1.",
+        )
+        command.add_argument(
+            "--stats",
+            action="store_true",
+            help="Report rows and throughput on stderr.",
+        )
+    serve = commands.add_parser(
+        "serve", help="Serve conversions over HTTP/JSON."
+    )
+    serve.add_argument(
+        "--host", default="127.0.0.1", help="Defaults to 127.0.0.1."
+    )
+    serve.add_argument(
+        "--port", type=int, default=8000, help="Defaults to 8000."
+    )
+    serve.add_argument(
+        "--unix-socket",
+        metavar="PATH",
+        help="Listen on a Unix socket instead of a port.",
+    )
+    serve.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=256,
+        help="Most concurrent requests handled in one batch. Defaults to 256.",
+    )
+    serve.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=1.0,
+        help="Longest wait for a batch to fill, in milliseconds. Defaults to 1.",
+    )
+    return parser
+
+
+def _input_format(source: str, fmt: Optional[str]) -> Optional[str]:
+    """Read stdin and files without a known extension as text."""
+    from optom_tools.reader import format_for_path
+
+    if fmt is not None:
+        return fmt
+    if source == STDIN or format_for_path(source) is None:
+        return "text"
+    return None
+
+
+def _convert_source(
+    source: str, args: argparse.Namespace, convert: _Convert
+) -> Iterator[Tuple[int, int, str]]:
+    """Convert one input, yielding rows, skipped rows and text per chunk.
+
+    Files are split across `--workers` processes. Stdin is read in this
+    process.
+    """
+    from optom_tools.parallel import map_records
+    from optom_tools.reader import PrescriptionReader, VisualAcuityReader
+
+    reader = PrescriptionReader if args.kind == "rx" else VisualAcuityReader
+    kwargs: Dict[str, Any] = {
+        "fmt": _input_format(source, args.format),
+        "on_error": "collect" if args.on_error == "skip" else "raise",
+    }
+    if args.column is not None:
+        kwargs["column"] = args.column
+    if args.chunk_size is not None:
+        kwargs["chunk_size"] = args.chunk_size
+    if source != STDIN:
+        for chunk in map_records(
+            source, convert.run, reader, args.workers, **kwargs
+        ):
+            rows, text = chunk.result
+            yield rows, len(chunk.errors), text
+        return
+    stream = reader(sys.stdin, **kwargs)
+    for batch in stream.batches():
+        rows, text = convert.run(batch)
+        skipped, stream.errors = len(stream.errors), []
+        yield rows, skipped, text
+    # Chunks where every row was bad give no batch.
+    if stream.errors:
+        yield 0, len(stream.errors), ""
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run the HTTP/JSON server until interrupted."""
+    from optom_tools.server import ServerError, serve
+
+    try:
+        serve(
+            args.host,
+            args.port,
+            args.unix_socket,
+            args.max_batch_size,
+            args.max_wait_ms,
+        )
+    except (OSError, ServerError) as exc:
+        print(
+            f"optom_tools: error: {getattr(exc, 'message', exc)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry function.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        (int): Exit status, 0 on success and 1 on bad input.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.kind == "rx" and args.round_to is not None:
+        if args.vertex_mm is None:
+            parser.error("--round-to needs --vertex")
+    if args.kind == "serve":
+        return _serve(args)
+    # Imported after parsing so that --help does not load NumPy.
+    from optom_tools.parallel import ParallelError
+    from optom_tools.prescription.exceptions import PrescriptionError
+    from optom_tools.reader import ReaderError
+    from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+    if args.kind == "rx":
+        convert = _Convert(
+            kind="rx",
+            output=args.output,
+            transpose=args.transpose is not False,
+            transpose_flag=args.transpose or None,
+            vertex_mm=args.vertex_mm,
+            round_to=args.round_to,
+        )
+    else:
+        convert = _Convert(
+            kind="va",
+            output=args.output,
+            unit=args.unit,
+            snap=args.snap,
+            logmar=args.logmar,
+        )
+    stdout = sys.stdout
+    start = time.perf_counter()
+    total = skipped = 0
+    try:
+        if args.output == "csv":
+            stdout.write(",".join(convert.fields) + "\n")
+        for source in args.inputs or [STDIN]:
+            for rows, errors, text in _convert_source(source, args, convert):
+                stdout.write(text)
+                total += rows
+                skipped += errors
+        stdout.flush()
+    except BrokenPipeError:
+        # The reader of the output stopped early, e.g. `| head`.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stdout.fileno())
+        return 1
+    except (
+        OSError,
+        ParallelError,
+        PrescriptionError,
+        ReaderError,
+        VisualAcuityError,
+    ) as exc:
+        print(
+            f"optom_tools: error: {getattr(exc, 'message', exc)}",
+            file=sys.stderr,
+        )
+        return 1
+    if args.stats:
+        seconds = time.perf_counter() - start
+        print(
+            f"{total} rows, {skipped} skipped in {seconds:.2f} s "
+            f"({total / seconds if seconds else 0:.0f} rows/s)",
+            file=sys.stderr,
+        )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Parallel module."""
+
+from .exceptions import ParallelError
+from .parallel import ChunkResult, map_records, split_byte_ranges
+
+__all__ = ["ChunkResult", "ParallelError", "map_records", "split_byte_ranges"]
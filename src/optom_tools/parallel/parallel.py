@@ -0,0 +1,253 @@
+"""Process-pool parsing and conversion of large exports."""
+
+import io
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from optom_tools.reader import PrescriptionReader, RowError
+
+from .exceptions import ParallelError
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+# Bytes read at once when counting lines.
+_COUNT_BYTES = 1024 * 1024
+
+
+class ChunkResult(NamedTuple):
+    """Result of one byte range of the input file."""
+
+    number: int
+    start: int
+    end: int
+    result: Any
+    errors: List[RowError]
+
+
+class _Task(NamedTuple):
+    """Work sent to a worker process."""
+
+    number: int
+    path: str
+    start: int
+    end: int
+    newlines: int
+    header: bytes
+    reader: Type[Any]
+    reader_kwargs: Dict[str, Any]
+    func: Optional[Callable[[Any], Any]]
+    validate: bool
+
+
+def _data_start(path: str, fmt: str) -> Tuple[int, bytes]:
+    """Give the offset of the first record and the CSV header line."""
+    if fmt != "csv":
+        return 0, b""
+    with open(path, "rb") as file:
+        header = file.readline()
+    return len(header), header
+
+
+def split_byte_ranges(
+    path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES, start: int = 0
+) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges of roughly `chunk_bytes`.
+
+    Ranges do not need to land on line boundaries; each line belongs to the
+    range it starts in.
+
+    Args:
+        path (str): The file.
+        chunk_bytes (int): Target bytes per range.
+        start (int): Offset of the first record. Defaults to 0.
+
+    Returns:
+        (List[Tuple[int, int]]): `(start, end)` offsets.
+    """
+    if chunk_bytes < 1:
+        raise ParallelError(
+            value=chunk_bytes, message="chunk_bytes must be at least 1"
+        )
+    size = os.path.getsize(path)
+    return [
+        (offset, min(offset + chunk_bytes, size))
+        for offset in range(start, size, chunk_bytes)
+    ]
+
+
+def _newlines_before(path: str, offsets: List[int]) -> List[int]:
+    """Count the newlines before each offset, in one pass over the file.
+
+    Args:
+        path (str): The file.
+        offsets (List[int]): Offsets in increasing order.
+
+    Returns:
+        (List[int]): Newlines in `[0, offset)` for each offset.
+    """
+    counts = []
+    newlines = position = 0
+    with open(path, "rb") as file:
+        for offset in offsets:
+            while position < offset:
+                block = file.read(min(_COUNT_BYTES, offset - position))
+                if not block:
+                    break
+                newlines += block.count(b"\n")
+                position += len(block)
+            counts.append(newlines)
+    return counts
+
+
+def _read_range(
+    path: str, start: int, end: int, data_start: int
+) -> Tuple[bytes, bool]:
+    """Read the lines that start within `[start, end)`.
+
+    Returns:
+        (Tuple[bytes, bool]): The lines, and whether a line started in the previous range was left out.
+    """
+    with open(path, "rb") as file:
+        file.seek(max(start - 1, 0))
+        previous = file.read(1) if start > data_start else b"\n"
+        file.seek(start)
+        data = file.read(end - start)
+        if previous != b"\n":
+            # The first line started in the previous range.
+            newline = data.find(b"\n")
+            data = b"" if newline == -1 else data[newline + 1 :]
+        if data and not data.endswith(b"\n"):
+            data += file.readline()
+    return data, previous != b"\n"
+
+
+def _run(task: _Task) -> ChunkResult:
+    """Parse, validate and convert one byte range in a worker."""
+    data, partial = _read_range(
+        task.path, task.start, task.end, len(task.header)
+    )
+    reader = task.reader(
+        io.StringIO((task.header + data).decode("utf-8"), newline=""),
+        **task.reader_kwargs,
+    )
+    # Number lines from the start of the file rather than of the range.
+    reader.line_offset = task.newlines + partial - task.header.count(b"\n")
+    batches = reader.validated_batches() if task.validate else reader.batches()
+    batch = reader.batch_type.concatenate(batches)
+    result = batch if task.func is None else task.func(batch)
+    return ChunkResult(
+        task.number, task.start, task.end, result, reader.errors
+    )
+
+
+def map_records(
+    path: Union[str, "os.PathLike[str]"],
+    func: Optional[Callable[[Any], Any]] = None,
+    reader: Type[Any] = PrescriptionReader,
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    validate: bool = False,
+    **reader_kwargs: Any,
+) -> Iterator[ChunkResult]:
+    """Parse and convert a large file across a pool of worker processes.
+
+    The file is split into byte ranges. Each worker reads its own range from
+    disk, so only offsets are sent to it, and sends back a compact pickled
+    batch (or the result of `func` on it). Results are yielded in file order,
+    with at most two ranges per worker in flight, so memory use does not grow
+    when the consumer is slower than the workers.
+
+    Records must be one per line (CSV fields must not contain newlines).
+
+    Args:
+        path (Union[str, os.PathLike[str]]): Path to a CSV or JSONL file.
+        func (Optional[Callable[[Any], Any]]): Applied to each chunk's batch inside the worker. Must be picklable (a module level function). Defaults to returning the batch.
+        reader (Type[Any]): `PrescriptionReader` or `VisualAcuityReader`. Defaults to `PrescriptionReader`.
+        workers (Optional[int]): Number of processes. Defaults to `os.cpu_count()`. `1` runs in the current process.
+        chunk_bytes (int): Bytes per chunk of work.
+        validate (bool): Check each chunk with the batch `validate()` masks via `validated_batches()`, handing rows that break a rule to `on_error`. Defaults to `False`.
+        **reader_kwargs (Any): Passed to `reader`, e.g. `column`, `fmt`, `on_error` and `chunk_size`.
+
+    Yields:
+        (ChunkResult): One result per byte range, in file order.
+
+    Examples:
+        Transposing a large export on every core:
+        >>> def to_minus_cyl(batch):
+        ...     batch.transpose("n")
+        ...     return batch
+        >>> batch = PrescriptionBatch.concatenate(
+        ...     chunk.result for chunk in map_records("export.csv", to_minus_cyl, column="Rx")
+        ... )
+    """
+    if workers is not None and workers < 1:
+        raise ParallelError(
+            value=workers, message="workers must be at least 1"
+        )
+    path = os.fspath(path)
+    # Validates the reader configuration before any work is sent out.
+    probe = reader(path, **reader_kwargs)
+    worker_kwargs = dict(
+        reader_kwargs, fmt=probe.fmt, delimiter=probe.delimiter
+    )
+    data_start, header = _data_start(path, probe.fmt)
+    ranges = split_byte_ranges(path, chunk_bytes, data_start)
+    newlines = _newlines_before(path, [start for start, _ in ranges])
+    tasks = [
+        _Task(
+            number,
+            path,
+            start,
+            end,
+            lines,
+            header,
+            reader,
+            worker_kwargs,
+            func,
+            validate,
+        )
+        for number, ((start, end), lines) in enumerate(zip(ranges, newlines))
+    ]
+    return _execute(tasks, workers)
+
+
+def _execute(
+    tasks: List[_Task], workers: Optional[int]
+) -> Iterator[ChunkResult]:
+    """Run the tasks, yielding results in task order.
+
+    At most two tasks per worker are in flight, so results a slow consumer
+    has not taken yet do not pile up in memory.
+    """
+    if workers == 1 or len(tasks) <= 1:
+        yield from map(_run, tasks)
+        return
+    workers = workers or os.cpu_count() or 1
+    remaining = iter(tasks)
+    pending: Deque["Future[ChunkResult]"] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for task in itertools.islice(remaining, 2 * workers):
+                pending.append(executor.submit(_run, task))
+            while pending:
+                yield pending.popleft().result()
+                following = next(remaining, None)
+                if following is not None:
+                    pending.append(executor.submit(_run, following))
+        finally:
+            for future in pending:
+                future.cancel()
@@ -1,5 +1,49 @@
 """Prescrption module."""
 
-from .prescription import Prescription
+from typing import TYPE_CHECKING
 
-__all__ = ["Prescription"]
+from optom_tools.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .batch import PrescriptionBatch, parse_many
+    from .canonical import CanonicalKey
+    from .frozen import FrozenPrescription
+    from .generator import PrescriptionGenerator
+    from .index import PrescriptionIndex
+    from .neighbours import NeighbourIndex
+    from .parser import RxComponents, parse_cache, parse_rx
+    from .power_vector import PowerVector
+    from .prescription import Prescription
+
+__all__ = [
+    "CanonicalKey",
+    "FrozenPrescription",
+    "NeighbourIndex",
+    "Prescription",
+    "PrescriptionBatch",
+    "PrescriptionGenerator",
+    "PrescriptionIndex",
+    "PowerVector",
+    "RxComponents",
+    "parse_cache",
+    "parse_many",
+    "parse_rx",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CanonicalKey": ".canonical",
+        "FrozenPrescription": ".frozen",
+        "NeighbourIndex": ".neighbours",
+        "Prescription": ".prescription",
+        "PrescriptionBatch": ".batch",
+        "PrescriptionGenerator": ".generator",
+        "PrescriptionIndex": ".index",
+        "PowerVector": ".power_vector",
+        "RxComponents": ".parser",
+        "parse_cache": ".parser",
+        "parse_many": ".batch",
+        "parse_rx": ".parser",
+    },
+)
@@ -0,0 +1,723 @@
+"""Columnar storage for many prescriptions at once."""
+
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from typing_extensions import Literal
+
+from optom_tools.utils import (
+    ColumnarMixin,
+    ValidationReport,
+    check_rules,
+    give_plus_sign,
+    map_unique,
+    pack_columns,
+    strip_decimal,
+    unpack_columns,
+)
+
+from .canonical import (
+    DIRECTIONS,
+    QUARTER,
+    CanonicalKey,
+    check_step,
+    negative_cylinder,
+)
+from .exceptions import PrescriptionError
+from .parser import (
+    INTERMEDIATE_WORKING_DISTANCE_CM,
+    WORKING_DISTANCE_CM,
+    RxComponents,
+    parse_rx,
+)
+from .power_vector import ROUND_PLACES
+from .prescription import Prescription
+from .rules import BATCH_RULES
+from .vertex import check_round_to, vertex_power
+
+ArrayLike = Union[np.ndarray, Iterable[float], float]
+Operand = Union["PrescriptionBatch", Prescription]
+DirectionLike = Union[np.ndarray, Iterable[str], str]
+
+_GETTERS: Dict[str, Callable[[Prescription], Any]] = {
+    "sphere": attrgetter("sphere"),
+    "cylinder": attrgetter("cylinder"),
+    "axis": attrgetter("axis"),
+    "add": attrgetter("add.add"),
+    "working_distance_cm": attrgetter("add.working_distance_cm"),
+    "intermediate_add": attrgetter("intermediate_add.add"),
+    "intermediate_working_distance_cm": attrgetter(
+        "intermediate_add.working_distance_cm"
+    ),
+    "back_vertex_mm": attrgetter("back_vertex_mm"),
+    "vertical_prism": attrgetter("vertical_prism.magnitude"),
+    "vertical_prism_direction": lambda rx: rx.vertical_prism.direction or "",
+    "horizontal_prism": attrgetter("horizontal_prism.magnitude"),
+    "horizontal_prism_direction": lambda rx: rx.horizontal_prism.direction
+    or "",
+}
+
+_COMPONENT_DEFAULTS = {
+    "add": 0.0,
+    "working_distance_cm": WORKING_DISTANCE_CM,
+    "intermediate_add": 0.0,
+    "intermediate_working_distance_cm": INTERMEDIATE_WORKING_DISTANCE_CM,
+    "vertical_prism": 0.0,
+    "vertical_prism_direction": "",
+    "horizontal_prism": 0.0,
+    "horizontal_prism_direction": "",
+}
+
+
+_SORTED_DIRECTIONS = np.array(sorted(DIRECTIONS))
+_DIRECTION_CODES = np.array(
+    [DIRECTIONS.index(direction) for direction in _SORTED_DIRECTIONS]
+)
+
+_COS_2_AXIS = np.cos(np.radians(2 * np.arange(181)))
+_SIN_2_AXIS = np.sin(np.radians(2 * np.arange(181)))
+
+
+def _norm(m: np.ndarray, j0: np.ndarray, j45: np.ndarray) -> np.ndarray:
+    """Give the length of power vectors."""
+    return np.sqrt(m * m + j0 * j0 + j45 * j45)
+
+
+class PrescriptionBatch(ColumnarMixin):
+    """A batch of prescriptions stored as contiguous NumPy columns.
+
+    Whole-cohort operations run as array operations instead of a Python loop
+    over `Prescription` models. Values in a batch are not validated when it
+    is built; `validate()` checks them all at once against the rules of
+    `Prescription`, without raising.
+
+    Args:
+        sphere (ArrayLike): Sphere powers in dioptres.
+        cylinder (ArrayLike): Cylinder powers in dioptres. Defaults to 0.
+        axis (ArrayLike): Cylinder axes in degrees. Defaults to 180.
+        add (ArrayLike): Near add in dioptres. Defaults to 0.
+        working_distance_cm (ArrayLike): Near add working distance. Defaults to 40.
+        intermediate_add (ArrayLike): Intermediate add in dioptres. Defaults to 0.
+        intermediate_working_distance_cm (ArrayLike): Intermediate add working distance. Defaults to 50.
+        back_vertex_mm (ArrayLike): Back vertex distance. Defaults to 12.
+        vertical_prism (ArrayLike): Vertical prism in prism dioptres. Defaults to 0.
+        vertical_prism_direction (DirectionLike): `'U'`, `'D'` or `''`. Defaults to `''`.
+        horizontal_prism (ArrayLike): Horizontal prism in prism dioptres. Defaults to 0.
+        horizontal_prism_direction (DirectionLike): `'R'`, `'L'`, `'I'`, `'O'` or `''`. Defaults to `''`.
+
+    Examples:
+        Typical use:
+        >>> batch = PrescriptionBatch(sphere=[1, 0], cylinder=[-1, 0])
+        >>> batch.transpose()
+        >>> batch.to_strings().tolist()
+        ['plano / +1.00 x 90', 'plano']
+
+        Converting to and from prescriptions:
+        >>> batch = PrescriptionBatch.from_prescriptions([Prescription("+1.00/-1.00x90")])
+        >>> str(batch.to_prescriptions()[0])
+        '+1.00 / -1.00 x 90'
+    """
+
+    columns = (
+        "sphere",
+        "cylinder",
+        "axis",
+        "add",
+        "working_distance_cm",
+        "intermediate_add",
+        "intermediate_working_distance_cm",
+        "back_vertex_mm",
+        "vertical_prism",
+        "vertical_prism_direction",
+        "horizontal_prism",
+        "horizontal_prism_direction",
+    )
+    _error = PrescriptionError
+
+    def __init__(
+        self,
+        sphere: ArrayLike,
+        cylinder: ArrayLike = 0,
+        axis: ArrayLike = 180,
+        add: ArrayLike = 0,
+        working_distance_cm: ArrayLike = 40,
+        intermediate_add: ArrayLike = 0,
+        intermediate_working_distance_cm: ArrayLike = 50,
+        back_vertex_mm: ArrayLike = 12.0,
+        vertical_prism: ArrayLike = 0,
+        vertical_prism_direction: DirectionLike = "",
+        horizontal_prism: ArrayLike = 0,
+        horizontal_prism_direction: DirectionLike = "",
+    ) -> None:
+        """Construct batch, broadcasting scalar columns to the batch length."""
+        self.sphere = np.atleast_1d(np.asarray(sphere, dtype=np.float64))
+        if self.sphere.ndim != 1:
+            raise PrescriptionError(
+                value=self.sphere.shape,
+                message="Batch columns must be one dimensional",
+            )
+        self.cylinder = self._column(cylinder)
+        self.axis = self._column(axis)
+        self.add = self._column(add)
+        self.working_distance_cm = self._column(working_distance_cm)
+        self.intermediate_add = self._column(intermediate_add)
+        self.intermediate_working_distance_cm = self._column(
+            intermediate_working_distance_cm
+        )
+        self.back_vertex_mm = self._column(back_vertex_mm)
+        self.vertical_prism = self._column(vertical_prism)
+        self.vertical_prism_direction = self._column(
+            vertical_prism_direction, dtype="<U1"
+        )
+        self.horizontal_prism = self._column(horizontal_prism)
+        self.horizontal_prism_direction = self._column(
+            horizontal_prism_direction, dtype="<U1"
+        )
+
+    def _column(self, value: Any, dtype: Any = np.float64) -> np.ndarray:
+        """Coerce a column to `dtype` with the same length as `sphere`.
+
+        Prism directions are stored as single characters, with `''` for none.
+        """
+        column = np.asarray(value, dtype=dtype)
+        if column.ndim == 0:
+            return np.full(self.sphere.shape, column)
+        if column.shape != self.sphere.shape:
+            raise PrescriptionError(
+                value=column.shape,
+                message="All batch columns must have the same length",
+            )
+        return column
+
+    @classmethod
+    def from_prescriptions(
+        cls, prescriptions: Iterable[Prescription]
+    ) -> "PrescriptionBatch":
+        """Build a batch from `Prescription` models.
+
+        Args:
+            prescriptions (Iterable[Prescription]): The prescriptions.
+
+        Returns:
+            (PrescriptionBatch): Batch holding the same values.
+        """
+        prescriptions = list(prescriptions)
+        return cls(
+            **{
+                name: [getter(rx) for rx in prescriptions]
+                for name, getter in _GETTERS.items()
+            }
+        )
+
+    @classmethod
+    def from_components(
+        cls, components: Iterable[RxComponents]
+    ) -> "PrescriptionBatch":
+        """Build a batch from parsed `RxComponents`.
+
+        Missing sections take the same defaults as `Prescription`.
+
+        Args:
+            components (Iterable[RxComponents]): Output of `parse_rx()`.
+
+        Returns:
+            (PrescriptionBatch): Batch holding the parsed values.
+        """
+        rows = list(components)
+        if not rows:
+            return cls(sphere=[])
+        batch: Dict[str, Any] = {}
+        for name, values in zip(RxComponents._fields, zip(*rows)):
+            default = _COMPONENT_DEFAULTS.get(name)
+            if default is not None and None in values:
+                if values.count(None) == len(values):
+                    batch[name] = default
+                    continue
+                values = tuple(default if v is None else v for v in values)
+            batch[name] = values
+        return cls(**batch)
+
+    @classmethod
+    def from_strings(cls, rx_strings: Iterable[str]) -> "PrescriptionBatch":
+        """Parse prescription strings straight into a batch.
+
+        No `Prescription` model is built per record.
+
+        Args:
+            rx_strings (Iterable[str]): Prescriptions as strings.
+
+        Returns:
+            (PrescriptionBatch): Batch holding the parsed values.
+
+        Raises:
+            PrescriptionError: A prescription could not be parsed.
+        """
+        return cls.from_components(parse_rx(rx) for rx in rx_strings)
+
+    @classmethod
+    def concatenate(
+        cls, batches: Iterable["PrescriptionBatch"]
+    ) -> "PrescriptionBatch":
+        """Join batches end to end, keeping their order.
+
+        Args:
+            batches (Iterable[PrescriptionBatch]): The batches to join.
+
+        Returns:
+            (PrescriptionBatch): A single batch.
+        """
+        batches = list(batches)
+        if not batches:
+            return cls(sphere=[])
+        return cls(
+            **{
+                name: np.concatenate([getattr(b, name) for b in batches])
+                for name in cls.columns
+            }
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pack the columns for compact pickling between processes."""
+        return pack_columns(
+            {name: getattr(self, name) for name in self.columns}
+        )
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Unpack columns packed by `__getstate__`."""
+        for name, column in unpack_columns(state).items():
+            setattr(self, name, column)
+
+    def to_prescriptions(self) -> List[Prescription]:
+        """Convert the batch back into `Prescription` models.
+
+        Returns:
+            (List[Prescription]): One validated model per row.
+        """
+        columns = [getattr(self, name).tolist() for name in self.columns]
+        return [self._build(*row) for row in zip(*columns)]
+
+    def _row(self, index: int) -> Prescription:
+        """Build the `Prescription` for a single row."""
+        return self._build(
+            *(getattr(self, name)[index].item() for name in self.columns)
+        )
+
+    @staticmethod
+    def _build(
+        sphere: float,
+        cylinder: float,
+        axis: float,
+        add: float,
+        working_distance_cm: float,
+        intermediate_add: float,
+        intermediate_working_distance_cm: float,
+        back_vertex_mm: float,
+        vertical_prism: float,
+        vertical_prism_direction: str,
+        horizontal_prism: float,
+        horizontal_prism_direction: str,
+    ) -> Prescription:
+        """Build a `Prescription` from the values of one row."""
+        return Prescription(
+            sphere=sphere,
+            cylinder=cylinder,
+            axis=axis,
+            add={"add": add, "working_distance_cm": working_distance_cm},
+            intermediate_add={
+                "add": intermediate_add,
+                "working_distance_cm": intermediate_working_distance_cm,
+            },
+            back_vertex_mm=back_vertex_mm,
+            vertical_prism={
+                "magnitude": vertical_prism,
+                "direction": vertical_prism_direction or None,
+            },
+            horizontal_prism={
+                "magnitude": horizontal_prism,
+                "direction": horizontal_prism_direction or None,
+            },
+        )
+
+    def __len__(self) -> int:
+        """Give the number of prescriptions in the batch."""
+        return len(self.sphere)
+
+    def __getitem__(
+        self, key: Any
+    ) -> Union[Prescription, "PrescriptionBatch"]:
+        """Return a `Prescription` for an integer, otherwise a sub-batch."""
+        if isinstance(key, (int, np.integer)):
+            return self._row(int(key))
+        return self.__class__(
+            **{name: getattr(self, name)[key] for name in self.columns}
+        )
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return f"{self.__class__.__name__}(n={len(self)})"
+
+    def validate(self) -> ValidationReport:
+        """Check every row against the rules of `Prescription`.
+
+        The axis, adds, working distances and prisms are checked as array
+        comparisons, so bad rows cost nothing extra and nothing is raised.
+
+        Returns:
+            (ValidationReport): The error code of each row.
+
+        Examples:
+            Dropping bad rows:
+            >>> batch = PrescriptionBatch(sphere=[1, 2], axis=[90, 200])
+            >>> report = batch.validate()
+            >>> report.summary()["axis"]
+            1
+            >>> batch[report.valid].axis.tolist()
+            [90.0]
+        """
+        return check_rules(self, BATCH_RULES)
+
+    @property
+    def mean_sphere(self) -> np.ndarray:
+        """Provide mean sphere values of the batch.
+
+        Returns:
+            (np.ndarray): The Mean Sphere of each prescription.
+        """
+        return self.sphere + (self.cylinder / 2)
+
+    def _vectors(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Give the M, J0 and J45 columns of the power vectors."""
+        half = self.cylinder / 2
+        degrees = self.axis.astype(np.intp)
+        if np.array_equal(degrees, self.axis) and (
+            not len(degrees) or 0 <= degrees.min() <= degrees.max() <= 180
+        ):
+            # Axes are nearly always whole degrees, so look the values up.
+            cos, sin = _COS_2_AXIS[degrees], _SIN_2_AXIS[degrees]
+        else:
+            radians = np.radians(2 * self.axis)
+            cos, sin = np.cos(radians), np.sin(radians)
+        return self.sphere + half, -half * cos, -half * sin
+
+    @property
+    def power_vectors(self) -> np.ndarray:
+        """Provide the Thibos power vector of every prescription.
+
+        Returns:
+            (np.ndarray): Array of shape `(n, 3)` with columns M, J0 and J45, matching `Prescription.power_vector`.
+        """
+        return np.stack(self._vectors(), axis=-1)
+
+    @property
+    def blur_strength(self) -> np.ndarray:
+        """Provide the blur strength (power vector length) of the batch.
+
+        Returns:
+            (np.ndarray): Blur strength of each prescription in dioptres.
+        """
+        return _norm(*self._vectors())
+
+    @classmethod
+    def from_power_vectors(
+        cls, power_vectors: ArrayLike, **columns: Any
+    ) -> "PrescriptionBatch":
+        """Build a batch from Thibos power vectors.
+
+        Prescriptions are given in negative cylinder form, matching
+        `Prescription.from_power_vector()`.
+
+        Args:
+            power_vectors (ArrayLike): Array of shape `(n, 3)` with columns M, J0 and J45.
+            **columns (Any): Other columns of the batch, e.g. `add`.
+
+        Returns:
+            (PrescriptionBatch): The prescriptions.
+        """
+        vectors = np.asarray(power_vectors, dtype=np.float64).reshape(-1, 3)
+        return cls._from_vectors(*vectors.T, **columns)
+
+    @classmethod
+    def _from_vectors(
+        cls, m: np.ndarray, j0: np.ndarray, j45: np.ndarray, **columns: Any
+    ) -> "PrescriptionBatch":
+        """Build a batch from the M, J0 and J45 columns."""
+        j = np.hypot(j0, j45)
+        axis = np.round(np.degrees(np.arctan2(j45, j0)) / 2, ROUND_PLACES)
+        axis = np.where(axis <= 0, axis + 180, axis)
+        axis = np.where(j == 0, 180.0, axis)
+        return cls(
+            sphere=np.round(m + j, ROUND_PLACES),
+            cylinder=np.round(-2 * j, ROUND_PLACES) + 0.0,
+            axis=axis,
+            **columns,
+        )
+
+    def _operand_vectors(self, other: Any) -> Tuple[Any, Any, Any]:
+        """Give the power vectors of a batch or a single prescription."""
+        if isinstance(other, Prescription):
+            return other.power_vector
+        if isinstance(other, PrescriptionBatch):
+            if len(other) != len(self):
+                raise PrescriptionError(
+                    value=(len(self), len(other)),
+                    message="Batches must have the same length",
+                )
+            return other._vectors()
+        raise PrescriptionError(
+            value=type(other).__name__,
+            message="Only a Prescription or PrescriptionBatch can be used",
+        )
+
+    def _with_vectors(
+        self, m: np.ndarray, j0: np.ndarray, j45: np.ndarray
+    ) -> "PrescriptionBatch":
+        """Build a batch from vectors, keeping the other columns of `self`."""
+        return self._from_vectors(
+            m,
+            j0,
+            j45,
+            **{
+                name: getattr(self, name)
+                for name in self.columns
+                if name not in ("sphere", "cylinder", "axis")
+            },
+        )
+
+    def __add__(self, other: Operand) -> "PrescriptionBatch":
+        """Add sphero-cylinders row by row, e.g. to combine lenses.
+
+        `other` is a batch of the same length or a single prescription. Only
+        sphere, cylinder and axis are combined; the other columns are kept
+        from this batch.
+        """
+        m, j0, j45 = self._vectors()
+        other_m, other_j0, other_j45 = self._operand_vectors(other)
+        return self._with_vectors(m + other_m, j0 + other_j0, j45 + other_j45)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Operand) -> "PrescriptionBatch":
+        """Give the sphero-cylinder difference row by row.
+
+        `other` is a batch of the same length or a single prescription. Only
+        sphere, cylinder and axis are compared; the other columns are kept
+        from this batch.
+        """
+        m, j0, j45 = self._vectors()
+        other_m, other_j0, other_j45 = self._operand_vectors(other)
+        return self._with_vectors(m - other_m, j0 - other_j0, j45 - other_j45)
+
+    def distance(self, other: Operand) -> np.ndarray:
+        """Give the blur strength of the difference from `other`.
+
+        Args:
+            other (Operand): A batch of the same length or a single prescription.
+
+        Returns:
+            (np.ndarray): Dioptric distance of each row from `other`.
+        """
+        m, j0, j45 = self._vectors()
+        other_m, other_j0, other_j45 = self._operand_vectors(other)
+        return _norm(m - other_m, j0 - other_j0, j45 - other_j45)
+
+    def mean(self) -> Prescription:
+        """Average the sphero-cylinders of the batch.
+
+        The power vectors are averaged, which unlike averaging sphere,
+        cylinder and axis separately is correct for astigmatism.
+
+        Returns:
+            (Prescription): The mean prescription in negative cylinder form.
+
+        Raises:
+            PrescriptionError: The batch is empty.
+        """
+        if not len(self):
+            raise PrescriptionError(
+                value=0, message="Cannot average an empty batch"
+            )
+        return Prescription.from_power_vector(
+            tuple(column.mean().item() for column in self._vectors())
+        )
+
+    def transpose(self, flag: Optional[Literal["n", "p"]] = None) -> None:
+        """Transpose every prescription in the batch.
+
+        Follows the same rules as `Prescription.transpose()`.
+
+        Args:
+            (Optional[[Literal["n", "p"]]): Flag to force negative ('n') and positive ('p') cylindrical format. Defaults to `None`.
+        """
+        if flag is not None and flag not in ["n", "p"]:
+            raise PrescriptionError(
+                value=flag,
+                message="Method transpose() only accepts 'n' and 'p' as input flags",
+            )
+        if flag == "n":
+            mask = self.cylinder > 0
+        elif flag == "p":
+            mask = self.cylinder < 0
+        else:
+            mask = self.cylinder != 0
+        new_axis = self.axis + 90
+        new_axis = np.where(new_axis > 180, new_axis - 180, new_axis)
+        self.sphere = np.where(mask, self.sphere + self.cylinder, self.sphere)
+        self.cylinder = np.where(mask, -1 * self.cylinder, self.cylinder)
+        self.axis = np.where(mask, new_axis, self.axis)
+
+    def _steps(self, column: np.ndarray, step: float) -> np.ndarray:
+        """Round a column to whole steps."""
+        return np.rint(column / step).astype(np.int64)
+
+    def _canonical_powers(
+        self, step: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Give the canonical sphere, cylinder (in steps) and axis."""
+        check_step(step)
+        return negative_cylinder(
+            self._steps(self.sphere, step),
+            self._steps(self.sphere + self.cylinder, step),
+            np.rint(self.axis).astype(np.int64),
+        )
+
+    def _canonical_codes(self, step: float = QUARTER) -> np.ndarray:
+        """Give the `CanonicalKey` of every row as a row of integers.
+
+        Prism directions are coded by their position in `DIRECTIONS`.
+        """
+        codes = np.empty((len(self), len(CanonicalKey._fields)), np.int64)
+        codes[:, 0], codes[:, 1], codes[:, 2] = self._canonical_powers(step)
+        codes[:, 3] = self._steps(self.add, step)
+        codes[:, 4] = self._steps(self.intermediate_add, step)
+        for column, name in ((5, "vertical_prism"), (7, "horizontal_prism")):
+            magnitude = self._steps(getattr(self, name), step)
+            direction = np.searchsorted(
+                _SORTED_DIRECTIONS, getattr(self, f"{name}_direction")
+            )
+            codes[:, column] = magnitude
+            codes[:, column + 1] = np.where(
+                magnitude != 0, _DIRECTION_CODES[direction], 0
+            )
+        return codes
+
+    def canonicalize(self, step: float = QUARTER) -> None:
+        """Put every prescription in canonical form, in place.
+
+        Follows the same rules as `Prescription.canonical()`.
+
+        Args:
+            step (float): Step of every power. Defaults to 0.25.
+        """
+        sphere, cylinder, axis = self._canonical_powers(step)
+        self.sphere = sphere * step
+        self.cylinder = cylinder * step
+        self.axis = axis.astype(np.float64)
+        self.add = self._steps(self.add, step) * step
+        self.intermediate_add = self._steps(self.intermediate_add, step) * step
+        for name in ("vertical_prism", "horizontal_prism"):
+            magnitude = self._steps(getattr(self, name), step) * step
+            setattr(self, name, magnitude)
+            setattr(
+                self,
+                f"{name}_direction",
+                np.where(
+                    magnitude != 0, getattr(self, f"{name}_direction"), ""
+                ),
+            )
+
+    def vertex_compensate(
+        self, vertex_mm: ArrayLike = 0, round_to: Optional[float] = None
+    ) -> None:
+        """Move every prescription to a new vertex distance.
+
+        Follows the same rules as `Prescription.vertex_compensate()`, using
+        each row's `back_vertex_mm`.
+
+        Args:
+            vertex_mm (ArrayLike): The new vertex distance(s) in mm. Defaults to 0 (contact lens).
+            round_to (Optional[float]): Round each meridian to this step (e.g. 0.25). Defaults to no rounding.
+        """
+        check_round_to(round_to)
+        vertex = self._column(vertex_mm)
+        first = vertex_power(self.sphere, self.back_vertex_mm, vertex)
+        second = vertex_power(
+            self.sphere + self.cylinder, self.back_vertex_mm, vertex
+        )
+        if round_to is not None:
+            first = np.round(first / round_to) * round_to + 0.0
+            second = np.round(second / round_to) * round_to + 0.0
+        self.sphere = first
+        self.cylinder = second - first
+        self.back_vertex_mm = vertex
+
+    def to_strings(self) -> np.ndarray:
+        """Provide the string representation of every prescription.
+
+        Returns:
+            (np.ndarray): Array of strings matching `str(Prescription)`.
+        """
+        sphere = np.where(
+            self.sphere == 0,
+            "plano",
+            map_unique(self.sphere, give_plus_sign, dtype=str),
+        )
+        has_cyl = self.cylinder != 0
+        cylinder = np.char.add(
+            np.char.add(
+                " / ", map_unique(self.cylinder, give_plus_sign, dtype=str)
+            ),
+            np.char.add(
+                " x ", map_unique(self.axis, strip_decimal, dtype=str)
+            ),
+        )
+        cylinder = np.where(
+            has_cyl, cylinder, np.where(self.sphere != 0, " DS", "")
+        )
+        add = np.char.add(
+            np.char.add(
+                " Add: ", map_unique(self.add, give_plus_sign, dtype=str)
+            ),
+            np.char.add(
+                " @ ",
+                np.char.add(
+                    map_unique(
+                        self.working_distance_cm, strip_decimal, dtype=str
+                    ),
+                    "cm",
+                ),
+            ),
+        )
+        add = np.where(self.add != 0, add, "")
+        return np.char.add(np.char.add(sphere, cylinder), add)
+
+    def __str__(self) -> str:
+        """Provide one prescription per line."""
+        return "\n".join(self.to_strings().tolist())
+
+
+def parse_many(rx_strings: Iterable[str]) -> PrescriptionBatch:
+    """Parse many prescription strings into a `PrescriptionBatch`.
+
+    Args:
+        rx_strings (Iterable[str]): Prescriptions as strings.
+
+    Returns:
+        (PrescriptionBatch): Batch holding the parsed values.
+
+    Examples:
+        Typical use:
+        >>> batch = parse_many(["+1.00/-0.50x90", "pl Add +2.00@33 2 BU"])
+        >>> batch.add.tolist()
+        [0.0, 2.0]
+    """
+    return PrescriptionBatch.from_strings(rx_strings)
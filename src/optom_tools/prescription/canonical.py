@@ -0,0 +1,120 @@
+"""Canonical form of a prescription, so that equivalent lenses compare equal."""
+
+from typing import Any, NamedTuple, Optional, Tuple
+
+from .exceptions import PrescriptionError
+
+# Quarter dioptre, the usual step of lens powers.
+QUARTER = 0.25
+
+# Prism base directions, coded by position for arrays of keys.
+DIRECTIONS = ("", "U", "D", "R", "L", "I", "O")
+
+
+class CanonicalKey(NamedTuple):
+    """Hashable key of a prescription in canonical form.
+
+    Powers are whole numbers of steps (quarter dioptres by default) in the
+    negative cylinder form. The axis is a whole number of degrees from 1 to
+    180, and 180 when there is no cylinder. A prism direction is `''` when
+    there is no prism.
+    """
+
+    sphere: int
+    cylinder: int
+    axis: int
+    add: int
+    intermediate_add: int
+    vertical_prism: int
+    vertical_prism_direction: str
+    horizontal_prism: int
+    horizontal_prism_direction: str
+
+
+def check_step(step: float) -> None:
+    """Check a quantization step is positive."""
+    if step <= 0:
+        raise PrescriptionError(
+            value=step, message="step must be a positive number"
+        )
+
+
+def negative_cylinder(
+    first: Any, second: Any, axis: Any
+) -> Tuple[Any, Any, Any]:
+    """Give the sphere, cylinder and axis of rounded meridians.
+
+    Same as `transpose('n')`: the more positive meridian is the sphere.
+    Rounding each meridian before transposing means a prescription and its
+    transpose always give the same result. Works on integers and on NumPy
+    integer arrays alike.
+
+    Args:
+        first (Any): Power along the axis (the sphere), in steps.
+        second (Any): Power at 90 degrees to the axis (sphere plus cylinder), in steps.
+        axis (Any): Axis in whole degrees.
+
+    Returns:
+        (Tuple[Any, Any, Any]): Sphere and cylinder in steps, and the axis from 1 to 180.
+
+    Examples:
+        The same lens in both forms:
+        >>> negative_cylinder(4, 0, 180)
+        (4, -4, 180)
+        >>> negative_cylinder(0, 4, 90)
+        (4, -4, 180)
+    """
+    swap = second > first
+    sphere = first + (second - first) * swap
+    cylinder = first + second - 2 * sphere
+    axis = (axis + 90 * swap - 1) % 180 + 1
+    return sphere, cylinder, axis + (180 - axis) * (cylinder == 0)
+
+
+def _prism(magnitude: float, direction: Optional[str], step: float) -> Any:
+    """Give the prism in steps and its direction, `''` without prism."""
+    steps = round(magnitude / step)
+    return steps, (direction or "") if steps else ""
+
+
+def canonical_key(
+    sphere: float,
+    cylinder: float,
+    axis: float,
+    add: float = 0,
+    intermediate_add: float = 0,
+    vertical_prism: float = 0,
+    vertical_prism_direction: Optional[str] = None,
+    horizontal_prism: float = 0,
+    horizontal_prism_direction: Optional[str] = None,
+    step: float = QUARTER,
+) -> CanonicalKey:
+    """Give the canonical key of one prescription.
+
+    Args:
+        sphere (float): Sphere power in dioptres.
+        cylinder (float): Cylinder power in dioptres.
+        axis (float): Cylinder axis in degrees.
+        add (float): Near add in dioptres. Defaults to 0.
+        intermediate_add (float): Intermediate add in dioptres. Defaults to 0.
+        vertical_prism (float): Vertical prism in prism dioptres. Defaults to 0.
+        vertical_prism_direction (Optional[str]): 'U' or 'D'. Defaults to `None`.
+        horizontal_prism (float): Horizontal prism in prism dioptres. Defaults to 0.
+        horizontal_prism_direction (Optional[str]): 'R', 'L', 'I' or 'O'. Defaults to `None`.
+        step (float): Step of every power. Defaults to 0.25.
+
+    Returns:
+        (CanonicalKey): The key.
+    """
+    check_step(step)
+    return CanonicalKey(
+        *negative_cylinder(
+            round(sphere / step),
+            round((sphere + cylinder) / step),
+            round(axis),
+        ),
+        round(add / step),
+        round(intermediate_add / step),
+        *_prism(vertical_prism, vertical_prism_direction, step),
+        *_prism(horizontal_prism, horizontal_prism_direction, step),
+    )
@@ -0,0 +1,74 @@
+"""Immutable, interned prescriptions."""
+
+from typing import Any, Dict, Tuple
+
+from optom_tools.utils.instrument import instrumentation
+from optom_tools.utils.intern import FrozenModel
+
+from .exceptions import PrescriptionError
+from .models import Add, HorizontalPrism, VerticalPrism
+from .prescription import Prescription
+
+
+class FrozenAdd(FrozenModel, Add):
+    """An immutable and hashable `Add`."""
+
+    error = PrescriptionError
+    mutable_model = Add
+
+
+class FrozenVerticalPrism(FrozenModel, VerticalPrism):
+    """An immutable and hashable `VerticalPrism`."""
+
+    error = PrescriptionError
+    mutable_model = VerticalPrism
+
+
+class FrozenHorizontalPrism(FrozenModel, HorizontalPrism):
+    """An immutable and hashable `HorizontalPrism`."""
+
+    error = PrescriptionError
+    mutable_model = HorizontalPrism
+
+
+class FrozenPrescription(FrozenModel, Prescription):
+    """An immutable and hashable `Prescription`.
+
+    Building a frozen prescription equal to an existing one gives the
+    existing instance, and so do its adds and prisms. The shared instances
+    are kept in `FrozenPrescription.pool`, see `InternPool`. Extra adds are
+    a tuple rather than a list.
+
+    Examples:
+        Typical use:
+        >>> rx = FrozenPrescription("-1.00/-0.50x180")
+        >>> rx is FrozenPrescription(sphere=-1, cylinder=-0.5, axis=180)
+        True
+        >>> rx.transpose()
+        PrescriptionError: FrozenPrescription cannot be changed, use thaw() for a mutable copy
+
+        Changing a copy:
+        >>> rx = FrozenPrescription("-1.00/-0.50x180").thaw()
+        >>> rx.transpose()
+    """
+
+    error = PrescriptionError
+    mutable_model = Prescription
+
+    add: FrozenAdd = FrozenAdd()
+    intermediate_add: FrozenAdd = FrozenAdd(working_distance_cm=50)
+    vertical_prism: FrozenVerticalPrism = FrozenVerticalPrism()
+    horizontal_prism: FrozenHorizontalPrism = FrozenHorizontalPrism()
+    reading_vertical_prism: FrozenVerticalPrism = FrozenVerticalPrism()
+    reading_horizontal_prism: FrozenHorizontalPrism = FrozenHorizontalPrism()
+    extra_adds: Tuple[FrozenAdd, ...] = ()  # type: ignore[assignment]
+
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:  # type: ignore[override]
+        """Give the fields, with extra adds as a list like `Prescription`."""
+        values = super().dict(**kwargs)
+        if "extra_adds" in values:
+            values["extra_adds"] = list(values["extra_adds"])
+        return values
+
+
+instrumentation.register_validators(FrozenPrescription, "rx.validate")
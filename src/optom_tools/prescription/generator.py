@@ -0,0 +1,123 @@
+"""Fast generation of synthetic prescriptions straight into a batch."""
+
+from typing import Iterator, List, Union
+
+import numpy as np
+
+from .batch import PrescriptionBatch
+from .exceptions import PrescriptionError
+from .prescription import random_powers
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+_ADDS = np.arange(0, 250, 25) / 100
+_VERTICAL_DIRECTIONS = np.array(["U", "D"])
+_HORIZONTAL_DIRECTIONS = np.array(["I", "O"])
+
+
+class PrescriptionGenerator:
+    """Generate realistic random prescriptions in bulk.
+
+    Draws from the same distribution as `Prescription.random()` (including add
+    and prism), but the cumulative weights are computed once and whole columns
+    are drawn at a time with NumPy. Each generator has its own
+    `numpy.random.Generator`, so results never depend on global random state,
+    and `spawn()` gives independent streams for threads or processes.
+
+    Args:
+        seed (Seed): Seed or `numpy.random.SeedSequence`. Defaults to fresh entropy.
+        rx_range (float): The +/- range of prescription in dioptres. Defaults to 30.
+
+    Examples:
+        Typical use:
+        >>> generator = PrescriptionGenerator(seed=42)
+        >>> batch = generator.batch(1_000_000)
+        >>> len(batch)
+        1000000
+
+        Generating in parallel:
+        >>> with ThreadPoolExecutor() as executor:
+        ...     batches = list(executor.map(
+        ...         lambda gen: gen.batch(1_000_000), generator.spawn(4)
+        ...     ))
+    """
+
+    def __init__(self, seed: Seed = None, rx_range: float = 30) -> None:
+        """Construct generator."""
+        self.seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self.rx_range = rx_range
+        powers, cum_weights = random_powers(rx_range)
+        if not powers:
+            raise PrescriptionError(
+                value=rx_range, message="rx_range must be at least 0.25"
+            )
+        self._powers = np.array(powers)
+        self._cum_weights = np.array(cum_weights)
+        self._rng = np.random.default_rng(self.seed_sequence)
+
+    def spawn(self, n: int) -> List["PrescriptionGenerator"]:
+        """Give generators with independent, reproducible streams.
+
+        Args:
+            n (int): Number of generators.
+
+        Returns:
+            (List[PrescriptionGenerator]): Generators to use in parallel.
+        """
+        return [
+            self.__class__(seed=child, rx_range=self.rx_range)
+            for child in self.seed_sequence.spawn(n)
+        ]
+
+    def _powers_sample(self, size: int) -> np.ndarray:
+        """Draw powers, weighted like `Prescription.random()`."""
+        targets = self._rng.random(size) * self._cum_weights[-1]
+        return self._powers[
+            np.searchsorted(self._cum_weights, targets, side="right")
+        ]
+
+    def batch(self, size: int) -> PrescriptionBatch:
+        """Generate a batch of random prescriptions.
+
+        All results have negative cylinders, as with `Prescription.random()`.
+
+        Args:
+            size (int): Number of prescriptions.
+
+        Returns:
+            (PrescriptionBatch): The prescriptions.
+        """
+        rng = self._rng
+        return PrescriptionBatch(
+            sphere=self._powers_sample(size),
+            cylinder=-np.abs(self._powers_sample(size)),
+            axis=rng.integers(0, 181, size).astype(np.float64),
+            add=_ADDS[rng.integers(0, len(_ADDS), size)],
+            vertical_prism=rng.integers(0, 6, size).astype(np.float64),
+            vertical_prism_direction=_VERTICAL_DIRECTIONS[
+                rng.integers(0, 2, size)
+            ],
+            horizontal_prism=rng.integers(0, 6, size).astype(np.float64),
+            horizontal_prism_direction=_HORIZONTAL_DIRECTIONS[
+                rng.integers(0, 2, size)
+            ],
+        )
+
+    def batches(
+        self, size: int, batch_size: int = 100_000
+    ) -> Iterator[PrescriptionBatch]:
+        """Stream `size` random prescriptions in batches.
+
+        Args:
+            size (int): Total number of prescriptions.
+            batch_size (int): Most prescriptions per batch. Defaults to 100,000.
+
+        Yields:
+            (PrescriptionBatch): The next batch.
+        """
+        for start in range(0, size, batch_size):
+            yield self.batch(min(batch_size, size - start))
@@ -0,0 +1,223 @@
+"""Hash index grouping equivalent prescriptions."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .batch import PrescriptionBatch
+from .canonical import DIRECTIONS, QUARTER, CanonicalKey, check_step
+from .prescription import Prescription
+
+# Packed codes must stay below this so they fit in an int64.
+_MAX_PACKED = 2**62
+
+
+def _distinct(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Give the distinct rows of `codes`, the first row of each and inverse.
+
+    Rows are packed into one integer each when their ranges allow, which
+    sorts far faster than comparing whole rows.
+    """
+    if not len(codes):
+        empty = np.empty(0, np.int64)
+        return codes, empty, empty
+    low = codes.min(axis=0)
+    sizes = (codes.max(axis=0) - low + 1).tolist()
+    total = 1
+    for size in sizes:
+        total *= size
+    if total >= _MAX_PACKED:
+        distinct, first, inverse = np.unique(
+            codes, axis=0, return_index=True, return_inverse=True
+        )
+        return distinct, first, inverse
+    packed = np.zeros(len(codes), np.int64)
+    for column, size in enumerate(sizes):
+        packed *= size
+        packed += codes[:, column] - low[column]
+    _, first, inverse = np.unique(
+        packed, return_index=True, return_inverse=True
+    )
+    return codes[first], first, inverse
+
+
+def _decode(row: List[int]) -> CanonicalKey:
+    """Give the `CanonicalKey` of a row of `_canonical_codes()`."""
+    values: List[Any] = list(row)
+    values[6] = DIRECTIONS[row[6]]
+    values[8] = DIRECTIONS[row[8]]
+    return CanonicalKey(*values)
+
+
+def _encode(key: CanonicalKey) -> List[int]:
+    """Give the row of `_canonical_codes()` of a `CanonicalKey`."""
+    row: List[Any] = list(key)
+    row[6] = DIRECTIONS.index(key.vertical_prism_direction)
+    row[8] = DIRECTIONS.index(key.horizontal_prism_direction)
+    return row
+
+
+class PrescriptionIndex:
+    """Group prescriptions that are the same lens, in one pass.
+
+    Every row added is given the number of its group: rows with the same
+    `CanonicalKey` share a group, numbered in order of first appearance.
+    Batches can be added one after another, e.g. from a `PrescriptionReader`.
+    Besides the group of each row, only one key per group is kept.
+
+    Grouping sorts the keys of each batch with NumPy, then looks each
+    distinct key up in a dict of the known groups, so there is no Python
+    loop over rows and lookups take constant time.
+
+    Args:
+        step (float): Step of every power, see `Prescription.canonical_key()`. Defaults to 0.25.
+
+    Examples:
+        Deduplicating an order history:
+        >>> index = PrescriptionIndex()
+        >>> for batch in PrescriptionReader("orders.csv"):
+        ...     index.add(batch)
+        >>> len(index), index.rows
+        (48211, 2000000)
+        >>> unique_rows = index.first_rows
+        >>> index.counts[:3]
+        array([12, 1, 40])
+
+        Finding every order of a lens:
+        >>> index.find(Prescription("plano/+1.00x90"))
+        array([     3,   1450, 918201])
+    """
+
+    def __init__(self, step: float = QUARTER) -> None:
+        """Construct empty index."""
+        check_step(step)
+        self.step = step
+        self.rows = 0
+        self._codes = np.empty((0, len(CanonicalKey._fields)), np.int64)
+        self._first_rows = np.empty(0, np.int64)
+        self._chunks: List[np.ndarray] = []
+        self._group_ids: Optional[np.ndarray] = None
+        self._groups: Dict[Tuple[int, ...], int] = {}
+
+    @classmethod
+    def from_batch(
+        cls, batch: PrescriptionBatch, step: float = QUARTER
+    ) -> "PrescriptionIndex":
+        """Build an index of one batch.
+
+        Args:
+            batch (PrescriptionBatch): The prescriptions.
+            step (float): Step of every power. Defaults to 0.25.
+
+        Returns:
+            (PrescriptionIndex): The index.
+        """
+        index = cls(step)
+        index.add(batch)
+        return index
+
+    def add(self, batch: PrescriptionBatch) -> np.ndarray:
+        """Add the rows of a batch after the rows already added.
+
+        Args:
+            batch (PrescriptionBatch): The prescriptions.
+
+        Returns:
+            (np.ndarray): The group of each row of the batch.
+        """
+        distinct, first, inverse = _distinct(batch._canonical_codes(self.step))
+        # Number the distinct keys of the batch in order of appearance.
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        distinct, first = distinct[order], first[order]
+        # Look the distinct keys up, numbering the unknown ones after.
+        keys = list(map(tuple, distinct.tolist()))
+        known = self._groups
+        groups = np.array(
+            [known.get(key, -1) for key in keys], dtype=np.int64
+        ).reshape(-1)
+        new = np.flatnonzero(groups < 0)
+        groups[new] = np.arange(len(known), len(known) + len(new))
+        known.update(
+            zip(
+                [keys[position] for position in new.tolist()],
+                groups[new].tolist(),
+            )
+        )
+        self._codes = np.concatenate([self._codes, distinct[new]])
+        self._first_rows = np.concatenate(
+            [self._first_rows, self.rows + first[new]]
+        )
+        group_ids = groups[rank[inverse]]
+        self._chunks.append(group_ids)
+        self._group_ids = None
+        self.rows += len(batch)
+        return group_ids
+
+    def __len__(self) -> int:
+        """Give the number of groups."""
+        return len(self._codes)
+
+    def __contains__(self, rx: Prescription) -> bool:
+        """Tell if a lens equivalent to `rx` was added."""
+        return self.group(rx) is not None
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(groups={len(self)}, rows={self.rows})"
+        )
+
+    def group(self, rx: Prescription) -> Optional[int]:
+        """Give the group of the lens `rx`, `None` if it was never added."""
+        return self._groups.get(tuple(_encode(rx.canonical_key(self.step))))
+
+    def keys(self) -> List[CanonicalKey]:
+        """Give the key of every group, in group order."""
+        return [_decode(row) for row in self._codes.tolist()]
+
+    @property
+    def group_ids(self) -> np.ndarray:
+        """Give the group of every row added."""
+        if self._group_ids is None:
+            self._group_ids = (
+                np.concatenate(self._chunks)
+                if self._chunks
+                else np.empty(0, np.int64)
+            )
+            self._chunks = [self._group_ids]
+        return self._group_ids
+
+    @property
+    def first_rows(self) -> np.ndarray:
+        """Give the first row of each group, the rows kept by deduplicating."""
+        return self._first_rows
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Give the number of rows in each group."""
+        return np.bincount(self.group_ids, minlength=len(self))
+
+    def duplicated(self) -> np.ndarray:
+        """Give a bool mask of the rows equivalent to an earlier row."""
+        mask = np.ones(self.rows, dtype=bool)
+        mask[self.first_rows] = False
+        return mask
+
+    def find(self, rx: Prescription) -> np.ndarray:
+        """Give the rows equivalent to `rx`, empty if there are none."""
+        group = self.group(rx)
+        if group is None:
+            return np.empty(0, np.int64)
+        return np.flatnonzero(self.group_ids == group)
+
+    def groups(self) -> List[np.ndarray]:
+        """Give the rows of every group, in group order.
+
+        One sort of the group numbers, rather than a search per group.
+        """
+        if not len(self):
+            return []
+        order = np.argsort(self.group_ids, kind="stable")
+        return np.split(order, np.cumsum(self.counts)[:-1])
@@ -1,12 +1,84 @@
 """Supporting models for the main Prescription model."""
 
-from typing import Optional
+from copy import deepcopy
+from typing import Any, Dict, Optional, Set, Type, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import validator
 from typing_extensions import Literal
 
+from optom_tools.utils.validation import assign_trusted, construct_trusted
+
 from .exceptions import PrescriptionError
+from .rules import ADD, PRISM, WORKING_DISTANCE
+
+Model = TypeVar("Model", bound="BaseModel")
+
+_SHARED_DEFAULTS: Set[int] = set()
+
+# Shared defaults by the id of their values, which borrowed copies share.
+_SHARED_VALUES: Dict[int, "BaseModel"] = {}
+
+
+def shared_default(model: Model) -> Model:
+    """Mark a model instance as a default shared by every prescription.
+
+    Shared defaults are never deep copied, so a plain sphere does not
+    allocate its own empty adds and prisms. Reading one from a prescription
+    gives it a borrowed copy sharing the default's values, which are copied
+    on write: changing it in place, e.g. `rx.add.add = 2`, only changes
+    `rx`.
+    """
+    _SHARED_DEFAULTS.add(id(model))
+    _SHARED_VALUES[id(model.__dict__)] = model
+    return model
+
+
+def _borrow(model: Model) -> Model:
+    """Give a new model sharing the values of a shared default."""
+    borrowed = model.__class__.__new__(model.__class__)
+    object.__setattr__(borrowed, "__dict__", model.__dict__)
+    object.__setattr__(borrowed, "__fields_set__", model.__fields_set__)
+    return borrowed
+
+
+class _SharedField:
+    """Field that swaps a shared default for a borrowed copy when read.
+
+    A data descriptor on the class is found before the value in the
+    instance `__dict__`, so only reads of this field pay for the check.
+    Each model gets its own borrowed copy, so a change made through any
+    reference to it only reaches that model.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Construct descriptor of a field."""
+        self.name = name
+
+    def __get__(self, model: Any, owner: Any = None) -> Any:
+        """Give the value of the field, borrowing it if it is shared."""
+        if model is None:
+            # Like other fields, which pydantic keeps off the class.
+            raise AttributeError(self.name)
+        value = model.__dict__[self.name]
+        if id(value) in _SHARED_DEFAULTS:
+            value = model.__dict__[self.name] = _borrow(value)
+        return value
+
+    def __set__(self, model: Any, value: Any) -> None:
+        """Set the value of the field, without validation."""
+        model.__dict__[self.name] = value
+
+
+def copy_on_write(model: Type[Model]) -> Type[Model]:
+    """Copy the shared defaults of a model class on their first change.
+
+    Used as a class decorator on models with `shared_default()` fields.
+    """
+    for name, field in model.__fields__.items():
+        if id(field.default) in _SHARED_DEFAULTS:
+            setattr(model, name, _SharedField(name))
+    return model
 
 
 class BaseModel(PydanticBaseModel):
@@ -17,6 +89,58 @@ class BaseModel(PydanticBaseModel):
 
         validate_assignment = True
 
+    @classmethod
+    def from_trusted(cls: Type[Model], **kwargs: Any) -> Model:
+        """Build a model from already validated values, skipping validation.
+
+        Takes the same keyword arguments as the model. Use it for data that
+        was validated before, e.g. rows read back from our own database.
+
+        Returns:
+            The unvalidated model.
+        """
+        return construct_trusted(cls, kwargs)
+
+    @property
+    def is_shared_default(self) -> bool:
+        """Whether this still shares the values of a default."""
+        return id(self.__dict__) in _SHARED_VALUES
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute, copying the values of a borrowed default first.
+
+        Validated unless inside `no_assignment_validation()`.
+
+        Raises:
+            PrescriptionError: When changing a shared default itself, e.g. from `Prescription.__fields__`.
+        """
+        if id(self.__dict__) in _SHARED_VALUES:
+            if id(self) in _SHARED_DEFAULTS:
+                raise PrescriptionError(
+                    value=name,
+                    message="Defaults are shared between prescriptions, assign a new one instead (e.g. rx.add = {'add': 2})",
+                )
+            object.__setattr__(self, "__dict__", dict(self.__dict__))
+            object.__setattr__(
+                self, "__fields_set__", set(self.__fields_set__)
+            )
+        if not assign_trusted(self, name, value):
+            super().__setattr__(name, value)
+
+    def __deepcopy__(self: Model, memo: Dict[int, Any]) -> Model:
+        """Copy deeply, except for shared defaults which are returned as is.
+
+        Pydantic deep copies field defaults for every new model, which made
+        building a prescription allocate five empty sub-models. Borrowed
+        copies give back their default, to be borrowed again when read.
+        """
+        shared = _SHARED_VALUES.get(id(self.__dict__))
+        if shared is not None:
+            return shared  # type: ignore
+        clone = self.__class__.__new__(self.__class__)
+        clone.__setstate__(deepcopy(self.__getstate__(), memo))
+        return clone
+
 
 class BasePrism(BaseModel):
     """Base Prism model."""
@@ -30,12 +154,7 @@ class BasePrism(BaseModel):
 
         The magnitude of a prism must be positive.
         """
-        if value < 0:
-            raise PrescriptionError(
-                value=value,
-                message="The prism dioptre must be a positive number",
-            )
-        return value
+        return PRISM.check(value, PrescriptionError)
 
 
 class HorizontalPrism(BasePrism):
@@ -74,11 +193,7 @@ class Add(BaseModel):
 
         Add must be a positive number.
         """
-        if value < 0:
-            raise PrescriptionError(
-                value=value, message="Add must be a positive number"
-            )
-        return value
+        return ADD.check(value, PrescriptionError)
 
     @validator("working_distance_cm")
     @classmethod
@@ -87,9 +202,4 @@ class Add(BaseModel):
 
         The working distance must be positive and no more than 600cm (what is considered optical infinity).
         """
-        if value < 0 or value > 600:
-            raise PrescriptionError(
-                value=value,
-                message="Working Distance (cm) must be greater than 0 cm and no greater than 600cm",
-            )
-        return value
+        return WORKING_DISTANCE.check(value, PrescriptionError)
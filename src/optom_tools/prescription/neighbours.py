@@ -0,0 +1,347 @@
+"""Nearest neighbour search over prescriptions in power vector space."""
+
+import functools
+from typing import Any, Iterator, List, Tuple
+
+import numpy as np
+
+from .batch import PrescriptionBatch
+from .exceptions import PrescriptionError
+from .prescription import Prescription
+
+# Default cell width in dioptres. Powers come in quarter dioptres, so M
+# takes eighth dioptre steps; smaller cells split those up by J0 and J45.
+CELL_SIZE = 0.05
+
+# Neighbouring cells looked up at once, bounding the memory of a query.
+_MAX_LOOKUPS = 1 << 20
+
+# Queries answered at once, bounding the memory of their candidates.
+_QUERY_BLOCK = 1024
+
+# Packed cells must stay below this so they fit in an int64.
+_MAX_PACKED = 2**62
+
+
+def _size(radius: int, shell: bool) -> int:
+    """Give the number of cells of a cube, or of its outer shell."""
+    cube = (2 * radius + 1) ** 3
+    return cube - (2 * radius - 1) ** 3 if shell and radius else cube
+
+
+@functools.lru_cache(maxsize=64)
+def _offsets(radius: int, shell: bool) -> np.ndarray:
+    """Give the cell offsets at most, or exactly, `radius` cells away.
+
+    Cells are `radius` away when one of their offsets is `radius` in size;
+    a shell is built face by face, so its inside is never made.
+    """
+    every = np.arange(-radius, radius + 1)
+    if not shell or not radius:
+        return np.stack(np.meshgrid(every, every, every), axis=-1).reshape(
+            -1, 3
+        )
+    inner = every[1:-1]
+    faces = []
+    for axis in range(3):
+        # A cell on several faces belongs to the face of its first axis.
+        steps = [inner] * axis + [every] * (2 - axis)
+        steps.insert(axis, np.array([-radius, radius]))
+        faces.append(
+            np.stack(np.meshgrid(*steps, indexing="ij"), axis=-1).reshape(
+                -1, 3
+            )
+        )
+    return np.concatenate(faces)
+
+
+def _vectors(other: Any) -> np.ndarray:
+    """Give the power vectors of a prescription, batch or array of vectors."""
+    if isinstance(other, Prescription):
+        return np.array([other.power_vector], dtype=np.float64)
+    if isinstance(other, PrescriptionBatch):
+        return other.power_vectors
+    vectors = np.asarray(other, dtype=np.float64)
+    if vectors.ndim not in (1, 2) or vectors.shape[-1] != 3:
+        raise PrescriptionError(
+            value=vectors.shape,
+            message="Power vectors must have 3 columns",
+        )
+    return vectors.reshape(-1, 3)
+
+
+class NeighbourIndex:
+    """Find the prescriptions closest to others, in power vector space.
+
+    The distance between two prescriptions is the blur strength of their
+    difference, `PrescriptionBatch.distance()`: the length of the
+    difference of their (M, J0, J45) power vectors. J0 and J45 depend on
+    twice the axis, so an axis of 179 is as close to 1 as 3 is, and 0 is
+    the same as 180.
+
+    The power vectors are bucketed into a grid of cubes `cell_size`
+    dioptres wide, sorted by cell. A query looks at the cells around it,
+    nearest first, and stops once no unseen cell can hold a closer
+    prescription. Queries are answered together with NumPy, so there is
+    no Python loop over rows or queries.
+
+    Args:
+        batch (PrescriptionBatch): The prescriptions to search.
+        cell_size (float): Width of the grid cells in dioptres. Defaults to 0.05.
+
+    Examples:
+        Suggesting stock lenses:
+        >>> index = NeighbourIndex(stock)
+        >>> distances, rows = index.query(Prescription("-2.00/-0.75x178"), k=3)
+        >>> rows
+        array([1204,   88, 5310])
+        >>> stock[rows]
+
+        Flagging near-duplicate remakes for a whole day of orders:
+        >>> distances, rows = index.query(orders, k=1)
+        >>> orders[distances[:, 0] <= 0.125]
+
+        Everything within half a dioptre:
+        >>> distances, rows = index.query_radius(orders, 0.5)
+        >>> [len(found) for found in rows]
+        [12, 0, 3]
+    """
+
+    def __init__(
+        self, batch: PrescriptionBatch, cell_size: float = CELL_SIZE
+    ) -> None:
+        """Construct index of a batch."""
+        if cell_size <= 0:
+            raise PrescriptionError(
+                value=cell_size, message="cell_size must be a positive number"
+            )
+        self.batch = batch
+        self.cell_size = cell_size
+        vectors = batch.power_vectors
+        cells = np.floor(vectors / cell_size).astype(np.int64)
+        if len(cells):
+            self._low = cells.min(axis=0)
+            self._shape = cells.max(axis=0) - self._low + 1
+        else:
+            self._low = np.zeros(3, np.int64)
+            self._shape = np.ones(3, np.int64)
+        if int(np.prod(self._shape.astype(object))) >= _MAX_PACKED:
+            raise PrescriptionError(
+                value=cell_size,
+                message="cell_size is too small for the spread of powers",
+            )
+        cells -= self._low
+        keys = self._pack(cells)
+        order = np.argsort(keys, kind="stable")
+        self._rows = order
+        self._vectors = vectors[order]
+        self._cells, self._starts = np.unique(keys[order], return_index=True)
+        self._stops = np.append(self._starts[1:], len(order))
+        self._occupied = cells[order[self._starts]]
+
+    def __len__(self) -> int:
+        """Give the number of prescriptions."""
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(rows={len(self)}, "
+            f"cells={len(self._cells)}, cell_size={self.cell_size})"
+        )
+
+    def _pack(self, cells: np.ndarray) -> np.ndarray:
+        """Give one integer per grid cell."""
+        return (cells[:, 0] * self._shape[1] + cells[:, 1]) * self._shape[
+            2
+        ] + cells[:, 2]
+
+    def _grid(self, vectors: np.ndarray) -> np.ndarray:
+        """Give the grid cell of power vectors, relative to the lowest."""
+        return np.floor(vectors / self.cell_size).astype(np.int64) - self._low
+
+    def _around(
+        self, cells: np.ndarray, radius: int, shell: bool
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Give the occupied cells near each query cell, in blocks of queries.
+
+        Looking up every cell nearby is fast for small radii; past the
+        number of occupied cells, scanning those is cheaper.
+        """
+        if not len(self._cells):
+            return
+        if _size(radius, shell) > len(self._cells):
+            block = max(1, _MAX_LOOKUPS // len(self._cells))
+            for first in range(0, len(cells), block):
+                away = np.abs(
+                    self._occupied - cells[first : first + block, None]
+                ).max(axis=-1)
+                query, found = np.nonzero(
+                    away == radius if shell else away <= radius
+                )
+                yield query + first, found
+            return
+        offsets = _offsets(radius, shell)
+        block = max(1, _MAX_LOOKUPS // len(offsets))
+        for first in range(0, len(cells), block):
+            around = cells[first : first + block, None] + offsets
+            query, offset = np.nonzero(
+                ((around >= 0) & (around < self._shape)).all(axis=-1)
+            )
+            keys = self._pack(around[query, offset])
+            found = np.searchsorted(self._cells, keys)
+            found[found == len(self._cells)] = 0
+            hit = self._cells[found] == keys
+            yield query[hit] + first, found[hit]
+
+    def _candidates(
+        self, cells: np.ndarray, radius: int, shell: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Give the points in the cells near each query cell.
+
+        Args:
+            cells (np.ndarray): Grid cell of each query.
+            radius (int): Greatest number of cells away on any axis.
+            shell (bool): Only the cells exactly `radius` away. Defaults to False.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): Query of each candidate and its position in the sorted points.
+        """
+        queries, points = [], []
+        for query, found in self._around(cells, radius, shell):
+            # Every point of each cell found, without a loop over cells.
+            lengths = self._stops[found] - self._starts[found]
+            ends = np.cumsum(lengths)
+            queries.append(np.repeat(query, lengths))
+            points.append(
+                np.arange(ends[-1] if len(ends) else 0)
+                + np.repeat(self._starts[found] - ends + lengths, lengths)
+            )
+        if not queries:
+            empty = np.empty(0, np.int64)
+            return empty, empty
+        return np.concatenate(queries), np.concatenate(points)
+
+    def query(self, other: Any, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Give the `k` prescriptions closest to each query.
+
+        Args:
+            other (Any): A `Prescription`, a `PrescriptionBatch` or an array of `(M, J0, J45)` power vectors.
+            k (int): Number of neighbours. Defaults to 1.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): Distances in dioptres and rows of the batch, nearest first, of shape `(k,)` for a `Prescription` and `(n, k)` otherwise. Missing neighbours have distance `inf` and row -1.
+        """
+        if k < 1:
+            raise PrescriptionError(value=k, message="k must be at least 1")
+        vectors = _vectors(other)
+        distances = np.full((len(vectors), k), np.inf)
+        positions = np.full((len(vectors), k), -1, np.int64)
+        if len(self):
+            for first in range(0, len(vectors), _QUERY_BLOCK):
+                block = slice(first, first + _QUERY_BLOCK)
+                self._nearest(
+                    vectors[block], distances[block], positions[block]
+                )
+        # Position -1, no neighbour, picks the -1 appended.
+        rows = np.append(self._rows, -1)[positions]
+        if isinstance(other, Prescription):
+            return distances[0], rows[0]
+        return distances, rows
+
+    def _nearest(
+        self, vectors: np.ndarray, distances: np.ndarray, positions: np.ndarray
+    ) -> None:
+        """Fill in the nearest points of a block of queries, shell by shell."""
+        cells = self._grid(vectors)
+        # Shells nearer than the grid are empty, farther ones hold nothing.
+        radius = np.maximum(cells - self._shape + 1, -cells).max(axis=1)
+        radius = np.maximum(radius, 0)
+        last = np.maximum(cells, self._shape - 1 - cells).max(axis=1)
+        active = np.arange(len(vectors))
+        while len(active):
+            for shell in np.unique(radius[active]).tolist():
+                group = active[radius[active] == shell]
+                query, points = self._candidates(
+                    cells[group], shell, shell=True
+                )
+                if len(points):
+                    self._merge(
+                        vectors, distances, positions, group[query], points
+                    )
+            # A point `r + 1` cells away is more than `r` cells' width away.
+            seen = radius[active]
+            done = (distances[active, -1] <= seen * self.cell_size) | (
+                seen >= last[active]
+            )
+            radius[active] += 1
+            active = active[~done]
+
+    def _merge(
+        self,
+        vectors: np.ndarray,
+        distances: np.ndarray,
+        positions: np.ndarray,
+        queries: np.ndarray,
+        points: np.ndarray,
+    ) -> None:
+        """Keep the `k` nearest of the best so far and new candidates."""
+        k = distances.shape[1]
+        group = np.unique(queries)
+        found = np.sqrt(
+            np.square(self._vectors[points] - vectors[queries]).sum(axis=1)
+        )
+        every_query = np.concatenate([np.repeat(group, k), queries])
+        every_distance = np.concatenate([distances[group].ravel(), found])
+        every_point = np.concatenate([positions[group].ravel(), points])
+        order = np.lexsort((every_distance, every_query))
+        # Each query has at least `k` entries, the first `k` are the best.
+        best = order[
+            np.searchsorted(every_query[order], group)[:, None] + np.arange(k)
+        ]
+        distances[group] = every_distance[best]
+        positions[group] = every_point[best]
+
+    def query_radius(self, other: Any, radius: float) -> Tuple[Any, Any]:
+        """Give the prescriptions within `radius` dioptres of each query.
+
+        Args:
+            other (Any): A `Prescription`, a `PrescriptionBatch` or an array of `(M, J0, J45)` power vectors.
+            radius (float): Greatest distance in dioptres, included.
+
+        Returns:
+            (Tuple[Any, Any]): Distances and rows of the batch, nearest first, as arrays for a `Prescription` and lists of arrays, one per query, otherwise.
+        """
+        if radius < 0:
+            raise PrescriptionError(
+                value=radius, message="radius must be zero or more"
+            )
+        vectors = _vectors(other)
+        distances: List[np.ndarray] = []
+        rows: List[np.ndarray] = []
+        for first in range(0, len(vectors), _QUERY_BLOCK):
+            found, points = self._within(
+                vectors[first : first + _QUERY_BLOCK], radius
+            )
+            distances += found
+            rows += [self._rows[block] for block in points]
+        if isinstance(other, Prescription):
+            return distances[0], rows[0]
+        return distances, rows
+
+    def _within(
+        self, vectors: np.ndarray, radius: float
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Give the distances and positions of the points near each query."""
+        cells = self._grid(vectors)
+        # A point `r + 1` cells away is more than `r` cells' width away.
+        reach = int(np.ceil(radius / self.cell_size))
+        query, points = self._candidates(cells, reach)
+        found = np.sqrt(
+            np.square(self._vectors[points] - vectors[query]).sum(axis=1)
+        )
+        near = found <= radius
+        query, points, found = query[near], points[near], found[near]
+        order = np.lexsort((found, query))
+        splits = np.cumsum(np.bincount(query, minlength=len(vectors)))[:-1]
+        return np.split(found[order], splits), np.split(points[order], splits)
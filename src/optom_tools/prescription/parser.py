@@ -0,0 +1,240 @@
+"""Single-pass parser for prescriptions written in optometric notation."""
+
+import re
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from optom_tools.utils.cache import ParseCache
+
+from .exceptions import PrescriptionError
+
+_NUMBER = r"[+\-−]?(?:\d+(?:\.\d*)?|\.\d+)"
+
+_DISTANCE = re.compile(
+    rf"""
+    (?:(?P<plano>plano|pl)\b\.?|(?P<sphere>{_NUMBER}))
+    (?:\s*(?:D\.S\.|(?:DS|D|sph)\b))?
+    (?:
+        (?:\s*/\s*|\s+(?={_NUMBER}\s*(?:DC\s*)?[x×*]))
+        (?:
+            (?P<no_cylinder>DS|plano|pl)\b
+          |
+            (?P<cylinder>{_NUMBER})(?:\s*D?C?)?
+            \s*[x×*]\s*(?P<axis>\d+(?:\.\d*)?|\.\d+)
+        )
+    )?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_SECTION = re.compile(
+    rf"""
+    [\s,;]*
+    (?:
+        (?:(?P<intermediate>int(?:ermediate)?\.?\s*(?:add)?)|(?:near\s*)?add)
+        \s*:?\s*(?P<add>{_NUMBER})(?:\s*D\b)?
+        (?:\s*@\s*(?P<working_distance>{_NUMBER})\s*(?:cm)?)?
+      |
+        (?:prism\s*:?\s*)?
+        (?P<prism>{_NUMBER})\s*(?:Δ|\^|p\.?d\.?|prism)?\s*
+        B(?:ase)?\s*(?P<base>up|down|in|out|right|left|U|D|I|O|R|L)\b
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+WORKING_DISTANCE_CM = 40.0
+INTERMEDIATE_WORKING_DISTANCE_CM = 50.0
+
+_BASE_DIRECTIONS = {
+    "up": "U",
+    "down": "D",
+    "in": "I",
+    "out": "O",
+    "right": "R",
+    "left": "L",
+}
+
+
+class RxComponents(NamedTuple):
+    """Components of a parsed prescription.
+
+    Sections that are missing from the text are `None`.
+    """
+
+    sphere: float
+    cylinder: float = 0.0
+    axis: float = 180.0
+    add: Optional[float] = None
+    working_distance_cm: Optional[float] = None
+    intermediate_add: Optional[float] = None
+    intermediate_working_distance_cm: Optional[float] = None
+    vertical_prism: Optional[float] = None
+    vertical_prism_direction: Optional[str] = None
+    horizontal_prism: Optional[float] = None
+    horizontal_prism_direction: Optional[str] = None
+
+    def to_kwargs(self) -> Dict[str, Any]:
+        """Give keyword arguments for `Prescription` covering the parsed sections.
+
+        Returns:
+            (Dict[str, Any]): Keyword arguments.
+        """
+        kwargs: Dict[str, Any] = {
+            "sphere": self.sphere,
+            "cylinder": self.cylinder,
+            "axis": self.axis,
+        }
+        if self.add is not None:
+            kwargs["add"] = _add_kwargs(self.add, self.working_distance_cm)
+        if self.intermediate_add is not None:
+            kwargs["intermediate_add"] = _add_kwargs(
+                self.intermediate_add,
+                self.intermediate_working_distance_cm,
+                INTERMEDIATE_WORKING_DISTANCE_CM,
+            )
+        if self.vertical_prism is not None:
+            kwargs["vertical_prism"] = {
+                "magnitude": self.vertical_prism,
+                "direction": self.vertical_prism_direction,
+            }
+        if self.horizontal_prism is not None:
+            kwargs["horizontal_prism"] = {
+                "magnitude": self.horizontal_prism,
+                "direction": self.horizontal_prism_direction,
+            }
+        return kwargs
+
+
+def _add_kwargs(
+    add: float,
+    working_distance_cm: Optional[float],
+    default_working_distance_cm: float = WORKING_DISTANCE_CM,
+) -> Dict[str, float]:
+    """Give keyword arguments for an `Add`."""
+    if working_distance_cm is None:
+        working_distance_cm = default_working_distance_cm
+    return {"add": add, "working_distance_cm": working_distance_cm}
+
+
+def _to_float(value: str) -> float:
+    """Convert a number token, accepting the unicode minus sign."""
+    return float(value.replace("−", "-"))
+
+
+def parse_rx(rx: str) -> RxComponents:
+    """Parse a prescription in a single pass.
+
+    Understands plano/pl/DS, signed or unsigned powers, an add with working
+    distance, an intermediate add and prism with base direction, in the same
+    notation `str(Prescription)` produces.
+
+    Repeated text is served from `parse_cache` when it is enabled.
+
+    Args:
+        rx (str): The prescription as a string.
+
+    Returns:
+        (RxComponents): The parsed components.
+
+    Raises:
+        PrescriptionError: The prescription could not be parsed.
+
+    Examples:
+        Typical use:
+        >>> parse_rx("+1.00/-0.50x90 Add +2.00@33")
+        RxComponents(sphere=1.0, cylinder=-0.5, axis=90.0, add=2.0, working_distance_cm=33.0, ...)
+        >>> parse_rx("pl 2 BU").vertical_prism_direction
+        'U'
+    """
+    return parse_cache(rx)
+
+
+def _parse_rx(rx: str) -> RxComponents:
+    """Parse a prescription without the cache."""
+    if rx.count("/") > 1:
+        raise PrescriptionError(
+            value=rx, message="Only one '/' can be parsed."
+        )
+    text = rx.strip(" \t\r\n,;")
+    match = _DISTANCE.match(text)
+    if match is None:
+        raise PrescriptionError(
+            value=rx, message="Unable to parse prescription"
+        )
+    sphere = 0.0 if match.group("plano") else _to_float(match.group("sphere"))
+    cylinder = 0.0
+    axis = 180.0
+    if match.group("cylinder") is not None:
+        cylinder = _to_float(match.group("cylinder"))
+        axis = float(match.group("axis"))
+
+    return RxComponents(
+        sphere, cylinder, axis, *_parse_sections(rx, text, match.end())
+    )
+
+
+def _parse_sections(rx: str, text: str, pos: int) -> Tuple[Any, ...]:
+    """Parse the add, intermediate add and prism sections in any order."""
+    add = working_distance = None
+    intermediate_add = intermediate_working_distance = None
+    vertical = vertical_direction = None
+    horizontal = horizontal_direction = None
+
+    end = len(text)
+    while pos < end:
+        section = _SECTION.match(text, pos)
+        if section is None:
+            raise PrescriptionError(
+                value=rx, message="Unable to parse prescription"
+            )
+        pos = section.end()
+        if section.group("add") is not None:
+            value = _to_float(section.group("add"))
+            distance = section.group("working_distance")
+            distance_cm = None if distance is None else _to_float(distance)
+            if section.group("intermediate") is None:
+                if add is not None:
+                    raise PrescriptionError(
+                        value=rx, message="Only one add can be parsed."
+                    )
+                add, working_distance = value, distance_cm
+            else:
+                if intermediate_add is not None:
+                    raise PrescriptionError(
+                        value=rx,
+                        message="Only one intermediate add can be parsed.",
+                    )
+                intermediate_add = value
+                intermediate_working_distance = distance_cm
+            continue
+        base = section.group("base").lower()
+        direction = _BASE_DIRECTIONS.get(base, base.upper())
+        magnitude = _to_float(section.group("prism"))
+        if direction in ("U", "D"):
+            if vertical is not None:
+                raise PrescriptionError(
+                    value=rx, message="Only one vertical prism can be parsed."
+                )
+            vertical, vertical_direction = magnitude, direction
+        else:
+            if horizontal is not None:
+                raise PrescriptionError(
+                    value=rx,
+                    message="Only one horizontal prism can be parsed.",
+                )
+            horizontal, horizontal_direction = magnitude, direction
+
+    return (
+        add,
+        working_distance,
+        intermediate_add,
+        intermediate_working_distance,
+        vertical,
+        vertical_direction,
+        horizontal,
+        horizontal_direction,
+    )
+
+
+parse_cache = ParseCache(_parse_rx)
+"""Opt-in cache for `parse_rx()`, e.g. `parse_cache.enable(maxsize=1024)`."""
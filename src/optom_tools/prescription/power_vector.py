@@ -0,0 +1,76 @@
+"""Thibos power vectors for averaging and comparing prescriptions."""
+
+import math
+from typing import NamedTuple, Tuple
+
+# Removes floating point noise left by the trigonometry, e.g. an axis of
+# 29.999999999999996 becomes 30.
+ROUND_PLACES = 10
+
+
+class PowerVector(NamedTuple):
+    """A prescription as a Thibos power vector, in dioptres.
+
+    `m` is the mean sphere (spherical equivalent), and `j0` and `j45` are the
+    Jackson cross cylinders at 0 and 45 degrees. Unlike sphere, cylinder and
+    axis, power vectors can be added, subtracted and averaged component by
+    component.
+    """
+
+    m: float
+    j0: float
+    j45: float
+
+    @property
+    def blur_strength(self) -> float:
+        """Give the length of the vector.
+
+        Returns:
+            (float): The blur strength in dioptres.
+        """
+        return math.sqrt(self.m**2 + self.j0**2 + self.j45**2)
+
+    def to_sphero_cylinder(self) -> Tuple[float, float, float]:
+        """Convert the vector back to sphere, cylinder and axis.
+
+        Returns:
+            (Tuple[float, float, float]): Sphere, negative cylinder and axis (0 to 180 degrees, 180 when there is no cylinder).
+        """
+        j = math.hypot(self.j0, self.j45)
+        if j == 0:
+            return round(self.m, ROUND_PLACES), 0.0, 180.0
+        axis = round(
+            math.degrees(math.atan2(self.j45, self.j0)) / 2, ROUND_PLACES
+        )
+        if axis <= 0:
+            axis += 180
+        return (
+            round(self.m + j, ROUND_PLACES),
+            round(-2 * j, ROUND_PLACES),
+            axis,
+        )
+
+
+def to_power_vector(
+    sphere: float, cylinder: float, axis: float
+) -> PowerVector:
+    """Convert sphere, cylinder and axis to a power vector.
+
+    Args:
+        sphere (float): Sphere power in dioptres.
+        cylinder (float): Cylinder power in dioptres, in either sign.
+        axis (float): Cylinder axis in degrees.
+
+    Returns:
+        (PowerVector): The power vector.
+
+    Examples:
+        Typical use:
+        >>> to_power_vector(1, -1, 90)
+        PowerVector(m=0.5, j0=-0.5, j45=6.123233995736766e-17)
+    """
+    half = cylinder / 2
+    radians = math.radians(2 * axis)
+    return PowerVector(
+        sphere + half, -half * math.cos(radians), -half * math.sin(radians)
+    )
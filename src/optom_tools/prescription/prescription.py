@@ -1,18 +1,73 @@
 """Main entry point for the pydantic model."""
 
+import functools
+import itertools
 import math
 import random
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import pydantic
 from typing_extensions import Literal
 
-from optom_tools.utils import strip_decimal
+from optom_tools.utils import give_plus_sign, strip_decimal
+from optom_tools.utils.instrument import instrumentation
 
+from .canonical import QUARTER, CanonicalKey, canonical_key
 from .exceptions import PrescriptionError
-from .models import Add, BaseModel, HorizontalPrism, VerticalPrism
+from .models import (
+    Add,
+    BaseModel,
+    HorizontalPrism,
+    VerticalPrism,
+    copy_on_write,
+    shared_default,
+)
+from .parser import RxComponents, parse_rx
+from .power_vector import PowerVector, to_power_vector
+from .rules import AXIS
+from .vertex import check_round_to, vertex_power
+
+if TYPE_CHECKING:
+    from .frozen import FrozenPrescription
+
+MEAN = -1
+STD = 1
+
+
+def _pdf(x: float, mean: float = MEAN, std: float = STD) -> float:
+    """Point density function for weighting random selection of prescriptions.
+
+    This is inplace because more extreme prescriptions like -30 are rare.
+    """
+    y = (x - mean) / std
+    inter = (math.exp(-1 * y**2 / 2)) / math.sqrt(2 * math.pi)
+    return inter / std
+
+
+@functools.lru_cache(maxsize=None)
+def random_powers(
+    rx_range: float = 30,
+) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Give the powers random prescriptions are drawn from.
 
+    Computed once per range and shared by `Prescription.random()` and
+    `PrescriptionGenerator`.
 
+    Args:
+        rx_range (float): The +/- range of prescription in dioptres.
+
+    Returns:
+        (Tuple[Tuple[float, ...], Tuple[float, ...]]): The powers in 0.25D steps and their cumulative weights.
+    """
+    powers = tuple(
+        x / 100
+        for x in range(int(-1 * rx_range * 100), int(rx_range * 100), 25)
+    )
+    cum_weights = tuple(itertools.accumulate(_pdf(x) for x in powers))
+    return powers, cum_weights
+
+
+@copy_on_write
 class Prescription(BaseModel):
     """The prescription module contains methods to deal with spectacle prescriptions.
 
@@ -24,19 +79,26 @@ class Prescription(BaseModel):
         >>> rx = Prescription(sphere=1, add={"add": 1})
         >>> str(rx)
         '+1.00 DS Add: +1.00 @ 40cm'
+
+        Adds and prisms that are not given are shared between prescriptions,
+        and copied the first time they are changed:
+        >>> rx = Prescription(sphere=1)
+        >>> rx.add.add = 2
     """
 
     sphere: float = 0
     cylinder: float = 0
     axis: float = 180
-    add: Add = Add()
-    intermediate_add: Add = Add(working_distance_cm=50)
+    add: Add = shared_default(Add())
+    intermediate_add: Add = shared_default(Add(working_distance_cm=50))
     back_vertex_mm: float = 12.0
 
-    vertical_prism: VerticalPrism = VerticalPrism()
-    horizontal_prism: HorizontalPrism = HorizontalPrism()
-    reading_vertical_prism: VerticalPrism = VerticalPrism()
-    reading_horizontal_prism: HorizontalPrism = HorizontalPrism()
+    vertical_prism: VerticalPrism = shared_default(VerticalPrism())
+    horizontal_prism: HorizontalPrism = shared_default(HorizontalPrism())
+    reading_vertical_prism: VerticalPrism = shared_default(VerticalPrism())
+    reading_horizontal_prism: HorizontalPrism = shared_default(
+        HorizontalPrism()
+    )
     extra_adds: List[Add] = []
 
     @pydantic.validator("axis")
@@ -46,11 +108,7 @@ class Prescription(BaseModel):
 
         Axis must be between 180 to 0 degrees.
         """
-        if value > 180 or value < 0:
-            raise PrescriptionError(
-                value=value, message="Axis must be between 0 and 180 degrees"
-            )
-        return value
+        return AXIS.check(value, PrescriptionError)
 
     @property
     def mean_sphere(self) -> float:
@@ -61,13 +119,46 @@ class Prescription(BaseModel):
         """
         return self.sphere + (self.cylinder / 2)
 
+    @property
+    def power_vector(self) -> PowerVector:
+        """Provide the prescription as a Thibos power vector.
+
+        Use power vectors to average or compare prescriptions; the `m`
+        component is the mean sphere.
+
+        Returns:
+            (PowerVector): The M, J0 and J45 components.
+        """
+        return to_power_vector(self.sphere, self.cylinder, self.axis)
+
+    @classmethod
+    def from_power_vector(
+        cls, power_vector: Tuple[float, float, float], **kwargs
+    ) -> "Prescription":
+        """Build a prescription from a Thibos power vector.
+
+        The prescription is given in negative cylinder form.
+
+        Args:
+            power_vector (Tuple[float, float, float]): The M, J0 and J45 components.
+            **kwargs: Other fields of the prescription, e.g. `add`.
+
+        Returns:
+            (Prescription): The prescription.
+
+        Examples:
+            Typical use:
+            >>> str(Prescription.from_power_vector((0.5, -0.5, 0)))
+            '+1.00 / -1.00 x 90'
+        """
+        vector = PowerVector(*power_vector)
+        sphere, cylinder, axis = vector.to_sphero_cylinder()
+        return cls(sphere=sphere, cylinder=cylinder, axis=axis, **kwargs)
+
     def __init__(self, *args, **kwargs):
         """Init method."""
         if len(args) >= 1:
-            components = self._simple_parse_rx(args[0])
-            kwargs["sphere"] = components[0]
-            kwargs["cylinder"] = components[1]
-            kwargs["axis"] = components[2]
+            kwargs.update(self._simple_parse_rx(args[0]).to_kwargs())
         super().__init__(**kwargs)
 
     def transpose(self, flag: Optional[Literal["n", "p"]] = None) -> None:
@@ -113,40 +204,122 @@ class Prescription(BaseModel):
                 new_axis = new_axis - 180
             self.axis = new_axis
 
-    def _simple_parse_rx(self, rx: str) -> Tuple[str, str, str]:
-        """Parse rx for a simple input.
+    def canonical_key(self, step: float = QUARTER) -> CanonicalKey:
+        """Give a hashable key that is equal for equivalent lenses.
 
-        And returns a tuple with sphere, cylinder and axis as strings.
+        The key is the canonical form: negative cylinder, each meridian,
+        add and prism rounded to `step`, and the axis to a whole degree.
+        Working distances, the vertex distance, reading prisms and extra adds
+        are not part of it.
 
-        For example: simple input is '+1.00/-1.00x90'
+        Args:
+            step (float): Step of every power. Defaults to 0.25.
+
+        Returns:
+            (CanonicalKey): The key.
+
+        Examples:
+            The same lens written two ways:
+            >>> a = Prescription("+1.00/-1.00x180").canonical_key()
+            >>> a == Prescription("plano/+1.00x90").canonical_key()
+            True
+            >>> a
+            CanonicalKey(sphere=4, cylinder=-4, axis=180, add=0, ...)
         """
-        # TODO: parse this '+1.00/-1.00x90 Add +2.00@40'
-        rx_components = rx.split("/")
-        if len(rx_components) > 2:
-            raise PrescriptionError(
-                value=rx_components, message="Only one '/' can be parsed."
-            )
-        sphere = rx_components[0]
-        cylinder = "0"
-        axis = "180"
-        if len(rx_components) > 1:
-            cylinder_all = rx_components[1]
+        return canonical_key(
+            self.sphere,
+            self.cylinder,
+            self.axis,
+            self.add.add,
+            self.intermediate_add.add,
+            self.vertical_prism.magnitude,
+            self.vertical_prism.direction,
+            self.horizontal_prism.magnitude,
+            self.horizontal_prism.direction,
+            step,
+        )
 
-            cyl_components = cylinder_all.split("x")
-            cylinder = cyl_components[0]
-            axis = cyl_components[1]
+    def canonical(self, step: float = QUARTER) -> "Prescription":
+        """Give a copy in canonical form, see `canonical_key()`.
 
-        if type(sphere) == str and sphere[0:2] == "pl":
-            sphere = "0"
+        Args:
+            step (float): Step of every power. Defaults to 0.25.
 
-        return (sphere, cylinder, axis)
+        Returns:
+            (Prescription): Equivalent prescription in canonical form.
 
-        # TODO: efficient Rx parser to be written.
+        Examples:
+            Typical use:
+            >>> str(Prescription("plano/+1.10x89.6").canonical())
+            "+1.00 / -1.00 x 180"
+        """
+        key = self.canonical_key(step)
+        values = self.dict()
+        values.update(
+            sphere=key.sphere * step,
+            cylinder=key.cylinder * step,
+            axis=key.axis,
+        )
+        values["add"]["add"] = key.add * step
+        values["intermediate_add"]["add"] = key.intermediate_add * step
+        for name in ("vertical_prism", "horizontal_prism"):
+            values[name] = {
+                "magnitude": getattr(key, name) * step,
+                "direction": getattr(key, f"{name}_direction") or None,
+            }
+        return self.__class__(**values)
+
+    def vertex_compensate(
+        self, vertex_mm: float = 0, round_to: Optional[float] = None
+    ) -> None:
+        """Move the prescription to a new vertex distance.
+
+        Each principal meridian is compensated from `back_vertex_mm` to
+        `vertex_mm` separately, so cylinders are handled correctly, and
+        `back_vertex_mm` is then set to `vertex_mm`. Adds and prisms are left
+        as they are.
+
+        Args:
+            vertex_mm (float): The new vertex distance in mm. Defaults to 0 (contact lens).
+            round_to (Optional[float]): Round each meridian to this step (e.g. 0.25). Defaults to no rounding.
+
+        Examples:
+            Spectacles (12mm) to contact lenses:
+            >>> rx = Prescription("-5.00/-1.00x180")
+            >>> rx.vertex_compensate(0, round_to=0.25)
+            >>> str(rx)
+            '-4.75 / -0.75 x 180'
+
+            And back to spectacles:
+            >>> rx.vertex_compensate(12, round_to=0.25)
+        """
+        check_round_to(round_to)
+        meridians = [
+            vertex_power(power, self.back_vertex_mm, vertex_mm)
+            for power in (self.sphere, self.sphere + self.cylinder)
+        ]
+        if round_to is not None:
+            meridians = [
+                round(power / round_to) * round_to + 0.0 for power in meridians
+            ]
+        self.sphere = meridians[0]
+        self.cylinder = meridians[1] - meridians[0]
+        self.back_vertex_mm = vertex_mm
+
+    def _simple_parse_rx(self, rx: str) -> RxComponents:
+        """Parse rx into its components.
+
+        For example: '+1.00/-1.00x90 Add +2.00@40'. See `parse_rx()` for the
+        notation that is understood.
+        """
+        return parse_rx(rx)
 
     def parse(self, rx: str) -> BaseModel:
         """Parse a prescription in a more typical format.
 
         This is more familiar than setting a prescription using keyword arguments.
+        Only the sections present in `rx` are set; an add or prism that is
+        not written is left as it was.
 
         Args:
             rx (str): The prescription as a string.
@@ -157,11 +330,14 @@ class Prescription(BaseModel):
             >>> rx.transpose()
             >>> str(rx)
             'pl / +1.00 x 90'
+
+            Parsing an add and prism:
+            >>> rx = Prescription().parse("-2.00/-0.50x10 Add +2.00@40 2 BU")
+            >>> rx.vertical_prism
+            VerticalPrism(magnitude=2.0, direction='U')
         """
-        rx_tuple = self._simple_parse_rx(rx)
-        self.sphere = float(rx_tuple[0])
-        self.cylinder = float(rx_tuple[1])
-        self.axis = float(rx_tuple[2])
+        for name, value in self._simple_parse_rx(rx).to_kwargs().items():
+            setattr(self, name, value)
         return self
 
     # TODO: need to distribute rx normally.
@@ -172,7 +348,7 @@ class Prescription(BaseModel):
 
         Args:
             rx_range (float): The +/- range of prescription in dioptres.
-            seed (Optional[int]): Seed for setting random.seed().
+            seed (Optional[int]): Seed for a private `random.Random`, leaving the global random state alone. Defaults to using the global `random` module.
 
         Examples:
             Typical use:
@@ -180,65 +356,65 @@ class Prescription(BaseModel):
             >>> str(rx)
             '+1.00 / -1.00 x 173'
         """
-        MEAN = -1
-        STD = 1
-
-        def _pdf(x: float, mean: float = MEAN, std: float = STD):
-            """Point density function for weighting random selection of prescriptions.
-
-            This is inplace because more extreme prescriptions like -30 are rare.
-            """
-            y = (x - mean) / std
-            inter = (math.exp(-1 * y**2 / 2)) / math.sqrt(2 * math.pi)
-            return inter / std
-
-        rx_lst = [
-            x / 100 for x in range(int(-1 * rx_range * 100), int(rx_range * 100), 25)
-        ]
-        weights = [_pdf(x) for x in rx_lst]
-        if seed is not None:
-            random.seed(seed)
-        self.sphere = random.choices(rx_lst, weights=weights, k=1)[0]
-        self.cylinder = abs(random.choices(rx_lst, weights=weights, k=1)[0]) * -1
-        self.axis = random.randint(0, 180)
-        self.add = Add(add=(random.choice(range(0, 250, 25)) / 100))
+        powers, cum_weights = random_powers(rx_range)
+        rng = random if seed is None else random.Random(seed)
+        self.sphere = rng.choices(powers, cum_weights=cum_weights, k=1)[0]
+        self.cylinder = (
+            abs(rng.choices(powers, cum_weights=cum_weights, k=1)[0]) * -1
+        )
+        self.axis = rng.randint(0, 180)
+        self.add = Add(add=(rng.choice(range(0, 250, 25)) / 100))
         self.vertical_prism = VerticalPrism(
-            magnitude=random.randint(0, 5), direction=random.choice(["U", "D"])
+            magnitude=rng.randint(0, 5), direction=rng.choice(["U", "D"])
         )
         self.horizontal_prism = HorizontalPrism(
-            magnitude=random.randint(0, 5), direction=random.choice(["I", "O"])
+            magnitude=rng.randint(0, 5), direction=rng.choice(["I", "O"])
         )
 
-    def __str__(self) -> str:
-        """Provide string representation of object."""
+    def freeze(self) -> "FrozenPrescription":
+        """Give the shared, immutable copy of the prescription.
 
-        def _give_plus_sign(value: float) -> str:
-            """Will append '+' if the value is positive and will return value to 2 decimal places."""
-            if value >= 0:
-                return f"+{value:0.2f}"
-            else:
-                return f"{value:0.2f}"
+        Returns:
+            (FrozenPrescription): The interned frozen prescription.
 
+        Examples:
+            Typical use:
+            >>> rxs = [Prescription(rx).freeze() for rx in ["-1.00", "-1.00"]]
+            >>> rxs[0] is rxs[1]
+            True
+        """
+        from .frozen import FrozenPrescription
+
+        return FrozenPrescription(**self.dict())
+
+    def __str__(self) -> str:
+        """Provide string representation of object."""
         str_lst = []
         if self.sphere == 0:
             str_lst.append("plano")
         else:
-            str_lst.append(_give_plus_sign(self.sphere))
+            str_lst.append(give_plus_sign(self.sphere))
 
         if self.sphere != 0 and self.cylinder == 0:
             str_lst.append(" DS")
         elif self.cylinder != 0:
             str_lst.append(" / ")
-            str_lst.append(_give_plus_sign(self.cylinder))
+            str_lst.append(give_plus_sign(self.cylinder))
 
             str_lst.append(" x ")
             str_lst.append(strip_decimal(self.axis))
 
         if self.add.add != 0:
             str_lst.append(" Add: ")
-            str_lst.append(_give_plus_sign(self.add.add))
+            str_lst.append(give_plus_sign(self.add.add))
             str_lst.append(" @ ")
             str_lst.append(strip_decimal(self.add.working_distance_cm))
             str_lst.append("cm")
 
         return "".join(str_lst)
+
+
+instrumentation.register(Prescription, "_simple_parse_rx", "rx.parse")
+instrumentation.register(Prescription, "transpose", "rx.transpose")
+instrumentation.register(Prescription, "__str__", "rx.str")
+instrumentation.register_validators(Prescription, "rx.validate")
@@ -0,0 +1,38 @@
+"""Rules shared by the prescription validators and bulk validation."""
+
+from optom_tools.utils.rules import Rule
+
+AXIS_MIN = 0
+AXIS_MAX = 180
+WORKING_DISTANCE_MIN_CM = 0
+# Optical infinity.
+WORKING_DISTANCE_MAX_CM = 600
+
+AXIS = Rule(
+    message="Axis must be between 0 and 180 degrees",
+    invalid=lambda axis: (axis > AXIS_MAX) | (axis < AXIS_MIN),
+)
+ADD = Rule(
+    message="Add must be a positive number", invalid=lambda add: add < 0
+)
+WORKING_DISTANCE = Rule(
+    message="Working Distance (cm) must be greater than 0 cm and no greater than 600cm",
+    invalid=lambda cm: (cm < WORKING_DISTANCE_MIN_CM)
+    | (cm > WORKING_DISTANCE_MAX_CM),
+)
+PRISM = Rule(
+    message="The prism dioptre must be a positive number",
+    invalid=lambda magnitude: magnitude < 0,
+)
+
+# The rule of each `PrescriptionBatch` column, in the order `Prescription`
+# validates its fields.
+BATCH_RULES = (
+    ("axis", AXIS),
+    ("add", ADD),
+    ("working_distance_cm", WORKING_DISTANCE),
+    ("intermediate_add", ADD),
+    ("intermediate_working_distance_cm", WORKING_DISTANCE),
+    ("vertical_prism", PRISM),
+    ("horizontal_prism", PRISM),
+)
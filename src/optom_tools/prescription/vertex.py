@@ -0,0 +1,35 @@
+"""Vertex distance compensation of lens powers."""
+
+from typing import Any, Optional
+
+from .exceptions import PrescriptionError
+
+
+def vertex_power(power: Any, from_mm: Any, to_mm: Any) -> Any:
+    """Give the power with the same effect at a new vertex distance.
+
+    Works on floats and on NumPy arrays alike.
+
+    Args:
+        power (Any): Power of one meridian in dioptres.
+        from_mm (Any): Current distance from the eye in mm.
+        to_mm (Any): New distance from the eye in mm (e.g. 0 for a contact lens).
+
+    Returns:
+        (Any): The compensated power in dioptres.
+
+    Examples:
+        Spectacles at 12mm to a contact lens:
+        >>> vertex_power(-5, 12, 0)
+        -4.716981132075471
+    """
+    distance_m = (from_mm - to_mm) / 1000
+    return power / (1 - distance_m * power)
+
+
+def check_round_to(round_to: Optional[float]) -> None:
+    """Check a rounding step is positive."""
+    if round_to is not None and round_to <= 0:
+        raise PrescriptionError(
+            value=round_to, message="round_to must be a positive number"
+        )
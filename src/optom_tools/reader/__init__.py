@@ -0,0 +1,17 @@
+"""Reader module."""
+
+from .exceptions import ReaderError
+from .reader import (
+    PrescriptionReader,
+    RowError,
+    VisualAcuityReader,
+    format_for_path,
+)
+
+__all__ = [
+    "PrescriptionReader",
+    "ReaderError",
+    "RowError",
+    "VisualAcuityReader",
+    "format_for_path",
+]
@@ -0,0 +1,416 @@
+"""Streaming readers for CSV and JSONL exports of prescriptions and acuities."""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from operator import attrgetter
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from typing_extensions import Literal
+
+from optom_tools.prescription import (
+    Prescription,
+    PrescriptionBatch,
+    RxComponents,
+    parse_rx,
+)
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.visual_acuity import (
+    VaComponents,
+    VisualAcuity,
+    VisualAcuityBatch,
+    default_unit,
+    parse_va,
+)
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+from .exceptions import ReaderError
+
+Source = Union[str, "os.PathLike[str]", IO[str]]
+Column = Union[str, Mapping[str, str]]
+OnError = Literal["raise", "skip", "collect"]
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+_FORMATS = {
+    ".csv": ("csv", ","),
+    ".tsv": ("csv", "\t"),
+    ".jsonl": ("jsonl", None),
+    ".ndjson": ("jsonl", None),
+}
+
+
+def format_for_path(path: Any) -> Optional[Tuple[str, Optional[str]]]:
+    """Give the file format and delimiter implied by a path's extension.
+
+    Args:
+        path (Any): A file path, or the name of an open file.
+
+    Returns:
+        (Optional[Tuple[str, Optional[str]]]): `fmt` and delimiter, e.g. `("csv", "\\t")` for `.tsv`, or `None` for an unknown extension.
+
+    Examples:
+        Typical use:
+        >>> format_for_path("export.jsonl")
+        ('jsonl', None)
+    """
+    return _FORMATS.get(os.path.splitext(str(path))[1].lower())
+
+
+class RowError(NamedTuple):
+    """A row that could not be read."""
+
+    line: int
+    value: Any
+    message: str
+
+
+class _Reader(ABC):
+    """Shared streaming logic for the readers.
+
+    Subclasses set the parser, components, batch type and model to use.
+    `batches()` yields unvalidated batches of at most `chunk_size` rows and
+    `models()` yields one validated model per row.
+    """
+
+    _parse: Any
+    _components: Any
+    batch_type: Any
+    _errors: Tuple[Type[Exception], ...]
+    _text_fields: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        source: Source,
+        column: Column,
+        fmt: Optional[Literal["csv", "jsonl", "text"]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_error: OnError = "raise",
+        delimiter: Optional[str] = None,
+    ) -> None:
+        """Construct reader."""
+        if on_error not in ["raise", "skip", "collect"]:
+            raise ReaderError(
+                value=on_error,
+                message="on_error only accepts 'raise', 'skip' and 'collect'",
+            )
+        if chunk_size < 1:
+            raise ReaderError(
+                value=chunk_size, message="chunk_size must be at least 1"
+            )
+        self.source = source
+        self.column = column
+        self.chunk_size = chunk_size
+        self.on_error = on_error
+        self.fmt, self.delimiter = self._infer_format(fmt, delimiter)
+        self.errors: List[RowError] = []
+        # Added to line numbers when the source is part of a larger file.
+        self.line_offset = 0
+
+    def _infer_format(
+        self, fmt: Optional[str], delimiter: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """Work out the file format from `fmt` or the file extension."""
+        if fmt is None:
+            name = getattr(self.source, "name", self.source)
+            inferred = format_for_path(name)
+            if inferred is None:
+                raise ReaderError(
+                    value=name,
+                    message="Unable to infer the format, pass fmt='csv' or fmt='jsonl'",
+                )
+            fmt, default_delimiter = inferred
+            return fmt, delimiter or default_delimiter
+        if fmt not in ["csv", "jsonl", "text"]:
+            raise ReaderError(
+                value=fmt,
+                message="fmt only accepts 'csv', 'jsonl' and 'text'",
+            )
+        if fmt == "text":
+            if not isinstance(self.column, str):
+                raise ReaderError(
+                    value=self.column,
+                    message="Text input needs a single column name",
+                )
+            return fmt, None
+        return fmt, delimiter or ","
+
+    @contextmanager
+    def _open(self) -> Iterator[IO[str]]:
+        """Open the source, or use it as is if it is already a file."""
+        if hasattr(self.source, "read"):
+            yield self.source  # type: ignore
+            return
+        with open(self.source, newline="", encoding="utf-8") as file:  # type: ignore
+            yield file
+
+    def records(self) -> Iterator[Tuple[int, Mapping[str, Any]]]:
+        """Stream the raw records with their line numbers.
+
+        Each line of text input is a record holding `column`. Blank lines are
+        skipped.
+
+        Yields:
+            (Tuple[int, Mapping[str, Any]]): Line number and record.
+        """
+        with self._open() as file:
+            if self.fmt == "csv":
+                reader = csv.DictReader(file, delimiter=self.delimiter or ",")
+                for record in reader:
+                    yield reader.line_num + self.line_offset, record
+                return
+            for line_number, line in enumerate(
+                file, start=1 + self.line_offset
+            ):
+                if not line.strip():
+                    continue
+                if self.fmt == "text":
+                    yield line_number, {str(self.column): line.strip()}
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    self._handle(line_number, line, f"Invalid JSON: {exc}")
+                    continue
+                yield line_number, record
+
+    def _parse_record(self, record: Mapping[str, Any]) -> Any:
+        """Parse the mapped column(s) of a record into components."""
+        if isinstance(self.column, str):
+            if self.column not in record:
+                raise KeyError(f"Column '{self.column}' not found")
+            return self._parse(str(record[self.column]))
+        kwargs = {}
+        for field, source_column in self.column.items():
+            if source_column not in record:
+                raise KeyError(f"Column '{source_column}' not found")
+            value = record[source_column]
+            if value is None or value == "":
+                continue
+            kwargs[field] = (
+                value if field in self._text_fields else float(value)
+            )
+        return self._from_fields(kwargs)
+
+    def _from_fields(self, kwargs: Dict[str, Any]) -> Any:
+        """Build components from the values of mapped columns."""
+        return self._components(**kwargs)
+
+    def _handle(self, line: int, value: Any, message: str) -> None:
+        """Apply the error policy to a bad row."""
+        if self.on_error == "raise":
+            raise ReaderError(
+                value=RowError(line, value, message),
+                message=f"Line {line}: {message}",
+            )
+        if self.on_error == "collect":
+            self.errors.append(RowError(line, value, message))
+
+    def _rows(
+        self, build: Callable[[Any], Any], located: bool = False
+    ) -> Iterator[Any]:
+        """Parse each record and apply `build`, handling bad rows.
+
+        With `located`, yields `(line, record, row)` instead of the row.
+        """
+        for line, record in self.records():
+            try:
+                row = build(self._parse_record(record))
+            except self._errors as exc:
+                self._handle(line, record, exc.message)  # type: ignore
+                continue
+            except (KeyError, TypeError, ValueError) as exc:
+                self._handle(line, record, str(exc).strip("'\""))
+                continue
+            yield (line, record, row) if located else row
+
+    def components(self) -> Iterator[Any]:
+        """Stream the parsed components of each good row.
+
+        Yields:
+            Parsed components, one per row.
+        """
+        return self._rows(lambda components: components)
+
+    def batches(self) -> Iterator[Any]:
+        """Stream batches of at most `chunk_size` rows.
+
+        Batches are not validated.
+
+        Yields:
+            A batch per chunk.
+        """
+        return self._chunked(
+            self.components(), self.batch_type.from_components
+        )
+
+    def validated_batches(self) -> Iterator[Any]:
+        """Stream batches of at most `chunk_size` rows validated as models.
+
+        Each chunk is checked with the batch `validate()`, which applies the
+        same rules as the models without building one per row. Rows breaking
+        a rule are handled by the error policy and left out of the batch.
+
+        Yields:
+            A batch per chunk.
+        """
+        return self._chunked(
+            self._rows(lambda components: components, located=True),
+            self._validated,
+        )
+
+    def _validated(self, rows: List[Tuple[int, Any, Any]]) -> Any:
+        """Build a batch from located components, dropping invalid rows."""
+        batch = self.batch_type.from_components(
+            [components for _, _, components in rows]
+        )
+        report = batch.validate()
+        invalid = report.invalid_rows().tolist()
+        if not invalid:
+            return batch
+        for index in invalid:
+            line, record, _ = rows[index]
+            self._handle(line, record, report.errors(index)[0])
+        # Rows of this chunk that failed to parse were collected first.
+        self.errors.sort(key=attrgetter("line"))
+        return batch[report.valid]
+
+    def _chunked(
+        self, rows: Iterator[Any], build: Callable[[List[Any]], Any]
+    ) -> Iterator[Any]:
+        """Group rows into chunks of at most `chunk_size` and build each."""
+        chunk: List[Any] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield build(chunk)
+                chunk = []
+        if chunk:
+            yield build(chunk)
+
+    def models(self) -> Iterator[Any]:
+        """Stream one validated model per row.
+
+        Yields:
+            A model per row.
+        """
+        return self._rows(self._model)
+
+    @abstractmethod
+    def _model(self, components: Any) -> Any:
+        """Build a model from components."""
+
+    def __iter__(self) -> Iterator[Any]:
+        """Stream batches."""
+        return self.batches()
+
+
+class PrescriptionReader(_Reader):
+    """Stream prescriptions from a CSV or JSONL file in fixed-size chunks.
+
+    Memory use depends on `chunk_size`, not on the size of the file.
+
+    Args:
+        source (Source): Path or open text file.
+        column (Column): Column holding the prescription text, or a mapping of `RxComponents` fields (e.g. 'sphere') to columns. Defaults to 'rx'.
+        fmt (Optional[Literal["csv", "jsonl", "text"]]): File format, where 'text' is one value per line. Inferred from the file extension by default.
+        chunk_size (int): Rows per batch.
+        on_error (OnError): 'raise' a `ReaderError`, 'skip' the row, or 'collect' the row into `errors`. Defaults to 'raise'.
+        delimiter (Optional[str]): CSV delimiter. Defaults to ',' (or tab for .tsv).
+
+    Examples:
+        Streaming batches:
+        >>> for batch in PrescriptionReader("export.csv", column="Rx"):
+        ...     batch.transpose("n")
+
+        Streaming models and collecting bad rows:
+        >>> reader = PrescriptionReader("export.jsonl", on_error="collect")
+        >>> rxs = list(reader.models())
+        >>> reader.errors
+        [RowError(line=3, value={'rx': 'oops'}, message='Unable to parse prescription')]
+    """
+
+    _parse = staticmethod(parse_rx)
+    _components = RxComponents
+    batch_type = PrescriptionBatch
+    _errors = (PrescriptionError,)
+    _text_fields = ("vertical_prism_direction", "horizontal_prism_direction")
+
+    def __init__(
+        self,
+        source: Source,
+        column: Column = "rx",
+        fmt: Optional[Literal["csv", "jsonl", "text"]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_error: OnError = "raise",
+        delimiter: Optional[str] = None,
+    ) -> None:
+        """Construct reader."""
+        super().__init__(source, column, fmt, chunk_size, on_error, delimiter)
+
+    def _model(self, components: RxComponents) -> Prescription:
+        """Build a `Prescription` from components."""
+        return Prescription(**components.to_kwargs())
+
+
+class VisualAcuityReader(_Reader):
+    """Stream visual acuities from a CSV or JSONL file in fixed-size chunks.
+
+    Memory use depends on `chunk_size`, not on the size of the file.
+
+    Args:
+        source (Source): Path or open text file.
+        column (Column): Column holding the Snellen fraction, or a mapping of `VaComponents` fields (e.g. 'numerator') to columns. Defaults to 'va'.
+        fmt (Optional[Literal["csv", "jsonl", "text"]]): File format, where 'text' is one value per line. Inferred from the file extension by default.
+        chunk_size (int): Rows per batch.
+        on_error (OnError): 'raise' a `ReaderError`, 'skip' the row, or 'collect' the row into `errors`. Defaults to 'raise'.
+        delimiter (Optional[str]): CSV delimiter. Defaults to ',' (or tab for .tsv).
+
+    Examples:
+        Streaming batches:
+        >>> for batch in VisualAcuityReader("visits.csv", column="VA"):
+        ...     batch.logmar
+    """
+
+    _parse = staticmethod(parse_va)
+    _components = VaComponents
+    batch_type = VisualAcuityBatch
+    _errors = (VisualAcuityError,)
+    _text_fields = ("unit",)
+
+    def __init__(
+        self,
+        source: Source,
+        column: Column = "va",
+        fmt: Optional[Literal["csv", "jsonl", "text"]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_error: OnError = "raise",
+        delimiter: Optional[str] = None,
+    ) -> None:
+        """Construct reader."""
+        super().__init__(source, column, fmt, chunk_size, on_error, delimiter)
+
+    def _from_fields(self, kwargs: Dict[str, Any]) -> VaComponents:
+        """Build components, inferring a missing unit like `parse_va()`."""
+        if "unit" not in kwargs and "numerator" in kwargs:
+            kwargs["unit"] = default_unit(kwargs["numerator"])
+        return VaComponents(**kwargs)
+
+    def _model(self, components: VaComponents) -> VisualAcuity:
+        """Build a `VisualAcuity` from components."""
+        return VisualAcuity(**components._asdict())
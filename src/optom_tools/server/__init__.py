@@ -0,0 +1,13 @@
+"""Server module."""
+
+from .batching import MicroBatcher
+from .exceptions import ServerError
+from .server import OptomServer, ServerStats, serve
+
+__all__ = [
+    "MicroBatcher",
+    "OptomServer",
+    "ServerError",
+    "ServerStats",
+    "serve",
+]
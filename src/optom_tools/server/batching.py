@@ -0,0 +1,108 @@
+"""Grouping of concurrent requests into single vectorized calls."""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .exceptions import ServerError
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 1.0
+
+BatchFunc = Callable[[Sequence[Any]], Sequence[Any]]
+
+
+class MicroBatcher:
+    """Collect items submitted concurrently and process them together.
+
+    The first item of a batch starts a timer of `max_wait_ms`. The batch is
+    processed when the timer fires or once `max_batch_size` items are
+    waiting, whichever is first. `func` is called in the event loop with the
+    items and gives one result per item. A result that is an exception is
+    raised to the caller of `submit()` for that item only.
+
+    Args:
+        func (BatchFunc): Processes a list of items.
+        max_batch_size (int): Most items per call. Defaults to 256.
+        max_wait_ms (float): Longest wait for more items, in milliseconds. Defaults to 1.
+
+    Examples:
+        Typical use:
+        >>> batcher = MicroBatcher(lambda items: [2 * item for item in items])
+        >>> await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        [0, 2, 4]
+        >>> batcher.batches, batcher.items
+        (1, 3)
+    """
+
+    def __init__(
+        self,
+        func: BatchFunc,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        """Construct batcher."""
+        if max_batch_size < 1:
+            raise ServerError(
+                value=max_batch_size,
+                message="max_batch_size must be at least 1",
+            )
+        if max_wait_ms < 0:
+            raise ServerError(
+                value=max_wait_ms, message="max_wait_ms must be zero or more"
+            )
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.items = 0
+        self._pending: List[Tuple[Any, "asyncio.Future[Any]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Add an item to the next batch and wait for its result.
+
+        Args:
+            item (Any): The item.
+
+        Returns:
+            (Any): The result for the item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Process up to `max_batch_size` waiting items."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_wait_ms / 1000, self._flush
+            )
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = self.func([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The caller stopped waiting, e.g. its connection dropped.
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,17 @@
+"""Custom exceptions related to the `server` module."""
+
+from typing import Any
+
+
+class ServerError(Exception):
+    """Server configuration or request error."""
+
+    def __init__(self, value: Any, message: str) -> None:
+        """Construct exception."""
+        self.value = value
+        self.message = message
+        super().__init__(message)
+
+    def __reduce__(self):
+        """Pickle with both arguments so the error survives worker processes."""
+        return (self.__class__, (self.value, self.message))
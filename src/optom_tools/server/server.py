@@ -0,0 +1,555 @@
+"""Local HTTP/JSON service for parsing and converting records."""
+
+import asyncio
+import json
+import os
+import time
+from http import HTTPStatus
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+import numpy as np
+
+from optom_tools.prescription import PrescriptionBatch, parse_rx
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.stats import QuantileSketch
+from optom_tools.utils.instrument import instrumentation
+from optom_tools.utils.rules import Rule, ValidationReport, check_rules
+from optom_tools.visual_acuity import VisualAcuityBatch, parse_va
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+from optom_tools.visual_acuity.rules import DISTANCE
+
+from .batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, MicroBatcher
+from .exceptions import ServerError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_BODY_BYTES = 1024 * 1024
+# Latencies are added to the quantile sketch in groups of this many.
+LATENCY_FLUSH = 1024
+JSON = "application/json"
+# Content type of the Prometheus text exposition format.
+PLAIN_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+_ERRORS = (PrescriptionError, ServerError, VisualAcuityError)
+
+# Converting or taking the logMAR of an acuity needs both distances above
+# zero, stricter than `VisualAcuity`, which allows zero.
+_POSITIVE_DISTANCE = Rule(
+    message=DISTANCE.message, invalid=lambda distance: distance <= 0
+)
+_VA_RULES = (
+    ("numerator", _POSITIVE_DISTANCE),
+    ("denominator", _POSITIVE_DISTANCE),
+)
+
+
+class ServerStats(NamedTuple):
+    """Counters of an `OptomServer` since it started."""
+
+    requests: int
+    errors: int
+    batches: int
+    mean_batch_size: float
+    p50_ms: float
+    p99_ms: float
+    requests_per_second: float
+    uptime_s: float
+
+
+def _field(
+    item: Any, name: str, choices: Sequence[Any] = (), required: bool = True
+) -> Any:
+    """Give a field of a request body, checking it is allowed.
+
+    Optional fields that are missing are `None`.
+    """
+    if required and name not in item:
+        raise ServerError(value=name, message=f"Request must include '{name}'")
+    value = item.get(name)
+    if choices and value not in choices:
+        raise ServerError(
+            value=value,
+            message=f"'{name}' must be one of {', '.join(map(str, choices))}",
+        )
+    return value
+
+
+def _parse_all(
+    items: Sequence[Any], name: str, parse: Callable[[str], Any]
+) -> Tuple[List[Any], List[int], List[Any]]:
+    """Parse the text field of each item, keeping errors per item.
+
+    Returns:
+        (Tuple[List[Any], List[int], List[Any]]): Results with errors filled in, indices of the parsed items and their components.
+    """
+    results: List[Any] = [None] * len(items)
+    parsed: List[int] = []
+    components: List[Any] = []
+    for index, item in enumerate(items):
+        try:
+            text = _field(item, name)
+            if not isinstance(text, str):
+                raise ServerError(
+                    value=text, message=f"'{name}' must be a string"
+                )
+            components.append(parse(text))
+            parsed.append(index)
+        except _ERRORS as exc:
+            results[index] = exc
+    return results, parsed, components
+
+
+def _valid(
+    report: ValidationReport,
+    items: Sequence[Any],
+    parsed: List[int],
+    results: List[Any],
+    name: str,
+    error: Callable[..., Exception],
+) -> Tuple[np.ndarray, List[int]]:
+    """Fill in an error for each parsed item breaking a rule.
+
+    Returns:
+        (Tuple[np.ndarray, List[int]]): Mask of the valid batch rows and the indices of their items.
+    """
+    valid = report.valid
+    for row in report.invalid_rows().tolist():
+        index = parsed[row]
+        results[index] = error(
+            value=items[index][name], message=report.errors(row)[0]
+        )
+    return valid, [index for index, ok in zip(parsed, valid.tolist()) if ok]
+
+
+def _rx_batch(
+    items: Sequence[Any],
+) -> Tuple[List[Any], List[int], PrescriptionBatch]:
+    """Parse and validate the `rx` of each item.
+
+    Returns:
+        (Tuple[List[Any], List[int], PrescriptionBatch]): Results with errors filled in, indices of the valid items and their batch.
+    """
+    results, parsed, components = _parse_all(items, "rx", parse_rx)
+    batch = PrescriptionBatch.from_components(components)
+    valid, parsed = _valid(
+        batch.validate(), items, parsed, results, "rx", PrescriptionError
+    )
+    return results, parsed, cast(PrescriptionBatch, batch[valid])
+
+
+def _va_batch(
+    items: Sequence[Any],
+) -> Tuple[List[Any], List[int], VisualAcuityBatch]:
+    """Parse the `va` of each item, keeping acuities with both distances.
+
+    Returns:
+        (Tuple[List[Any], List[int], VisualAcuityBatch]): Results with errors filled in, indices of the valid items and their batch.
+    """
+    results, parsed, components = _parse_all(items, "va", parse_va)
+    batch = VisualAcuityBatch.from_components(components)
+    valid, parsed = _valid(
+        check_rules(batch, _VA_RULES),
+        items,
+        parsed,
+        results,
+        "va",
+        VisualAcuityError,
+    )
+    return results, parsed, cast(VisualAcuityBatch, batch[valid])
+
+
+def _grouped(
+    items: Sequence[Any],
+    parsed: List[int],
+    results: List[Any],
+    name: str,
+    choices: Sequence[Any],
+    required: bool = True,
+) -> Dict[Any, np.ndarray]:
+    """Group parsed items by an option, giving the batch rows of each."""
+    keep: List[int] = []
+    options: List[Any] = []
+    for row, index in enumerate(parsed):
+        try:
+            options.append(_field(items[index], name, choices, required))
+            keep.append(row)
+        except ServerError as exc:
+            results[index] = exc
+    rows = np.array(keep, dtype=np.int64)
+    values = np.array(options, dtype=object)
+    return {
+        option: rows[values == option]
+        for option in choices
+        if (values == option).any()
+    }
+
+
+def rx_parse(items: Sequence[Any]) -> List[Any]:
+    """Parse `{"rx": text}` items into their components."""
+    results, parsed, batch = _rx_batch(items)
+    columns = {name: getattr(batch, name).tolist() for name in batch.columns}
+    columns["rx"] = batch.to_strings().tolist()
+    names = list(columns)
+    for index, row in zip(parsed, zip(*columns.values())):
+        results[index] = dict(zip(names, row))
+    return results
+
+
+def rx_transpose(items: Sequence[Any]) -> List[Any]:
+    """Transpose `{"rx": text, "flag": None | "n" | "p"}` items."""
+    results, parsed, batch = _rx_batch(items)
+    for flag, rows in _grouped(
+        items, parsed, results, "flag", (None, "n", "p"), required=False
+    ).items():
+        group = cast(PrescriptionBatch, batch[rows])
+        group.transpose(flag)
+        for row, text in zip(rows.tolist(), group.to_strings().tolist()):
+            results[parsed[row]] = {"rx": text}
+    return results
+
+
+def va_convert(items: Sequence[Any]) -> List[Any]:
+    """Convert `{"va": text, "unit": "ft" | "m"}` items."""
+    results, parsed, batch = _va_batch(items)
+    for unit, rows in _grouped(
+        items, parsed, results, "unit", ("ft", "m")
+    ).items():
+        group = cast(VisualAcuityBatch, batch[rows])
+        group.convert_unit(unit)
+        for row, text in zip(rows.tolist(), group.to_strings().tolist()):
+            results[parsed[row]] = {"va": text}
+    return results
+
+
+def va_logmar(items: Sequence[Any]) -> List[Any]:
+    """Give the logMAR of `{"va": text}` items."""
+    results, parsed, batch = _va_batch(items)
+    for index, logmar in zip(parsed, batch._float_logmar().tolist()):
+        results[index] = {"logmar": logmar}
+    return results
+
+
+ENDPOINTS: Dict[str, Callable[[Sequence[Any]], List[Any]]] = {
+    "/rx/parse": rx_parse,
+    "/rx/transpose": rx_transpose,
+    "/va/convert": va_convert,
+    "/va/logmar": va_logmar,
+}
+
+
+class OptomServer:
+    """Asynchronous HTTP/JSON server micro-batching concurrent requests.
+
+    Each endpoint takes a JSON object by `POST` and answers with a JSON
+    object. Requests to the same endpoint that arrive together are handled
+    by one vectorized batch call. `GET /stats` gives the `ServerStats` and
+    `GET /metrics` gives the counters of `instrumentation` in the Prometheus
+    text format.
+
+    Endpoints:
+
+    - `/rx/parse`: `{"rx": "+1.00/-1.00x90"}` to the batch columns and `rx`.
+    - `/rx/transpose`: `{"rx": ..., "flag": null | "n" | "p"}` to `{"rx": ...}`.
+    - `/va/convert`: `{"va": "6/6", "unit": "ft"}` to `{"va": "20/20"}`.
+    - `/va/logmar`: `{"va": "6/60"}` to `{"logmar": -1.0}`.
+
+    Bad requests get a 4xx status and `{"error": message}`.
+
+    Args:
+        host (str): Address to listen on. Defaults to '127.0.0.1'.
+        port (int): Port to listen on, `0` for any free port. Defaults to 8000.
+        path (Optional[str]): Listen on this Unix socket instead of `host` and `port`.
+        max_batch_size (int): Most requests per batch call. Defaults to 256.
+        max_wait_ms (float): Longest wait for a batch to fill, in milliseconds. Defaults to 1.
+
+    Examples:
+        Typical use:
+        >>> async with OptomServer(port=0) as server:
+        ...     host, port = server.address
+        ...     await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        path: Optional[str] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        """Construct server."""
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batchers = {
+            route: MicroBatcher(func, max_batch_size, max_wait_ms)
+            for route, func in ENDPOINTS.items()
+        }
+        self.requests = 0
+        self.errors = 0
+        self._latencies: List[float] = []
+        self._sketch = QuantileSketch()
+        self._started = time.perf_counter()
+        self._server: Optional[asyncio.Server] = None
+        self._connections: Set["asyncio.Task[Any]"] = set()
+
+    @property
+    def address(self) -> Any:
+        """Give the `(host, port)` or Unix socket path being listened on."""
+        if self._server is None:
+            raise ServerError(value=None, message="Server is not started")
+        return self._server.sockets[0].getsockname()
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.path
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port
+            )
+        self._started = time.perf_counter()
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()  # type: ignore
+
+    async def close(self) -> None:
+        """Stop listening, drop open connections and wait for them to end."""
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def __aenter__(self) -> "OptomServer":
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the server."""
+        await self.close()
+
+    def stats(self) -> ServerStats:
+        """Give the request counters and latency quantiles.
+
+        Returns:
+            (ServerStats): The counters since the server started.
+        """
+        self._flush_latencies()
+        batches = sum(b.batches for b in self.batchers.values())
+        items = sum(b.items for b in self.batchers.values())
+        uptime = time.perf_counter() - self._started
+        return ServerStats(
+            requests=self.requests,
+            errors=self.errors,
+            batches=batches,
+            mean_batch_size=items / batches if batches else 0.0,
+            p50_ms=self._sketch.quantile(0.5) * 1000,
+            p99_ms=self._sketch.quantile(0.99) * 1000,
+            requests_per_second=self.requests / uptime if uptime else 0.0,
+            uptime_s=uptime,
+        )
+
+    def _flush_latencies(self) -> None:
+        """Add buffered latencies to the quantile sketch."""
+        if self._latencies:
+            self._sketch.update(np.array(self._latencies))
+            self._latencies.clear()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one connection, keeping it alive."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode(
+                        "latin-1"
+                    ).split()
+                except ValueError:
+                    self._respond(
+                        writer, HTTPStatus.BAD_REQUEST, "Bad request line"
+                    )
+                    break
+                headers = await self._headers(reader)
+                length = self._content_length(headers)
+                if length is None:
+                    self._respond(
+                        writer,
+                        HTTPStatus.BAD_REQUEST,
+                        "Content-Length must be a whole number",
+                    )
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._respond(
+                        writer,
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        "Request body too large",
+                    )
+                    break
+                body = await reader.readexactly(length)
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                self._record(status, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # The server is closing.
+            pass
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        """Read the request headers, with lower case names."""
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    @staticmethod
+    def _content_length(headers: Dict[str, str]) -> Optional[int]:
+        """Give the body length, `None` unless it is a whole number."""
+        text = headers.get("content-length") or "0"
+        if not (text.isascii() and text.isdigit()):
+            return None
+        return int(text)
+
+    async def _dispatch(
+        self, method: str, target: str, body: bytes
+    ) -> Tuple[HTTPStatus, Any]:
+        """Route a request, giving the status and JSON payload."""
+        path = target.split("?", 1)[0]
+        if path in ("/stats", "/metrics"):
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, "Use GET"
+            return HTTPStatus.OK, self._report(path)
+        batcher = self.batchers.get(path)
+        if batcher is None:
+            return HTTPStatus.NOT_FOUND, f"Unknown endpoint {path}"
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, "Use POST"
+        try:
+            item = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, "Request body must be JSON"
+        if not isinstance(item, dict):
+            return HTTPStatus.BAD_REQUEST, "Request body must be an object"
+        try:
+            return HTTPStatus.OK, await batcher.submit(item)
+        except _ERRORS as exc:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, exc.message
+        except Exception:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"
+
+    def _report(self, path: str) -> Any:
+        """Give the payload of `GET /stats` or `GET /metrics`."""
+        if path == "/metrics":
+            return instrumentation.to_prometheus().encode()
+        return {
+            # NaN is not valid JSON, e.g. quantiles before any request.
+            name: None if value != value else value
+            for name, value in self.stats()._asdict().items()
+        }
+
+    @staticmethod
+    def _respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Any,
+        keep_alive: bool = False,
+    ) -> None:
+        """Write a JSON response, with `{"error": payload}` on failure.
+
+        A payload of bytes is sent as it is, as plain text.
+        """
+        if status != HTTPStatus.OK:
+            payload = {"error": payload}
+        if isinstance(payload, bytes):
+            body, content_type = payload, PLAIN_TEXT
+        else:
+            body, content_type = json.dumps(payload).encode(), JSON
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n".encode("latin-1") + body
+        )
+
+    def _record(self, status: HTTPStatus, seconds: float) -> None:
+        """Count a request and buffer its latency."""
+        self.requests += 1
+        if status != HTTPStatus.OK:
+            self.errors += 1
+        self._latencies.append(seconds)
+        if len(self._latencies) >= LATENCY_FLUSH:
+            self._flush_latencies()
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: Optional[str] = None,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+) -> None:
+    """Run an `OptomServer` until interrupted.
+
+    Args:
+        host (str): Address to listen on. Defaults to '127.0.0.1'.
+        port (int): Port to listen on. Defaults to 8000.
+        path (Optional[str]): Listen on this Unix socket instead of `host` and `port`.
+        max_batch_size (int): Most requests per batch call. Defaults to 256.
+        max_wait_ms (float): Longest wait for a batch to fill, in milliseconds. Defaults to 1.
+    """
+    server = OptomServer(host, port, path, max_batch_size, max_wait_ms)
+
+    async def run() -> None:
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,19 @@
+"""Stats module."""
+
+from .accumulators import Histogram, QuantileSketch, RunningStats
+from .exceptions import StatsError
+from .stats import (
+    PrescriptionStats,
+    SummaryStats,
+    VisualAcuityStats,
+)
+
+__all__ = [
+    "Histogram",
+    "PrescriptionStats",
+    "QuantileSketch",
+    "RunningStats",
+    "StatsError",
+    "SummaryStats",
+    "VisualAcuityStats",
+]
@@ -0,0 +1,323 @@
+"""One-pass accumulators whose states can be merged across shards."""
+
+import math
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+from .exceptions import StatsError
+
+ArrayLike = Union[np.ndarray, Iterable[float], float]
+
+# Values closer to zero than this are counted as zero by `QuantileSketch`.
+MIN_SKETCH_VALUE = 1e-9
+
+
+def _array(values: ArrayLike) -> np.ndarray:
+    """Flatten values to a float array, dropping NaNs and infinities."""
+    array = np.asarray(values, dtype=np.float64).ravel()
+    return array[np.isfinite(array)]
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum in one pass.
+
+    Values are taken a chunk at a time, and each chunk is folded in with the
+    parallel form of Welford's algorithm (Chan et al.). Merging two states
+    gives the same result as one pass over all of the values, up to floating
+    point rounding.
+
+    Examples:
+        Typical use:
+        >>> stats = RunningStats()
+        >>> stats.update([1, 2, 3])
+        >>> other = RunningStats()
+        >>> other.update(4)
+        >>> stats.merge(other)
+        >>> stats.mean, stats.variance
+        (2.5, 1.6666666666666667)
+    """
+
+    def __init__(self) -> None:
+        """Construct empty state."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: ArrayLike) -> None:
+        """Add values.
+
+        Args:
+            values (ArrayLike): A value or array of values. NaNs and infinities are ignored.
+        """
+        array = _array(values)
+        if not len(array):
+            return
+        mean = array.mean()
+        self._combine(
+            len(array),
+            mean.item(),
+            np.square(array - mean).sum().item(),
+            array.min().item(),
+            array.max().item(),
+        )
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold another state into this one.
+
+        Args:
+            other (RunningStats): State from another shard.
+        """
+        if other.count:
+            self._combine(
+                other.count, other.mean, other.m2, other.min, other.max
+            )
+
+    def _combine(
+        self, count: int, mean: float, m2: float, low: float, high: float
+    ) -> None:
+        """Combine with the summary of another set of values."""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, or NaN with fewer than two values."""
+        if self.count < 2:
+            return math.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, or NaN with fewer than two values."""
+        return math.sqrt(self.variance)
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(count={self.count}, "
+            f"mean={self.mean}, std={self.std})"
+        )
+
+
+class Histogram:
+    """Counts of values in fixed-width bins.
+
+    Bins are half open, `[start, start + width)`, and values outside
+    `[start, stop)` are counted in `underflow` and `overflow`. Histograms with
+    the same bins merge exactly.
+
+    Args:
+        start (float): Lower edge of the first bin.
+        stop (float): Upper edge of the last bin.
+        width (float): Width of each bin.
+
+    Examples:
+        Spherical equivalents in quarter dioptre bins:
+        >>> histogram = Histogram(-20, 20, 0.25)
+        >>> histogram.update([-1.0, -1.0, 0.5])
+        >>> histogram.counts[histogram.index(-1.0)]
+        2
+    """
+
+    def __init__(self, start: float, stop: float, width: float) -> None:
+        """Construct empty histogram."""
+        if width <= 0 or stop <= start:
+            raise StatsError(
+                value=(start, stop, width),
+                message="Histogram needs start < stop and a positive width",
+            )
+        self.start = start
+        self.stop = stop
+        self.width = width
+        self.bins = int(math.ceil((stop - start) / width))
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Edges of the bins, one more than the number of bins."""
+        return self.start + self.width * np.arange(self.bins + 1)
+
+    @property
+    def count(self) -> int:
+        """Total number of values, including those out of range."""
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def index(self, value: float) -> int:
+        """Give the bin holding `value`."""
+        return int(math.floor((value - self.start) / self.width))
+
+    def update(self, values: ArrayLike) -> None:
+        """Add values.
+
+        Args:
+            values (ArrayLike): A value or array of values. NaNs and infinities are ignored.
+        """
+        array = _array(values)
+        index = np.floor((array - self.start) / self.width).astype(np.int64)
+        below = index < 0
+        inside = ~below & (index < self.bins) & (array < self.stop)
+        self.counts += np.bincount(index[inside], minlength=self.bins)
+        self.underflow += int(below.sum())
+        self.overflow += int((~below & ~inside).sum())
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the counts of a histogram with the same bins.
+
+        Args:
+            other (Histogram): Histogram from another shard.
+
+        Raises:
+            StatsError: The bins differ.
+        """
+        bins = (self.start, self.stop, self.width)
+        if bins != (other.start, other.stop, other.width):
+            raise StatsError(
+                value=(other.start, other.stop, other.width),
+                message="Only histograms with the same bins can be merged",
+            )
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(start={self.start}, "
+            f"stop={self.stop}, width={self.width}, count={self.count})"
+        )
+
+
+class QuantileSketch:
+    """Quantiles of a stream with a bounded relative error (DDSketch).
+
+    Values are counted in logarithmic buckets, so every quantile is within
+    `relative_accuracy` of a true value. The counts are exact, so merged
+    sketches are identical to a sketch of all the values in one pass.
+
+    Args:
+        relative_accuracy (float): Relative error of quantiles. Defaults to 0.01.
+
+    Examples:
+        Typical use:
+        >>> sketch = QuantileSketch()
+        >>> sketch.update(np.arange(1, 101))
+        >>> round(sketch.quantile(0.5))
+        50
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        """Construct empty sketch."""
+        if not 0 < relative_accuracy < 1:
+            raise StatsError(
+                value=relative_accuracy,
+                message="relative_accuracy must be between 0 and 1",
+            )
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Total number of values."""
+        return (
+            sum(self.positive.values())
+            + sum(self.negative.values())
+            + self.zero_count
+        )
+
+    def _add(self, buckets: Dict[int, int], magnitudes: np.ndarray) -> None:
+        """Count magnitudes into their buckets."""
+        if not len(magnitudes):
+            return
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        unique, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def update(self, values: ArrayLike) -> None:
+        """Add values.
+
+        Args:
+            values (ArrayLike): A value or array of values. NaNs and infinities are ignored.
+        """
+        array = _array(values)
+        self._add(self.positive, array[array >= MIN_SKETCH_VALUE])
+        self._add(self.negative, -array[array <= -MIN_SKETCH_VALUE])
+        self.zero_count += int((np.abs(array) < MIN_SKETCH_VALUE).sum())
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the counts of a sketch with the same accuracy.
+
+        Args:
+            other (QuantileSketch): Sketch from another shard.
+
+        Raises:
+            StatsError: The accuracies differ.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise StatsError(
+                value=other.relative_accuracy,
+                message="Only sketches with the same accuracy can be merged",
+            )
+        for buckets, other_buckets in [
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ]:
+            for key, count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+
+    def _value(self, key: int) -> float:
+        """Give the representative value of a bucket."""
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            (float): The estimate, or NaN when the sketch is empty.
+        """
+        if not 0 <= q <= 1:
+            raise StatsError(
+                value=q, message="Quantile must be between 0 and 1"
+            )
+        count = self.count
+        if not count:
+            return math.nan
+        rank = q * (count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}("
+            f"relative_accuracy={self.relative_accuracy}, count={self.count})"
+        )
@@ -0,0 +1,341 @@
+"""Streaming summaries of prescriptions and visual acuities."""
+
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from optom_tools.prescription import Prescription, PrescriptionBatch
+from optom_tools.visual_acuity import VisualAcuity, VisualAcuityBatch
+
+from .accumulators import ArrayLike, Histogram, QuantileSketch, RunningStats
+from .exceptions import StatsError
+
+PrescriptionData = Union[
+    Prescription,
+    PrescriptionBatch,
+    Iterable[Union[Prescription, PrescriptionBatch]],
+]
+VisualAcuityData = Union[
+    VisualAcuity,
+    VisualAcuityBatch,
+    Iterable[Union[VisualAcuity, VisualAcuityBatch]],
+]
+
+# Models in a stream are converted to arrays this many at a time.
+CHUNK_SIZE = 10_000
+
+
+def _chunks(
+    data: Any,
+    model: type,
+    batch_type: type,
+    from_batch: Callable[[Any], np.ndarray],
+    from_model: Callable[[Any], float],
+) -> Iterator[np.ndarray]:
+    """Give the values of a model, a batch or a stream of either as arrays."""
+    if isinstance(data, batch_type):
+        yield from_batch(data)
+        return
+    if isinstance(data, model):
+        yield np.array([from_model(data)])
+        return
+    chunk: List[float] = []
+    for item in data:
+        if isinstance(item, batch_type):
+            yield from_batch(item)
+        else:
+            chunk.append(from_model(item))
+            if len(chunk) == CHUNK_SIZE:
+                yield np.array(chunk)
+                chunk = []
+    if chunk:
+        yield np.array(chunk)
+
+
+def _next_values(chunks: Iterator[np.ndarray]) -> Optional[np.ndarray]:
+    """Give the next chunk that is not empty, `None` at the end."""
+    for values in chunks:
+        if len(values):
+            return values
+    return None
+
+
+def _paired(
+    right: Iterator[np.ndarray], left: Iterator[np.ndarray]
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Give chunks of two streams cut to the same length, pair by pair.
+
+    Raises:
+        StatsError: One stream ends before the other.
+    """
+    right_values = _next_values(right)
+    left_values = _next_values(left)
+    pairs = 0
+    while right_values is not None and left_values is not None:
+        size = min(len(right_values), len(left_values))
+        yield right_values[:size], left_values[:size]
+        pairs += size
+        right_values = right_values[size:]
+        left_values = left_values[size:]
+        if not len(right_values):
+            right_values = _next_values(right)
+        if not len(left_values):
+            left_values = _next_values(left)
+    if right_values is not None or left_values is not None:
+        raise StatsError(
+            value=pairs, message="Right and left eyes must be paired"
+        )
+
+
+class SummaryStats:
+    """Running moments, a histogram and a quantile sketch of one quantity.
+
+    Args:
+        bins (Tuple[float, float, float]): Histogram start, stop and width.
+        relative_accuracy (float): Relative error of quantiles. Defaults to 0.01.
+    """
+
+    def __init__(
+        self,
+        bins: Tuple[float, float, float],
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        """Construct empty summary."""
+        self.moments = RunningStats()
+        self.histogram = Histogram(*bins)
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, values: ArrayLike) -> None:
+        """Add values.
+
+        Args:
+            values (ArrayLike): A value or array of values. NaNs are ignored.
+        """
+        self.moments.update(values)
+        self.histogram.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other: "SummaryStats") -> None:
+        """Fold in the summary of another shard.
+
+        Args:
+            other (SummaryStats): Summary with the same bins and accuracy.
+        """
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def count(self) -> int:
+        """Number of values."""
+        return self.moments.count
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values."""
+        return self.moments.mean
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the values."""
+        return self.moments.std
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile, see `QuantileSketch.quantile()`."""
+        return self.sketch.quantile(q)
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(count={self.count}, "
+            f"mean={self.mean}, std={self.std})"
+        )
+
+
+class PrescriptionStats:
+    """One-pass summary of spherical equivalents and anisometropia.
+
+    Feed it prescriptions, batches or a stream of either (e.g. a
+    `PrescriptionReader`). Summaries of separate shards, even from other
+    processes, can be merged into one.
+
+    Args:
+        anisometropia_d (float): Smallest difference in spherical equivalent between the eyes counted as anisometropia. Defaults to 1.
+        bins (Tuple[float, float, float]): Histogram start, stop and width of spherical equivalents. Defaults to -20D to +20D in 0.25D steps.
+        relative_accuracy (float): Relative error of quantiles. Defaults to 0.01.
+
+    Examples:
+        Summarising a file on every core:
+        >>> def summarise(batch):
+        ...     stats = PrescriptionStats()
+        ...     stats.update(batch)
+        ...     return stats
+        >>> total = PrescriptionStats()
+        >>> for chunk in map_records("export.csv", summarise):
+        ...     total.merge(chunk.result)
+        >>> total.spherical_equivalent.mean
+        -1.12
+
+        Anisometropia from pairs of eyes:
+        >>> stats = PrescriptionStats()
+        >>> stats.update_pairs(right_batch, left_batch)
+        >>> stats.anisometropia_prevalence
+        0.04
+    """
+
+    def __init__(
+        self,
+        anisometropia_d: float = 1.0,
+        bins: Tuple[float, float, float] = (-20.0, 20.0, 0.25),
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        """Construct empty summary."""
+        self.anisometropia_d = anisometropia_d
+        self.spherical_equivalent = SummaryStats(bins, relative_accuracy)
+        self.pairs = 0
+        self.anisometropic = 0
+
+    @staticmethod
+    def _chunks(data: PrescriptionData) -> Iterator[np.ndarray]:
+        """Give spherical equivalents as arrays."""
+        return _chunks(
+            data,
+            Prescription,
+            PrescriptionBatch,
+            lambda batch: batch.mean_sphere,
+            lambda rx: rx.mean_sphere,
+        )
+
+    def update(self, data: PrescriptionData) -> None:
+        """Add prescriptions.
+
+        Args:
+            data (PrescriptionData): A prescription, a batch or a stream of either.
+        """
+        for values in self._chunks(data):
+            self.spherical_equivalent.update(values)
+
+    def update_pairs(
+        self, right: PrescriptionData, left: PrescriptionData
+    ) -> None:
+        """Add the right and left eyes of the same patients.
+
+        Both eyes are added to the spherical equivalent summary, and each
+        pair is checked for anisometropia. Pairs where either eye is NaN or
+        infinite are not counted. The two streams are read side by side a
+        chunk at a time, so memory does not grow with their length.
+
+        Args:
+            right (PrescriptionData): Right eyes.
+            left (PrescriptionData): Left eyes, in the same order.
+
+        Raises:
+            StatsError: There are more right eyes than left, or vice versa. The pairs before the unpaired eye are kept.
+        """
+        for right_values, left_values in _paired(
+            self._chunks(right), self._chunks(left)
+        ):
+            self.spherical_equivalent.update(right_values)
+            self.spherical_equivalent.update(left_values)
+            # NaNs and infinities are ignored, like in the summaries.
+            finite = np.isfinite(right_values) & np.isfinite(left_values)
+            difference = np.abs(right_values[finite] - left_values[finite])
+            self.pairs += len(difference)
+            self.anisometropic += int(
+                (difference >= self.anisometropia_d).sum()
+            )
+
+    @property
+    def anisometropia_prevalence(self) -> float:
+        """Share of pairs with anisometropia, or NaN without pairs."""
+        if not self.pairs:
+            return float("nan")
+        return self.anisometropic / self.pairs
+
+    def merge(self, other: "PrescriptionStats") -> None:
+        """Fold in the summary of another shard.
+
+        Args:
+            other (PrescriptionStats): Summary with the same settings.
+
+        Raises:
+            StatsError: The anisometropia thresholds differ.
+        """
+        if other.anisometropia_d != self.anisometropia_d:
+            raise StatsError(
+                value=other.anisometropia_d,
+                message="Only summaries with the same anisometropia threshold can be merged",
+            )
+        self.spherical_equivalent.merge(other.spherical_equivalent)
+        self.pairs += other.pairs
+        self.anisometropic += other.anisometropic
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}("
+            f"count={self.spherical_equivalent.count}, pairs={self.pairs})"
+        )
+
+
+class VisualAcuityStats:
+    """One-pass summary of logMAR values.
+
+    Feed it visual acuities, batches or a stream of either (e.g. a
+    `VisualAcuityReader`). Summaries of separate shards can be merged.
+
+    Args:
+        bins (Tuple[float, float, float]): Histogram start, stop and width of logMAR values. Defaults to -2 to 2 in steps of 0.02.
+        relative_accuracy (float): Relative error of quantiles. Defaults to 0.01.
+
+    Examples:
+        Typical use:
+        >>> stats = VisualAcuityStats()
+        >>> stats.update(VisualAcuityReader("visits.csv"))
+        >>> stats.logmar.quantile(0.5)
+        -0.176
+    """
+
+    def __init__(
+        self,
+        bins: Tuple[float, float, float] = (-2.0, 2.0, 0.02),
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        """Construct empty summary."""
+        self.logmar = SummaryStats(bins, relative_accuracy)
+
+    def update(self, data: VisualAcuityData) -> None:
+        """Add visual acuities.
+
+        Args:
+            data (VisualAcuityData): A visual acuity, a batch or a stream of either.
+        """
+        for values in _chunks(
+            data,
+            VisualAcuity,
+            VisualAcuityBatch,
+            lambda batch: batch.logmar,
+            lambda va: float(va.logmar),
+        ):
+            self.logmar.update(values)
+
+    def merge(self, other: "VisualAcuityStats") -> None:
+        """Fold in the summary of another shard.
+
+        Args:
+            other (VisualAcuityStats): Summary with the same settings.
+        """
+        self.logmar.merge(other.logmar)
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return f"{self.__class__.__name__}(count={self.logmar.count})"
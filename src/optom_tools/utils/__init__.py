@@ -1,6 +1,70 @@
 """Export utils function."""
 
-from .clean_output import strip_decimal
-from .logger import log
+from typing import TYPE_CHECKING
 
-__all__ = ["log", "strip_decimal"]
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .arrays import map_unique, pack_columns, unpack_columns
+    from .cache import CacheInfo, ParseCache
+    from .clean_output import give_plus_sign, strip_decimal
+    from .columnar import ColumnarMixin, load_columns, save_columns
+    from .instrument import Instrumentation, Metric, instrumentation
+    from .intern import FrozenModel, InternPool, PoolInfo
+    from .logger import log, setup_logging
+    from .rules import Rule, ValidationReport, check_rules
+    from .validation import no_assignment_validation
+
+__all__ = [
+    "CacheInfo",
+    "ColumnarMixin",
+    "FrozenModel",
+    "Instrumentation",
+    "InternPool",
+    "Metric",
+    "ParseCache",
+    "PoolInfo",
+    "Rule",
+    "ValidationReport",
+    "check_rules",
+    "give_plus_sign",
+    "instrumentation",
+    "lazy_exports",
+    "load_columns",
+    "log",
+    "map_unique",
+    "no_assignment_validation",
+    "pack_columns",
+    "save_columns",
+    "setup_logging",
+    "strip_decimal",
+    "unpack_columns",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CacheInfo": ".cache",
+        "ColumnarMixin": ".columnar",
+        "FrozenModel": ".intern",
+        "Instrumentation": ".instrument",
+        "InternPool": ".intern",
+        "Metric": ".instrument",
+        "ParseCache": ".cache",
+        "PoolInfo": ".intern",
+        "Rule": ".rules",
+        "ValidationReport": ".rules",
+        "check_rules": ".rules",
+        "give_plus_sign": ".clean_output",
+        "instrumentation": ".instrument",
+        "load_columns": ".columnar",
+        "log": ".logger",
+        "map_unique": ".arrays",
+        "no_assignment_validation": ".validation",
+        "pack_columns": ".arrays",
+        "save_columns": ".columnar",
+        "setup_logging": ".logger",
+        "strip_decimal": ".clean_output",
+        "unpack_columns": ".arrays",
+    },
+)
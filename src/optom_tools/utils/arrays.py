@@ -0,0 +1,66 @@
+"""Helpers for applying scalar functions to NumPy arrays."""
+
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+
+def map_unique(
+    values: np.ndarray, func: Callable[[Any], Any], dtype: Any = None
+) -> np.ndarray:
+    """Apply a scalar function to each distinct value of an array.
+
+    Clinical data only contains a handful of distinct values (quarter dioptre
+    steps, standard chart lines), so each distinct value is computed once with
+    the same scalar code as the models and broadcast back.
+
+    Args:
+        values (np.ndarray): The input array.
+        func (Callable[[Any], Any]): Scalar function to apply.
+        dtype (Any): dtype of the returned array. Defaults to `None` (inferred).
+
+    Returns:
+        (np.ndarray): Array with the same shape as `values`.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    mapped = np.array([func(value) for value in unique.tolist()], dtype=dtype)
+    return mapped[inverse.reshape(values.shape)]
+
+
+def pack_columns(columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Pack equal-length columns for compact pickling.
+
+    Columns holding a single repeated value (such as an unused add or prism)
+    are sent as that value alone.
+
+    Args:
+        columns (Dict[str, np.ndarray]): The columns by name.
+
+    Returns:
+        (Dict[str, Any]): State for `unpack_columns()`.
+    """
+    packed: Dict[str, Any] = {}
+    length = 0
+    for name, column in columns.items():
+        length = len(column)
+        if length and (column == column[0]).all():
+            packed[name] = column[:1].copy()
+        else:
+            packed[name] = column
+    return {"length": length, "columns": packed}
+
+
+def unpack_columns(state: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Unpack columns packed by `pack_columns()`.
+
+    Args:
+        state (Dict[str, Any]): Output of `pack_columns()`.
+
+    Returns:
+        (Dict[str, np.ndarray]): The columns by name.
+    """
+    length = state["length"]
+    return {
+        name: np.repeat(column, length) if len(column) != length else column
+        for name, column in state["columns"].items()
+    }
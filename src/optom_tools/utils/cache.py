@@ -0,0 +1,99 @@
+"""Opt-in LRU cache for parsing repetitive text."""
+
+import functools
+import threading
+from typing import Callable, Generic, NamedTuple, Optional, TypeVar
+
+Parsed = TypeVar("Parsed")
+
+DEFAULT_MAXSIZE = 4096
+
+
+class CacheInfo(NamedTuple):
+    """Hit and miss statistics of a `ParseCache`."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class ParseCache(Generic[Parsed]):
+    """Bounded least recently used cache in front of a parser.
+
+    The cache is off until `enable()` is called. Keys are the input text with
+    surrounding whitespace removed, so '6/6' and ' 6/6 ' share an entry.
+    Only successful parses are cached.
+    The parsed values must be immutable (e.g. the parser's NamedTuples), as
+    every hit returns the same object.
+
+    Lookups are thread safe, and so are `enable()`, `disable()` and
+    `clear()`.
+
+    Args:
+        parse (Callable[[str], Parsed]): The uncached parser.
+
+    Examples:
+        Typical use:
+        >>> from optom_tools.prescription import parse_cache
+        >>> parse_cache.enable(maxsize=1024)
+        >>> rxs = [Prescription(rx) for rx in feed]
+        >>> parse_cache.info()
+        CacheInfo(hits=9875, misses=125, maxsize=1024, currsize=125)
+    """
+
+    def __init__(self, parse: Callable[[str], Parsed]) -> None:
+        """Construct cache."""
+        self._parse = parse
+        self._cached: Optional[Callable[[str], Parsed]] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> Parsed:
+        """Parse `text`, using the cache when it is enabled."""
+        cached = self._cached
+        if cached is None:
+            return self._parse(text)
+        key = text.strip()
+        try:
+            return cached(key)
+        except Exception as exc:
+            # Report the text as it was given, not the stripped key.
+            if key != text and getattr(exc, "value", None) == key:
+                exc.value = text  # type: ignore
+            raise
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is in use."""
+        return self._cached is not None
+
+    def enable(self, maxsize: Optional[int] = DEFAULT_MAXSIZE) -> None:
+        """Start caching, dropping any existing entries and statistics.
+
+        Args:
+            maxsize (Optional[int]): Most entries to keep. `None` is unbounded. Defaults to 4096.
+        """
+        with self._lock:
+            self._cached = functools.lru_cache(maxsize=maxsize)(self._parse)
+
+    def disable(self) -> None:
+        """Stop caching and drop every entry."""
+        with self._lock:
+            self._cached = None
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            if self._cached is not None:
+                self._cached.cache_clear()  # type: ignore
+
+    def info(self) -> CacheInfo:
+        """Give the hit and miss statistics.
+
+        Returns:
+            (CacheInfo): Hits, misses, maximum size and current size.
+        """
+        cached = self._cached
+        if cached is None:
+            return CacheInfo(0, 0, 0, 0)
+        return CacheInfo(*cached.cache_info())  # type: ignore
@@ -15,3 +15,17 @@ def strip_decimal(value: float, places: int = 1) -> str:
     if (int(rounded_value) - rounded_value) == 0:
         return f"{int(rounded_value)}"
     return f"{rounded_value}"
+
+
+def give_plus_sign(value: float) -> str:
+    """Format a power to 2 decimal places, prepending '+' if it is positive.
+
+    Args:
+        value (float): The power in dioptres.
+
+    Returns:
+        (str): Signed value to 2 decimal places.
+    """
+    if value >= 0:
+        return f"+{value:0.2f}"
+    return f"{value:0.2f}"
@@ -0,0 +1,190 @@
+"""On-disk columnar storage of batches, one `.npy` file per column."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence, Tuple, Type, TypeVar, Union
+
+import numpy as np
+
+from .arrays import pack_columns
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+FORMAT = "optom-tools-columns"
+FORMAT_VERSION = 1
+HEADER = "header.json"
+
+T = TypeVar("T", bound="ColumnarMixin")
+
+
+def save_columns(
+    path: PathLike, kind: str, columns: Dict[str, np.ndarray]
+) -> None:
+    """Save equal-length columns to a directory.
+
+    Each column is written to `<name>.npy`, except columns holding a single
+    repeated value, which are only stored in `header.json`. The header is
+    written last, so an interrupted save cannot be loaded.
+
+    Args:
+        path (PathLike): The directory, created if missing.
+        kind (str): Name of the batch class, checked on loading.
+        columns (Dict[str, np.ndarray]): The columns by name.
+    """
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    header = directory / HEADER
+    if header.exists():
+        header.unlink()
+    state = pack_columns(columns)
+    length = state["length"]
+    described: Dict[str, Dict[str, Any]] = {}
+    for name, column in state["columns"].items():
+        described[name] = {"dtype": column.dtype.str}
+        if len(column) != length:
+            described[name]["value"] = column[0].item()
+        else:
+            np.save(directory / f"{name}.npy", column, allow_pickle=False)
+    header.write_text(
+        json.dumps(
+            {
+                "format": FORMAT,
+                "version": FORMAT_VERSION,
+                "kind": kind,
+                "length": length,
+                "columns": described,
+            },
+            indent=2,
+        )
+    )
+
+
+def load_columns(
+    path: PathLike,
+    kind: str,
+    names: Sequence[str],
+    error: Callable[..., Exception],
+    mmap: bool = True,
+) -> Dict[str, np.ndarray]:
+    """Load columns saved by `save_columns()`.
+
+    With `mmap`, columns are read-only views of the memory mapped files, so
+    loading takes the same time whatever the length, and rows are only read
+    from disk when used. Repeated values are read-only broadcast views.
+
+    Args:
+        path (PathLike): The directory.
+        kind (str): Name of the batch class the columns must have been saved from.
+        names (Sequence[str]): Columns to load.
+        error (Callable[..., Exception]): Error class raised for unusable files.
+        mmap (bool): Map the files rather than reading them. Defaults to `True`.
+
+    Returns:
+        (Dict[str, np.ndarray]): The columns by name.
+
+    Raises:
+        Exception: `error`, if the directory does not hold matching columns.
+    """
+    directory = Path(path)
+    try:
+        header = json.loads((directory / HEADER).read_text())
+    except (OSError, ValueError):
+        raise error(
+            value=str(path), message="No saved batch found in directory"
+        )
+    if header.get("format") != FORMAT or header.get("version") != (
+        FORMAT_VERSION
+    ):
+        raise error(
+            value=(header.get("format"), header.get("version")),
+            message=f"Saved batch format must be {FORMAT} version {FORMAT_VERSION}",
+        )
+    if header["kind"] != kind:
+        raise error(
+            value=header["kind"],
+            message=f"Saved batch is not a {kind}",
+        )
+    length = header["length"]
+    columns: Dict[str, np.ndarray] = {}
+    for name in names:
+        described = header["columns"].get(name)
+        if described is None:
+            raise error(value=name, message="Saved batch is missing a column")
+        dtype = np.dtype(described["dtype"])
+        if "value" in described:
+            columns[name] = np.broadcast_to(
+                np.array(described["value"], dtype=dtype), (length,)
+            )
+            continue
+        try:
+            column = np.load(
+                directory / f"{name}.npy",
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+        except (OSError, ValueError):
+            raise error(value=name, message="Saved column could not be read")
+        if column.shape != (length,) or column.dtype != dtype:
+            raise error(
+                value=name,
+                message="Saved column does not match the header",
+            )
+        columns[name] = np.asarray(column)
+    return columns
+
+
+class ColumnarMixin:
+    """Saving and loading for batches of NumPy columns.
+
+    Batches list their column attributes in `columns` and the exception
+    raised for unusable saved files in `_error`.
+    """
+
+    columns: Tuple[str, ...]
+    _error: Callable[..., Exception]
+
+    @classmethod
+    def _from_columns(cls: Type[T], columns: Dict[str, np.ndarray]) -> T:
+        """Wrap columns as a batch without copying or checking them."""
+        batch = cls.__new__(cls)
+        for name in cls.columns:
+            setattr(batch, name, columns[name])
+        return batch
+
+    def save(self, path: PathLike) -> None:
+        """Save the batch to a directory, one `.npy` file per column.
+
+        Saved batches load much faster than parsing the original text again.
+
+        Args:
+            path (PathLike): The directory, created if missing.
+        """
+        save_columns(
+            path,
+            self.__class__.__name__,
+            {name: getattr(self, name) for name in self.columns},
+        )
+
+    @classmethod
+    def load(cls: Type[T], path: PathLike, mmap: bool = True) -> T:
+        """Load a batch saved by `save()`.
+
+        With `mmap`, the columns are read-only views of the files, so even a
+        very large batch opens instantly. Rows, slices and sub-batches are
+        only read from disk when used. Operations that change the batch give
+        it new columns in memory and leave the files unchanged.
+
+        Args:
+            path (PathLike): The directory.
+            mmap (bool): Map the files rather than reading them into memory. Defaults to `True`.
+
+        Returns:
+            The saved batch.
+
+        Raises:
+            Exception: The batch `_error`, if the directory does not hold a saved batch of this class.
+        """
+        return cls._from_columns(
+            load_columns(path, cls.__name__, cls.columns, cls._error, mmap)
+        )
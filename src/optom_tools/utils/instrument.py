@@ -0,0 +1,245 @@
+"""Opt-in counters and timers around hot paths."""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+# Set to any non-empty value to enable instrumentation at import.
+ENV_VAR = "OPTOM_TOOLS_INSTRUMENT"
+
+
+class Metric(NamedTuple):
+    """Calls, errors and cumulative seconds of an instrumented operation."""
+
+    calls: int
+    errors: int
+    seconds: float
+
+
+class _Counter:
+    """Mutable totals shared by the wrappers of one operation."""
+
+    __slots__ = ("calls", "errors", "seconds")
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+
+class Instrumentation:
+    """Registry of hot paths that are timed only while enabled.
+
+    Modules register their hot paths at import. While disabled nothing is
+    wrapped, so instrumentation costs nothing. `enable()` swaps each
+    registered method (or property, or pydantic field validator) for a
+    wrapper that counts calls and errors and adds up the time spent, and
+    `disable()` puts the originals back.
+
+    Times include nested operations, e.g. `rx.validate` is part of the time
+    of the call that built the prescription. Totals are updated without a
+    lock, so counts from several threads at once are approximate.
+
+    Examples:
+        Typical use:
+        >>> with instrumentation.use():
+        ...     str(Prescription("+1.00/-1.00x90"))
+        >>> instrumentation.snapshot()["rx.parse"]
+        Metric(calls=1, errors=0, seconds=1.7e-05)
+        >>> print(instrumentation.to_prometheus())
+    """
+
+    def __init__(self) -> None:
+        """Construct disabled registry."""
+        self.enabled = False
+        self._counters: Dict[str, _Counter] = {}
+        self._targets: List[Callable[[], Callable[[], None]]] = []
+        self._undo: List[Callable[[], None]] = []
+        self._lock = threading.RLock()
+
+    def _counter(self, name: str) -> _Counter:
+        """Give the counter of an operation, creating it if new."""
+        return self._counters.setdefault(name, _Counter())
+
+    def _timed(self, name: str, func: Callable[..., Any]) -> Any:
+        """Wrap `func` to update the counter of `name`."""
+        counter = self._counter(name)
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                counter.errors += 1
+                raise
+            finally:
+                counter.calls += 1
+                counter.seconds += perf_counter() - start
+
+        return timed
+
+    def _add_target(self, patch: Callable[[], Callable[[], None]]) -> None:
+        """Keep a patch, applying it now if instrumentation is enabled."""
+        with self._lock:
+            self._targets.append(patch)
+            if self.enabled:
+                self._undo.append(patch())
+
+    def register(self, owner: Any, attribute: str, name: str) -> None:
+        """Register a method or property of a class for timing.
+
+        Args:
+            owner (Any): The class.
+            attribute (str): Name of the method or property.
+            name (str): Name of the operation in snapshots, e.g. 'rx.parse'.
+        """
+        self._counter(name)
+
+        def patch() -> Callable[[], None]:
+            original = owner.__dict__[attribute]
+            if isinstance(original, property):
+                wrapped: Any = property(
+                    self._timed(name, original.fget),  # type: ignore
+                    original.fset,
+                    original.fdel,
+                    original.__doc__,
+                )
+            elif isinstance(original, (classmethod, staticmethod)):
+                wrapped = type(original)(self._timed(name, original.__func__))
+            else:
+                wrapped = self._timed(name, original)
+            setattr(owner, attribute, wrapped)
+            return lambda: setattr(owner, attribute, original)
+
+        self._add_target(patch)
+
+    def register_validators(self, model: Any, name: str) -> None:
+        """Register every field validator of a pydantic model for timing.
+
+        Nested models are validated by the validators of their field, so
+        registering the outer model covers them.
+
+        Args:
+            model (Any): The pydantic model class.
+            name (str): Name of the operation in snapshots, e.g. 'rx.validate'.
+        """
+        self._counter(name)
+
+        def patch() -> Callable[[], None]:
+            originals = []
+            for field in model.__fields__.values():
+                for kind in (
+                    "pre_validators",
+                    "validators",
+                    "post_validators",
+                ):
+                    validators = getattr(field, kind)
+                    if validators:
+                        originals.append((validators, list(validators)))
+                        validators[:] = [
+                            self._timed(name, validator)
+                            for validator in validators
+                        ]
+
+            def undo() -> None:
+                for validators, original in originals:
+                    validators[:] = original
+
+            return undo
+
+        self._add_target(patch)
+
+    def enable(self) -> None:
+        """Start timing every registered operation."""
+        with self._lock:
+            if not self.enabled:
+                self._undo = [patch() for patch in self._targets]
+                self.enabled = True
+
+    def disable(self) -> None:
+        """Stop timing and restore the original operations."""
+        with self._lock:
+            for undo in reversed(self._undo):
+                undo()
+            self._undo = []
+            self.enabled = False
+
+    @contextmanager
+    def use(self) -> Iterator["Instrumentation"]:
+        """Enable instrumentation for a block of code."""
+        enabled = self.enabled
+        self.enable()
+        try:
+            yield self
+        finally:
+            if not enabled:
+                self.disable()
+
+    def snapshot(self) -> Dict[str, Metric]:
+        """Give the totals of every registered operation.
+
+        Returns:
+            (Dict[str, Metric]): Totals by operation name.
+        """
+        return {
+            name: Metric(counter.calls, counter.errors, counter.seconds)
+            for name, counter in sorted(self._counters.items())
+        }
+
+    def reset(self) -> None:
+        """Set every total back to zero."""
+        for counter in self._counters.values():
+            counter.calls = counter.errors = 0
+            counter.seconds = 0.0
+
+    def to_json(self) -> str:
+        """Give the snapshot as JSON.
+
+        Returns:
+            (str): `{name: {"calls": ..., "errors": ..., "seconds": ...}}`.
+        """
+        return json.dumps(
+            {
+                name: metric._asdict()
+                for name, metric in self.snapshot().items()
+            }
+        )
+
+    def to_prometheus(self, prefix: str = "optom_tools") -> str:
+        """Give the snapshot in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of the metric names. Defaults to 'optom_tools'.
+
+        Returns:
+            (str): Counters labelled by operation.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for field, help_text in (
+            ("calls", "Calls of instrumented operations."),
+            ("errors", "Calls of instrumented operations that raised."),
+            ("seconds", "Time in instrumented operations, nested included."),
+        ):
+            metric = f"{prefix}_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, totals in snapshot.items():
+                lines.append(
+                    f'{metric}{{operation="{name}"}} '
+                    f"{getattr(totals, field)!r}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+instrumentation = Instrumentation()
+
+if os.environ.get(ENV_VAR):
+    instrumentation.enable()
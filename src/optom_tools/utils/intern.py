@@ -0,0 +1,242 @@
+"""Interning of frozen models, so equal values share one instance."""
+
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from pydantic.main import ModelMetaclass
+
+Value = TypeVar("Value")
+
+DEFAULT_POOL_SIZE = 65536
+
+
+class PoolInfo(NamedTuple):
+    """Statistics of an `InternPool`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class InternPool(Generic[Value]):
+    """Pool of shared instances with least recently used eviction.
+
+    Values must be hashable and immutable. Once the pool holds `maxsize`
+    values, adding another evicts the least recently used one. Evicted
+    instances stay valid, they are just no longer shared with new equal
+    values.
+
+    A value can also be found by an alias, such as the text it was parsed
+    from, which skips building it again. Up to `maxsize` aliases are kept,
+    also least recently used first.
+
+    Args:
+        maxsize (Optional[int]): Most values to keep. `None` is unbounded. Defaults to 65536.
+
+    Examples:
+        Typical use:
+        >>> pool = InternPool(maxsize=2)
+        >>> pool.intern((1, 2)) is pool.intern((1, 2))
+        True
+        >>> pool.info()
+        PoolInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_POOL_SIZE) -> None:
+        """Construct empty pool."""
+        self._values: "OrderedDict[Value, Value]" = OrderedDict()
+        self._aliases: "OrderedDict[Hashable, Value]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, alias: Hashable) -> Optional[Value]:
+        """Give the value stored under an alias.
+
+        Args:
+            alias (Hashable): The alias given to `intern()`.
+
+        Returns:
+            (Optional[Value]): The shared instance, or `None` if unknown.
+        """
+        with self._lock:
+            shared = self._aliases.get(alias)
+            if shared is not None:
+                self.hits += 1
+                self._aliases.move_to_end(alias)
+            return shared
+
+    def intern(self, value: Value, alias: Optional[Hashable] = None) -> Value:
+        """Give the pooled instance equal to `value`, adding it if new.
+
+        Args:
+            value (Value): The value.
+            alias (Optional[Hashable]): Another key to find the value by with `get()`.
+
+        Returns:
+            (Value): The shared instance.
+        """
+        with self._lock:
+            shared = self._values.get(value)
+            if shared is None:
+                self.misses += 1
+                shared = self._values[value] = value
+            else:
+                self.hits += 1
+                self._values.move_to_end(value)
+            if alias is not None:
+                self._aliases[alias] = shared
+            self._evict()
+            return shared
+
+    def _evict(self) -> None:
+        """Drop the least recently used values and aliases above `maxsize`."""
+        if self.maxsize is None:
+            return
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+            self.evictions += 1
+        while len(self._aliases) > self.maxsize:
+            self._aliases.popitem(last=False)
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """Change the most values kept, evicting any above it.
+
+        Args:
+            maxsize (Optional[int]): Most values to keep. `None` is unbounded.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every value and alias, and reset the statistics."""
+        with self._lock:
+            self._values.clear()
+            self._aliases.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> PoolInfo:
+        """Give the pool statistics.
+
+        Returns:
+            (PoolInfo): Hits, misses, evictions, maximum size and current size.
+        """
+        with self._lock:
+            return PoolInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._values),
+            )
+
+    def __len__(self) -> int:
+        """Give the number of pooled values."""
+        return len(self._values)
+
+
+class InterningMeta(ModelMetaclass):
+    """Metaclass giving the pooled instance whenever a model is built."""
+
+    pool: InternPool
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        """Build and validate the model, then intern it.
+
+        Models parsed from text are found by the text next time, without
+        parsing it again.
+        """
+        if len(args) == 1 and not kwargs and isinstance(args[0], str):
+            shared = cls.pool.get(args[0])
+            if shared is None:
+                shared = cls.pool.intern(super().__call__(*args), args[0])
+            return shared
+        return cls.pool.intern(super().__call__(*args, **kwargs))
+
+
+class FrozenModel(
+    BaseModel, metaclass=InterningMeta, copy_on_model_validation="none"
+):
+    """Base for immutable, hashable and interned variants of models.
+
+    Subclass it together with the mutable model, e.g.
+    `class FrozenAdd(FrozenModel, Add)`. Every subclass gets its own pool.
+    Changing a field raises the model's error class. Models passed to a
+    frozen field are used as they are rather than copied.
+    """
+
+    pool: ClassVar[InternPool]
+    error: ClassVar[Callable[..., Exception]]
+    mutable_model: ClassVar[Type[BaseModel]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Give each frozen model its own pool."""
+        super().__init_subclass__(**kwargs)
+        cls.pool = InternPool()
+
+    def _key(self) -> Tuple[Any, ...]:
+        """Give the field values."""
+        return tuple(self.__dict__.values())
+
+    def __hash__(self) -> int:
+        """Hash the field values."""
+        return hash(self._key())
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare field values, quickly when both models are frozen."""
+        if other.__class__ is self.__class__:
+            return self._key() == other._key()
+        return super().__eq__(other)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse every change."""
+        raise self.error(
+            value=name,
+            message=f"{self.__class__.__name__} cannot be changed, use thaw() for a mutable copy",
+        )
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        """Return self, as frozen models never change."""
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle so that unpickling gives the pooled instance."""
+        return (_unpickle, (self.__class__, self.__getstate__()))
+
+    def freeze(self) -> Any:
+        """Return self, as the model is frozen already."""
+        return self
+
+    def thaw(self) -> Any:
+        """Give a mutable copy of the model.
+
+        Returns:
+            The mutable model with the same values.
+        """
+        return self.mutable_model(**self.dict())
+
+
+def _unpickle(cls: Type[FrozenModel], state: Dict[str, Any]) -> FrozenModel:
+    """Rebuild a pickled frozen model and intern it."""
+    model = cls.__new__(cls)
+    model.__setstate__(state)
+    return cls.pool.intern(model)
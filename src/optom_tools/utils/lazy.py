@@ -0,0 +1,43 @@
+"""Lazy module exports, so importing a package stays cheap."""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    module_name: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build module `__getattr__` and `__dir__` functions for lazy exports.
+
+    Each export is imported from its submodule the first time it is used and
+    then cached on the module, so NumPy and friends are only loaded by code
+    that needs them.
+
+    Args:
+        module_name (str): The module doing the exporting, i.e. `__name__`.
+        exports (Dict[str, str]): Exported name to (relative) module path.
+
+    Returns:
+        (Tuple[Callable[[str], Any], Callable[[], List[str]]]): The `__getattr__` and `__dir__` functions.
+
+    Examples:
+        Typical use in an `__init__.py`:
+        >>> __getattr__, __dir__ = lazy_exports(__name__, {"log": ".logger"})
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            )
+        value = getattr(
+            importlib.import_module(exports[name], module_name), name
+        )
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,14 +1,35 @@
-"""Logger for the project."""
+"""Logger for the project.
 
-import logging
+Nothing is configured on import, so applications using optom_tools keep their
+own logging setup. Call `setup_logging()` to print the package's log records
+with rich.
+"""
 
-from rich.logging import RichHandler
+import logging
+from typing import Union
 
 FORMAT = "%(message)s"
 LEVEL = "DEBUG"
 DATEFMT = "[%X]"
 
-logging.basicConfig(
-    level=LEVEL, format=FORMAT, datefmt=DATEFMT, handlers=[RichHandler()]
-)
-log = logging.getLogger("rich")
+log = logging.getLogger("optom_tools")
+log.addHandler(logging.NullHandler())
+
+
+def setup_logging(level: Union[int, str] = LEVEL) -> None:
+    """Print the package's log records to the terminal with rich.
+
+    Only the `optom_tools` logger is changed, the root logger is left alone.
+    Calling it again only updates the level.
+
+    Args:
+        level (Union[int, str]): The logging level. Defaults to 'DEBUG'.
+    """
+    from rich.logging import RichHandler
+
+    log.setLevel(level)
+    if any(isinstance(handler, RichHandler) for handler in log.handlers):
+        return
+    handler = RichHandler()
+    handler.setFormatter(logging.Formatter(FORMAT, datefmt=DATEFMT))
+    log.addHandler(handler)
@@ -0,0 +1,119 @@
+"""Validation rules shared by the models and bulk validation."""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Error codes are bit flags in this dtype, so a batch has at most 32 rules.
+CODE_DTYPE = "uint32"
+
+
+class Rule(NamedTuple):
+    """A check on a value, written so it also works on a NumPy column.
+
+    `invalid` must only use comparisons and `|`, so that it gives a bool for
+    a float and a bool mask for an array.
+    """
+
+    message: str
+    invalid: Callable[[Any], Any]
+
+    def check(self, value: Any, error: Type[Exception]) -> Any:
+        """Give the value, raising `error` if it breaks the rule.
+
+        Args:
+            value (Any): The value.
+            error (Type[Exception]): The package error, e.g. `PrescriptionError`.
+
+        Returns:
+            (Any): The value.
+        """
+        if self.invalid(value):
+            raise error(value=value, message=self.message)  # type: ignore
+        return value
+
+
+class ValidationReport(NamedTuple):
+    """Per-row results of checking a batch against its rules.
+
+    Bit `i` of a row's code is set when the row breaks rule `i`, so `0`
+    means valid.
+
+    Examples:
+        Typical use:
+        >>> report = batch.validate()
+        >>> report.codes
+        array([0, 1, 0], dtype=uint32)
+        >>> batch[report.valid]
+        >>> report.summary()
+        {'axis': 1, 'add': 0, ...}
+        >>> report.errors(1)
+        ['Axis must be between 0 and 180 degrees']
+    """
+
+    codes: "np.ndarray"
+    columns: Tuple[str, ...]
+    messages: Tuple[str, ...]
+
+    @property
+    def valid(self) -> "np.ndarray":
+        """Give a bool mask of the rows breaking no rule."""
+        return self.codes == 0
+
+    def invalid_rows(self) -> "np.ndarray":
+        """Give the indices of the rows breaking a rule."""
+        return self.codes.nonzero()[0]
+
+    def mask(self, column: str) -> "np.ndarray":
+        """Give a bool mask of the rows breaking the rule on `column`."""
+        return (self.codes & (1 << self.columns.index(column))) != 0
+
+    def summary(self) -> Dict[str, int]:
+        """Give the number of rows breaking each rule, by column."""
+        return {
+            column: int(((self.codes >> bit) & 1).sum())
+            for bit, column in enumerate(self.columns)
+        }
+
+    def errors(self, index: int) -> List[str]:
+        """Give the messages of the rules a row breaks, in rule order."""
+        code = int(self.codes[index])
+        return [
+            message
+            for bit, message in enumerate(self.messages)
+            if code >> bit & 1
+        ]
+
+
+def check_rules(
+    batch: Any, rules: Sequence[Tuple[str, Rule]]
+) -> ValidationReport:
+    """Check every column of a batch against its rule without raising.
+
+    Args:
+        batch (Any): A batch with a NumPy array attribute per column.
+        rules (Sequence[Tuple[str, Rule]]): Column names and their rules.
+
+    Returns:
+        (ValidationReport): The error code of each row.
+    """
+    codes: Any = 0
+    for bit, (column, rule) in enumerate(rules):
+        broken = rule.invalid(getattr(batch, column)).astype(CODE_DTYPE)
+        codes = codes | (broken << bit)
+    return ValidationReport(
+        codes,
+        tuple(column for column, _ in rules),
+        tuple(rule.message for _, rule in rules),
+    )
@@ -0,0 +1,97 @@
+"""Helpers for skipping pydantic validation of trusted data."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Type, TypeVar
+
+from pydantic import BaseModel
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Whether assignments skip validation, per thread or asyncio task.
+_SKIP_VALIDATION: ContextVar[bool] = ContextVar(
+    "no_assignment_validation", default=False
+)
+
+
+def assign_trusted(model: BaseModel, name: str, value: Any) -> bool:
+    """Store a field as given inside `no_assignment_validation()`.
+
+    Called first by the `__setattr__` of each module's `BaseModel`.
+
+    Args:
+        model (BaseModel): The model being changed.
+        name (str): The attribute name.
+        value (Any): The new value.
+
+    Returns:
+        (bool): Whether the value was stored, `False` outside the block or for names that are not fields.
+    """
+    if not _SKIP_VALIDATION.get() or name not in model.__fields__:
+        return False
+    model.__dict__[name] = value
+    model.__fields_set__.add(name)
+    return True
+
+
+def construct_trusted(model: Type[Model], values: Dict[str, Any]) -> Model:
+    """Build a model from trusted values without validating them.
+
+    Nested models given as dictionaries (or lists of dictionaries) are built
+    the same way, so `Prescription.from_trusted(add={"add": 2})` works like
+    the validating constructor.
+
+    Args:
+        model (Type[Model]): The model class.
+        values (Dict[str, Any]): Field values.
+
+    Returns:
+        (Model): The unvalidated model.
+    """
+    for name, value in values.items():
+        field = model.__fields__.get(name)
+        if field is None:
+            continue
+        sub_model = field.type_
+        if not (
+            isinstance(sub_model, type) and issubclass(sub_model, BaseModel)
+        ):
+            continue
+        if isinstance(value, dict):
+            values[name] = construct_trusted(sub_model, value)
+        elif isinstance(value, list):
+            values[name] = [
+                (
+                    construct_trusted(sub_model, item)
+                    if isinstance(item, dict)
+                    else item
+                )
+                for item in value
+            ]
+    return model.construct(**values)
+
+
+@contextmanager
+def no_assignment_validation() -> Iterator[None]:
+    """Turn off validation on attribute assignment for a block of code.
+
+    The models normally revalidate every field that is set, so
+    `Prescription.transpose()` validates three times. Inside this block,
+    assignments are stored as given. Only use it on data that is already
+    known to be valid.
+
+    The setting is kept in a context variable, so it only applies to the
+    current thread or asyncio task; other threads keep validating. Blocks
+    can be nested.
+
+    Examples:
+        Typical use:
+        >>> with no_assignment_validation():
+        ...     for rx in trusted_rxs:
+        ...         rx.transpose("n")
+    """
+    token = _SKIP_VALIDATION.set(True)
+    try:
+        yield
+    finally:
+        _SKIP_VALIDATION.reset(token)
@@ -1,5 +1,57 @@
 """Visual Acuity module."""
 
-from .visual_acuity import VisualAcuity
+from typing import TYPE_CHECKING
 
-__all__ = ["VisualAcuity"]
+from optom_tools.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .batch import VisualAcuityBatch
+    from .chart import CHART_LINES, ChartLine, chart_line, nearest_line
+    from .frozen import FrozenVisualAcuity
+    from .numeric import NumericBackend, numeric_backend
+    from .parser import VaComponents, default_unit, parse_cache, parse_va
+    from .scoring import ETDRS, LetterChart, LetterScore, LetterScores
+    from .visual_acuity import VisualAcuity
+
+__all__ = [
+    "CHART_LINES",
+    "ChartLine",
+    "ETDRS",
+    "FrozenVisualAcuity",
+    "LetterChart",
+    "LetterScore",
+    "LetterScores",
+    "NumericBackend",
+    "VaComponents",
+    "VisualAcuity",
+    "VisualAcuityBatch",
+    "chart_line",
+    "default_unit",
+    "nearest_line",
+    "numeric_backend",
+    "parse_cache",
+    "parse_va",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CHART_LINES": ".chart",
+        "ChartLine": ".chart",
+        "ETDRS": ".scoring",
+        "FrozenVisualAcuity": ".frozen",
+        "LetterChart": ".scoring",
+        "LetterScore": ".scoring",
+        "LetterScores": ".scoring",
+        "NumericBackend": ".numeric",
+        "VaComponents": ".parser",
+        "VisualAcuity": ".visual_acuity",
+        "VisualAcuityBatch": ".batch",
+        "chart_line": ".chart",
+        "default_unit": ".parser",
+        "nearest_line": ".chart",
+        "numeric_backend": ".numeric",
+        "parse_cache": ".parser",
+        "parse_va": ".parser",
+    },
+)
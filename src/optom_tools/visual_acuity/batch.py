@@ -0,0 +1,414 @@
+"""Columnar storage for many visual acuities at once."""
+
+import math
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+import numpy as np
+from typing_extensions import Literal
+
+from optom_tools.utils import (
+    ColumnarMixin,
+    ValidationReport,
+    check_rules,
+    map_unique,
+    pack_columns,
+    strip_decimal,
+    unpack_columns,
+)
+
+from .chart import CHART_BOUNDARIES, CHART_LINES, FT_DISTANCE, M_DISTANCE
+from .exceptions import VisualAcuityError
+from .numeric import Number, numeric_backend
+from .parser import VaComponents, parse_va
+from .rules import BATCH_RULES
+from .visual_acuity import FT_M, VisualAcuity
+
+ArrayLike = Union[np.ndarray, Iterable[float], float]
+UnitLike = Union[np.ndarray, Iterable[str], Literal["ft", "m"]]
+
+_CHART_BOUNDARIES = np.array(CHART_BOUNDARIES)
+_CHART_LOGMAR = np.array([line.logmar for line in CHART_LINES])
+_CHART_M = np.array([line.m_denominator for line in CHART_LINES])
+_CHART_FT = np.array([line.ft_denominator for line in CHART_LINES])
+
+
+class VisualAcuityBatch(ColumnarMixin):
+    """A batch of visual acuities stored as NumPy columns.
+
+    Results are identical to the scalar `VisualAcuity` properties, but are
+    computed for the whole batch at once. Values in a batch are not validated
+    when it is built; `validate()` checks them all at once.
+
+    Args:
+        numerator (ArrayLike): The test distances.
+        denominator (ArrayLike): The distances required to subtend 5 minutes of arc.
+        unit (UnitLike): `'ft'` or `'m'` for each row. Defaults to 'm'.
+
+    Examples:
+        Typical use:
+        >>> batch = VisualAcuityBatch(numerator=6, denominator=[6, 12])
+        >>> batch.decimal.tolist()
+        [1.0, 0.5]
+        >>> batch.ft.tolist()
+        ['20/20', '20/39']
+
+        Building a batch from logMAR values:
+        >>> VisualAcuityBatch.from_logmar([0.0, -1.0]).to_strings().tolist()
+        ['6/6', '6/60']
+    """
+
+    columns = ("numerator", "denominator", "unit")
+    _error = VisualAcuityError
+
+    def __init__(
+        self,
+        numerator: ArrayLike,
+        denominator: ArrayLike,
+        unit: UnitLike = "m",
+    ) -> None:
+        """Construct batch, broadcasting scalar columns to the batch length."""
+        numerator_arr = np.asarray(numerator, dtype=np.float64)
+        denominator_arr = np.asarray(denominator, dtype=np.float64)
+        unit_arr = np.asarray(unit, dtype="<U2")
+        try:
+            numerator_arr, denominator_arr, unit_arr = np.broadcast_arrays(
+                numerator_arr, denominator_arr, unit_arr
+            )
+        except ValueError:
+            raise VisualAcuityError(
+                value=(numerator_arr.shape, denominator_arr.shape),
+                message="All batch columns must have the same length",
+            )
+        if numerator_arr.ndim > 1:
+            raise VisualAcuityError(
+                value=numerator_arr.shape,
+                message="Batch columns must be one dimensional",
+            )
+        self.numerator = np.atleast_1d(numerator_arr).copy()
+        self.denominator = np.atleast_1d(denominator_arr).copy()
+        self.unit = np.atleast_1d(unit_arr).copy()
+        if not np.isin(self.unit, ["ft", "m"]).all():
+            raise VisualAcuityError(
+                value=np.unique(self.unit).tolist(),
+                message="Unit must be either 'ft' or 'm'",
+            )
+
+    @classmethod
+    def from_visual_acuities(
+        cls, visual_acuities: Iterable[VisualAcuity]
+    ) -> "VisualAcuityBatch":
+        """Build a batch from `VisualAcuity` models.
+
+        Args:
+            visual_acuities (Iterable[VisualAcuity]): The visual acuities.
+
+        Returns:
+            (VisualAcuityBatch): Batch holding the same values.
+        """
+        rows = [
+            (va.numerator, va.denominator, va.unit) for va in visual_acuities
+        ]
+        if not rows:
+            return cls(numerator=[], denominator=[], unit=[])
+        numerator, denominator, unit = zip(*rows)
+        return cls(numerator=numerator, denominator=denominator, unit=unit)
+
+    @classmethod
+    def from_components(
+        cls, components: Iterable[VaComponents]
+    ) -> "VisualAcuityBatch":
+        """Build a batch from parsed `VaComponents`.
+
+        Args:
+            components (Iterable[VaComponents]): Output of `parse_va()`.
+
+        Returns:
+            (VisualAcuityBatch): Batch holding the parsed values.
+        """
+        rows = list(components)
+        if not rows:
+            return cls(numerator=[], denominator=[], unit=[])
+        numerator, denominator, unit = zip(*rows)
+        return cls(numerator=numerator, denominator=denominator, unit=unit)
+
+    @classmethod
+    def from_strings(cls, va_strings: Iterable[str]) -> "VisualAcuityBatch":
+        """Parse Snellen fraction strings straight into a batch.
+
+        Args:
+            va_strings (Iterable[str]): Visual acuities as strings.
+
+        Returns:
+            (VisualAcuityBatch): Batch holding the parsed values.
+
+        Raises:
+            VisualAcuityError: A visual acuity could not be parsed.
+        """
+        return cls.from_components(parse_va(va) for va in va_strings)
+
+    @classmethod
+    def from_logmar(
+        cls,
+        logmar: ArrayLike,
+        numerator: ArrayLike = 6,
+        unit: UnitLike = "m",
+    ) -> "VisualAcuityBatch":
+        """Build a batch from logMAR values.
+
+        This is the inverse of `VisualAcuityBatch.logmar` (and
+        `VisualAcuity.logmar`) for the given test distance.
+
+        Args:
+            logmar (ArrayLike): The logMAR values.
+            numerator (ArrayLike): The test distance. Defaults to 6.
+            unit (UnitLike): `'ft'` or `'m'`. Defaults to 'm'.
+
+        Returns:
+            (VisualAcuityBatch): Batch with the matching denominators.
+        """
+        numerator_arr = np.asarray(numerator, dtype=np.float64)
+        denominator = numerator_arr / np.power(
+            10.0, np.asarray(logmar, dtype=np.float64)
+        )
+        return cls(numerator=numerator_arr, denominator=denominator, unit=unit)
+
+    @classmethod
+    def concatenate(
+        cls, batches: Iterable["VisualAcuityBatch"]
+    ) -> "VisualAcuityBatch":
+        """Join batches end to end, keeping their order.
+
+        Args:
+            batches (Iterable[VisualAcuityBatch]): The batches to join.
+
+        Returns:
+            (VisualAcuityBatch): A single batch.
+        """
+        batches = list(batches)
+        if not batches:
+            return cls(numerator=[], denominator=[], unit=[])
+        return cls(
+            **{
+                name: np.concatenate([getattr(b, name) for b in batches])
+                for name in cls.columns
+            }
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pack the columns for compact pickling between processes."""
+        return pack_columns(
+            {name: getattr(self, name) for name in self.columns}
+        )
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Unpack columns packed by `__getstate__`."""
+        for name, column in unpack_columns(state).items():
+            setattr(self, name, column)
+
+    def to_visual_acuities(self) -> List[VisualAcuity]:
+        """Convert the batch back into `VisualAcuity` models.
+
+        Returns:
+            (List[VisualAcuity]): One validated model per row.
+        """
+        return [
+            VisualAcuity(
+                numerator=numerator, denominator=denominator, unit=unit
+            )
+            for numerator, denominator, unit in zip(
+                self.numerator.tolist(),
+                self.denominator.tolist(),
+                self.unit.tolist(),
+            )
+        ]
+
+    def _row(self, index: int) -> VisualAcuity:
+        """Build the `VisualAcuity` for a single row."""
+        return VisualAcuity(
+            numerator=self.numerator[index].item(),
+            denominator=self.denominator[index].item(),
+            unit=self.unit[index].item(),
+        )
+
+    def __len__(self) -> int:
+        """Give the number of visual acuities in the batch."""
+        return len(self.numerator)
+
+    def __getitem__(
+        self, key: Any
+    ) -> Union[VisualAcuity, "VisualAcuityBatch"]:
+        """Return a `VisualAcuity` for an integer, otherwise a sub-batch.
+
+        Slices share memory with the batch rather than copying it.
+        """
+        if isinstance(key, (int, np.integer)):
+            return self._row(int(key))
+        return self._from_columns(
+            {name: getattr(self, name)[key] for name in self.columns}
+        )
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return f"{self.__class__.__name__}(n={len(self)})"
+
+    def validate(self) -> ValidationReport:
+        """Check every row against the rules of `VisualAcuity`, without raising.
+
+        Returns:
+            (ValidationReport): The error code of each row.
+
+        Examples:
+            Typical use:
+            >>> report = VisualAcuityBatch([6, -6], [6, 12]).validate()
+            >>> report.valid.tolist()
+            [True, False]
+            >>> report.errors(1)
+            ['Distance must be a positive value']
+        """
+        return check_rules(self, BATCH_RULES)
+
+    def _map_fractions(
+        self, func: Callable[[float, float], Number]
+    ) -> np.ndarray:
+        """Apply a scalar function to each distinct fraction."""
+        fractions = np.stack([self.numerator, self.denominator], axis=1)
+        unique, inverse = np.unique(fractions, axis=0, return_inverse=True)
+        mapped = np.empty(len(unique), dtype=object)
+        mapped[:] = [func(*fraction) for fraction in unique.tolist()]
+        return mapped[inverse.reshape(-1)]
+
+    def _float_logmar(self) -> np.ndarray:
+        """Give logmar values as floats, whatever the numeric mode."""
+        return map_unique(
+            self.numerator / self.denominator, math.log10, dtype=np.float64
+        )
+
+    @property
+    def decimal(self) -> np.ndarray:
+        """Return decimal form of the visual acuities.
+
+        Follows `numeric_backend` like `VisualAcuity.decimal`: a float array
+        by default, otherwise an object array of `Decimal` or `Fraction`.
+
+        Returns:
+            (np.ndarray): Decimal form of each visual acuity.
+        """
+        if numeric_backend.mode == "float":
+            return self.numerator / self.denominator
+        return self._map_fractions(numeric_backend.decimal)
+
+    @property
+    def logmar(self) -> np.ndarray:
+        """Return logmar values of the visual acuities.
+
+        Follows `numeric_backend` like `VisualAcuity.logmar`.
+
+        Returns:
+            (np.ndarray): Logmar value of each visual acuity.
+        """
+        if numeric_backend.mode == "float":
+            return self._float_logmar()
+        return self._map_fractions(numeric_backend.logmar)
+
+    def _chart_index(self) -> np.ndarray:
+        """Give the index in `CHART_LINES` of each row's nearest line."""
+        return np.searchsorted(
+            _CHART_BOUNDARIES, self._float_logmar(), side="left"
+        )
+
+    @property
+    def chart_logmar(self) -> np.ndarray:
+        """Return the logMAR value of each visual acuity's chart line.
+
+        Matches `VisualAcuity.chart_line` row by row.
+
+        Returns:
+            (np.ndarray): Nominal logMAR of the nearest chart lines.
+        """
+        return _CHART_LOGMAR[self._chart_index()]
+
+    def snap_to_chart(self) -> None:
+        """Round every visual acuity to the nearest chart line.
+
+        Same as `VisualAcuity.snap_to_chart()`: units are kept, with a test
+        distance of 6m or 20ft.
+        """
+        index = self._chart_index()
+        feet = self.unit == "ft"
+        self.numerator = np.where(feet, FT_DISTANCE, M_DISTANCE).astype(
+            np.float64
+        )
+        self.denominator = np.where(feet, _CHART_FT[index], _CHART_M[index])
+
+    def _converted(self, unit: Literal["ft", "m"]):
+        """Give numerators and denominators expressed in `unit`."""
+        numerator = self.numerator
+        denominator = self.denominator
+        convert = self.unit != unit
+        if convert.any():
+            if unit == "m":
+                new_numerator = np.round(numerator * FT_M)
+                new_denominator = np.round(denominator * FT_M)
+            else:
+                new_numerator = np.round(numerator / FT_M)
+                new_denominator = np.round(denominator / FT_M)
+            numerator = np.where(convert, new_numerator, numerator)
+            denominator = np.where(convert, new_denominator, denominator)
+        return numerator, denominator
+
+    @staticmethod
+    def _fraction(
+        numerator: np.ndarray, denominator: np.ndarray
+    ) -> np.ndarray:
+        """Build snellen fraction strings."""
+        return np.char.add(
+            np.char.add(map_unique(numerator, strip_decimal, dtype=str), "/"),
+            map_unique(denominator, strip_decimal, dtype=str),
+        )
+
+    @property
+    def ft(self) -> np.ndarray:
+        """Return snellen fraction representations in feet.
+
+        Returns:
+            (np.ndarray): Snellen Fractions in feet.
+        """
+        return self._fraction(*self._converted("ft"))
+
+    @property
+    def m(self) -> np.ndarray:
+        """Return snellen fraction representations in metres/meters.
+
+        Returns:
+            (np.ndarray): Snellen Fractions in meters/metres.
+        """
+        return self._fraction(*self._converted("m"))
+
+    def to_strings(self) -> np.ndarray:
+        """Return snellen fraction representation of every visual acuity.
+
+        Returns:
+            (np.ndarray): Array of strings matching `str(VisualAcuity)`.
+        """
+        return self._fraction(self.numerator, self.denominator)
+
+    def convert_unit(self, flag: Literal["ft", "m"]) -> None:
+        """Convert the unit of every visual acuity between feet and metres.
+
+        Args:
+            flag (Literal["ft", "m"]): The unit to convert to.
+
+        Raises:
+            VisualAcuityError: Only accepts `'ft'` and `'m'`as options.
+        """
+        if flag not in ["ft", "m"]:
+            raise VisualAcuityError(
+                value=flag,
+                message="Method convert_unit() only accepts flags 'ft' and 'm'",
+            )
+        self.numerator, self.denominator = self._converted(flag)
+        self.unit = np.full(self.unit.shape, flag, dtype=self.unit.dtype)
+
+    def __str__(self) -> str:
+        """Provide one visual acuity per line."""
+        return "\n".join(self.to_strings().tolist())
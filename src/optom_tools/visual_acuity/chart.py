@@ -0,0 +1,136 @@
+"""Standard chart lines of logMAR and Snellen charts."""
+
+import bisect
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Test distances the chart lines are labelled with.
+M_DISTANCE = 6
+FT_DISTANCE = 20
+
+
+class ChartLine(NamedTuple):
+    """A line of a logMAR chart.
+
+    `logmar` has the same sign as `VisualAcuity.logmar`, i.e. `log10` of the
+    decimal acuity, so lines below 6/6 are negative.
+
+    Examples:
+        Typical use:
+        >>> line = chart_line(6, 12)
+        >>> line.m, line.ft, line.logmar
+        ('6/12', '20/40', -0.3)
+    """
+
+    logmar: float
+    m_denominator: float
+    ft_denominator: float
+
+    @property
+    def decimal(self) -> float:
+        """Decimal acuity of the line."""
+        return 10**self.logmar
+
+    @property
+    def m(self) -> str:
+        """Label of the line in metres."""
+        return f"{M_DISTANCE}/{self.m_denominator:g}"
+
+    @property
+    def ft(self) -> str:
+        """Label of the line in feet."""
+        return f"{FT_DISTANCE}/{self.ft_denominator:g}"
+
+
+# Sorted by logMAR for binary search, from 6/120 up to 6/3.
+CHART_LINES: Tuple[ChartLine, ...] = (
+    ChartLine(-1.3, 120, 400),
+    ChartLine(-1.2, 95, 320),
+    ChartLine(-1.1, 75, 250),
+    ChartLine(-1.0, 60, 200),
+    ChartLine(-0.9, 48, 160),
+    ChartLine(-0.8, 38, 125),
+    ChartLine(-0.7, 30, 100),
+    ChartLine(-0.6, 24, 80),
+    ChartLine(-0.5, 19, 63),
+    ChartLine(-0.4, 15, 50),
+    ChartLine(-0.3, 12, 40),
+    ChartLine(-0.2, 9.5, 32),
+    ChartLine(-0.1, 7.5, 25),
+    ChartLine(0.0, 6, 20),
+    ChartLine(0.1, 4.8, 16),
+    ChartLine(0.2, 3.8, 12.5),
+    ChartLine(0.3, 3, 10),
+)
+CHART_LOGMAR: List[float] = [line.logmar for line in CHART_LINES]
+# Halfway between neighbouring lines, where snapping moves to the next line.
+CHART_BOUNDARIES: List[float] = [
+    (low + high) / 2 for low, high in zip(CHART_LOGMAR, CHART_LOGMAR[1:])
+]
+
+# Traditional Snellen lines that are not on a logMAR chart.
+SNELLEN_M = (36, 18, 9, 5, 4)
+SNELLEN_FT = (70, 30, 15)
+
+
+def nearest_line(logmar: float) -> ChartLine:
+    """Give the chart line closest to a logMAR value.
+
+    Values halfway between two lines snap to the worse line. Values beyond
+    the chart snap to its top or bottom line.
+
+    Args:
+        logmar (float): logMAR value, with the sign of `VisualAcuity.logmar`.
+
+    Returns:
+        (ChartLine): The nearest line.
+
+    Examples:
+        Typical use:
+        >>> nearest_line(math.log10(6 / 10.5)).m
+        '6/9.5'
+    """
+    return CHART_LINES[bisect.bisect_left(CHART_BOUNDARIES, logmar)]
+
+
+def _lookup() -> Dict[Tuple[float, float], ChartLine]:
+    """Map every known fraction to its chart line."""
+    lines: Dict[Tuple[float, float], ChartLine] = {}
+    for line in CHART_LINES:
+        lines[M_DISTANCE, line.m_denominator] = line
+        lines[FT_DISTANCE, line.ft_denominator] = line
+    for denominator in SNELLEN_M:
+        lines[M_DISTANCE, denominator] = nearest_line(
+            math.log10(M_DISTANCE / denominator)
+        )
+    for denominator in SNELLEN_FT:
+        lines[FT_DISTANCE, denominator] = nearest_line(
+            math.log10(FT_DISTANCE / denominator)
+        )
+    return lines
+
+
+KNOWN_FRACTIONS = _lookup()
+
+
+def chart_line(numerator: float, denominator: float) -> Optional[ChartLine]:
+    """Look up the chart line of a known Snellen fraction.
+
+    Known fractions are the lines of a logMAR chart at 6m and 20ft, plus the
+    traditional Snellen lines (e.g. 6/9 and 6/18).
+
+    Args:
+        numerator (float): The test distance.
+        denominator (float): The distance required to subtend 5 minutes of arc.
+
+    Returns:
+        (Optional[ChartLine]): The line, or `None` if the fraction is unknown.
+
+    Examples:
+        Typical use:
+        >>> chart_line(6, 9).m
+        '6/9.5'
+        >>> chart_line(6, 10.5) is None
+        True
+    """
+    return KNOWN_FRACTIONS.get((numerator, denominator))
@@ -11,3 +11,7 @@ class VisualAcuityError(Exception):
         self.value = value
         self.message = message
         super().__init__(message)
+
+    def __reduce__(self):
+        """Pickle with both arguments so the error survives worker processes."""
+        return (self.__class__, (self.value, self.message))
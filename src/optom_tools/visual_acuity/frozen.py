@@ -0,0 +1,34 @@
+"""Immutable, interned visual acuities."""
+
+from optom_tools.utils.instrument import instrumentation
+from optom_tools.utils.intern import FrozenModel
+
+from .exceptions import VisualAcuityError
+from .visual_acuity import VisualAcuity
+
+
+class FrozenVisualAcuity(FrozenModel, VisualAcuity):
+    """An immutable and hashable `VisualAcuity`.
+
+    Building a frozen visual acuity equal to an existing one gives the
+    existing instance, so a long history of a few hundred distinct acuities
+    holds a few hundred models. The shared instances are kept in
+    `FrozenVisualAcuity.pool`, see `InternPool`.
+
+    Examples:
+        Typical use:
+        >>> FrozenVisualAcuity("6/6") is FrozenVisualAcuity(numerator=6)
+        True
+        >>> FrozenVisualAcuity.pool.info()
+        PoolInfo(hits=1, misses=1, evictions=0, maxsize=65536, currsize=1)
+
+        Changing a copy:
+        >>> va = FrozenVisualAcuity("6/6").thaw()
+        >>> va.convert_unit("ft")
+    """
+
+    error = VisualAcuityError
+    mutable_model = VisualAcuity
+
+
+instrumentation.register_validators(FrozenVisualAcuity, "va.validate")
@@ -1,7 +1,13 @@
 """Supporting models for the `VisualAcuity` model."""
 
+from typing import Any, Type, TypeVar
+
 from pydantic import BaseModel as PydanticBaseModel
 
+from optom_tools.utils.validation import assign_trusted, construct_trusted
+
+Model = TypeVar("Model", bound="BaseModel")
+
 
 class BaseModel(PydanticBaseModel):
     """Monkey patching pydantic `BaseModel`."""
@@ -10,3 +16,20 @@ class BaseModel(PydanticBaseModel):
         """Configation of model."""
 
         validate_assignment = True
+
+    @classmethod
+    def from_trusted(cls: Type[Model], **kwargs: Any) -> Model:
+        """Build a model from already validated values, skipping validation.
+
+        Takes the same keyword arguments as the model. Use it for data that
+        was validated before, e.g. rows read back from our own database.
+
+        Returns:
+            The unvalidated model.
+        """
+        return construct_trusted(cls, kwargs)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute, validating it outside `no_assignment_validation()`."""
+        if not assign_trusted(self, name, value):
+            super().__setattr__(name, value)
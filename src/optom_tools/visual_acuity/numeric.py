@@ -0,0 +1,225 @@
+"""Number types used for decimal acuity and logMAR values."""
+
+import functools
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import Literal
+
+from .exceptions import VisualAcuityError
+
+Number = Union[float, Decimal, Fraction]
+NumericMode = Literal["float", "decimal", "fraction"]
+
+# Decimal places kept by the "decimal" mode, and by logMAR in "fraction" mode.
+DEFAULT_PLACES = 4
+# Digits used for Decimal arithmetic before quantizing.
+PRECISION = 28
+
+
+def _float_decimal(numerator: float, denominator: float, places: int) -> float:
+    """Give the decimal acuity as a float, ignoring `places`."""
+    return numerator / denominator
+
+
+def _float_logmar(numerator: float, denominator: float, places: int) -> float:
+    """Give the logMAR as a float, ignoring `places`."""
+    return math.log10(numerator / denominator)
+
+
+def _exact(value: float) -> Decimal:
+    """Give the decimal a float was written as, e.g. 7.5 or 9.5."""
+    return Decimal(repr(float(value)))
+
+
+# Clinical data holds few distinct fractions, so exact results are cached.
+@functools.lru_cache(maxsize=4096)
+def _quantized_decimal(
+    numerator: float, denominator: float, places: int
+) -> Decimal:
+    """Divide exactly, rounding to `places`."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        return (_exact(numerator) / _exact(denominator)).quantize(
+            Decimal(1).scaleb(-places)
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _quantized_logmar(
+    numerator: float, denominator: float, places: int
+) -> Decimal:
+    """Take `log10` of the exact quotient, rounding to `places`."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        return (
+            (_exact(numerator) / _exact(denominator))
+            .log10()
+            .quantize(Decimal(1).scaleb(-places))
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _exact_fraction(numerator: float, denominator: float) -> Fraction:
+    """Divide as fractions, without rounding."""
+    return Fraction(_exact(numerator)) / Fraction(_exact(denominator))
+
+
+def _fraction_decimal(
+    numerator: float, denominator: float, places: int
+) -> Fraction:
+    """Give the exact fraction, ignoring `places`."""
+    return _exact_fraction(numerator, denominator)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quantized_logmar_fraction(
+    numerator: float, denominator: float, places: int
+) -> Fraction:
+    """Give the quantized logMAR as a fraction."""
+    return Fraction(_quantized_logmar(numerator, denominator, places))
+
+
+class _Setting(NamedTuple):
+    """Mode and decimal places of a `NumericBackend` in one context."""
+
+    mode: NumericMode
+    places: int
+    decimal: Callable[[float, float, int], Number]
+    logmar: Callable[[float, float, int], Number]
+
+
+# Decimal acuity and logMAR functions of each mode, given the places.
+_FUNCTIONS: Dict[str, Tuple[Callable[..., Number], Callable[..., Number]]] = {
+    "float": (_float_decimal, _float_logmar),
+    "decimal": (_quantized_decimal, _quantized_logmar),
+    "fraction": (_fraction_decimal, _quantized_logmar_fraction),
+}
+
+
+class NumericBackend:
+    """Number type returned by `decimal` and `logmar` of visual acuities.
+
+    Modes:
+
+    - `"float"` (default): fastest, with float rounding error.
+    - `"decimal"`: `Decimal` values computed from the written fraction
+      (e.g. 6/7.5, not the nearest float) and quantized to `places`.
+    - `"fraction"`: exact `Fraction` decimal acuities. logMAR is
+      irrational, so it is the `"decimal"` value as a `Fraction`.
+
+    The mode applies to `VisualAcuity` and `VisualAcuityBatch` alike. It is
+    kept in a context variable, so `set()` and `use()` only affect the
+    current thread or asyncio task, and tasks it starts afterwards. Other
+    threads, and concurrent server requests, keep their own mode.
+
+    Examples:
+        Typical use:
+        >>> VisualAcuity("6/9").decimal
+        0.6666666666666666
+        >>> with numeric_backend.use("fraction"):
+        ...     VisualAcuity("6/9").decimal
+        Fraction(2, 3)
+        >>> numeric_backend.set("decimal", places=2)
+        >>> VisualAcuity("6/9").logmar
+        Decimal('-0.18')
+    """
+
+    modes = ("float", "decimal", "fraction")
+
+    def __init__(self) -> None:
+        """Start in float mode."""
+        self._setting: ContextVar[_Setting] = ContextVar(
+            "numeric_backend", default=self._make("float", DEFAULT_PLACES)
+        )
+
+    @staticmethod
+    def _make(mode: NumericMode, places: int) -> _Setting:
+        """Build the setting of a mode."""
+        return _Setting(mode, places, *_FUNCTIONS[mode])
+
+    @property
+    def mode(self) -> NumericMode:
+        """Give the mode of the current context."""
+        return self._setting.get().mode
+
+    @property
+    def places(self) -> int:
+        """Give the decimal places of the current context."""
+        return self._setting.get().places
+
+    def decimal(self, numerator: float, denominator: float) -> Number:
+        """Give the decimal acuity in the number type of the current mode."""
+        _, places, decimal, logmar = self._setting.get()
+        return decimal(numerator, denominator, places)
+
+    def logmar(self, numerator: float, denominator: float) -> Number:
+        """Give the logMAR in the number type of the current mode."""
+        _, places, decimal, logmar = self._setting.get()
+        return logmar(numerator, denominator, places)
+
+    def set(self, mode: NumericMode, places: Optional[int] = None) -> None:
+        """Choose the number type for the current context.
+
+        Args:
+            mode (NumericMode): `"float"`, `"decimal"` or `"fraction"`.
+            places (Optional[int]): Decimal places of quantized values. Defaults to keeping the current setting.
+
+        Raises:
+            VisualAcuityError: The mode or places are not valid.
+        """
+        self._setting.set(self._check(mode, places))
+
+    def _check(self, mode: NumericMode, places: Optional[int]) -> _Setting:
+        """Give the setting of a mode, checking its arguments."""
+        if mode not in self.modes:
+            raise VisualAcuityError(
+                value=mode,
+                message="Numeric mode must be 'float', 'decimal' or 'fraction'",
+            )
+        if places is None:
+            places = self.places
+        elif places < 0:
+            raise VisualAcuityError(
+                value=places,
+                message="Decimal places must be zero or more",
+            )
+        return self._make(mode, places)
+
+    @contextmanager
+    def use(
+        self, mode: NumericMode, places: Optional[int] = None
+    ) -> Iterator[None]:
+        """Choose the number type for a block of code.
+
+        Args:
+            mode (NumericMode): `"float"`, `"decimal"` or `"fraction"`.
+            places (Optional[int]): Decimal places of quantized values.
+        """
+        token = self._setting.set(self._check(mode, places))
+        try:
+            yield
+        finally:
+            self._setting.reset(token)
+
+    def __repr__(self) -> str:
+        """Give developer representation."""
+        return (
+            f"{self.__class__.__name__}(mode={self.mode!r}, "
+            f"places={self.places})"
+        )
+
+
+numeric_backend = NumericBackend()
@@ -0,0 +1,78 @@
+"""Parser for visual acuities written as Snellen fractions."""
+
+from typing import NamedTuple
+
+from typing_extensions import Literal
+
+from optom_tools.utils.cache import ParseCache
+
+from .exceptions import VisualAcuityError
+
+
+class VaComponents(NamedTuple):
+    """Components of a parsed visual acuity."""
+
+    numerator: float
+    denominator: float
+    unit: Literal["ft", "m"] = "m"
+
+
+def default_unit(numerator: float) -> Literal["ft", "m"]:
+    """Give the unit of a test distance given without one.
+
+    Test distances greater than 6 are taken to be in feet.
+
+    Args:
+        numerator (float): The test distance.
+
+    Returns:
+        (Literal["ft", "m"]): 'ft' or 'm'.
+    """
+    return "ft" if numerator > 6 else "m"
+
+
+def parse_va(va: str) -> VaComponents:
+    """Parse a Snellen fraction such as '6/6' or '20/40'.
+
+    Note: if the test distance (numerator) is greater than 6, then the unit is assumed to be in feet.
+    A missing numerator (e.g. '/5') is taken to be 6.
+    Repeated text is served from `parse_cache` when it is enabled.
+
+    Args:
+        va (str): A visual acuity.
+
+    Returns:
+        (VaComponents): The parsed components.
+
+    Raises:
+        VisualAcuityError: The visual acuity could not be parsed.
+
+    Examples:
+        Typical use:
+        >>> parse_va("20/40")
+        VaComponents(numerator=20.0, denominator=40.0, unit='ft')
+    """
+    return parse_cache(va)
+
+
+def _parse_va(va: str) -> VaComponents:
+    """Parse a visual acuity without the cache."""
+    components = va.split("/")
+    if len(components) != 2:
+        raise VisualAcuityError(
+            value=va,
+            message="Input must contain one '/' and numbers (e.g. '6/6')",
+        )
+    try:
+        numerator = float(components[0]) if components[0].strip() else 6.0
+        denominator = float(components[1])
+    except ValueError:
+        raise VisualAcuityError(
+            value=va,
+            message="Input must contain one '/' and numbers (e.g. '6/6')",
+        )
+    return VaComponents(numerator, denominator, default_unit(numerator))
+
+
+parse_cache = ParseCache(_parse_va)
+"""Opt-in cache for `parse_va()`, e.g. `parse_cache.enable(maxsize=256)`."""
@@ -0,0 +1,12 @@
+"""Rules shared by the visual acuity validators and bulk validation."""
+
+from optom_tools.utils.rules import Rule
+
+DISTANCE = Rule(
+    message="Distance must be a positive value",
+    invalid=lambda distance: distance < 0,
+)
+
+# The rule of each `VisualAcuityBatch` column, in the order `VisualAcuity`
+# validates its fields.
+BATCH_RULES = (("numerator", DISTANCE), ("denominator", DISTANCE))
@@ -0,0 +1,217 @@
+"""Letter by letter scoring of logMAR charts such as the ETDRS chart."""
+
+from typing import Iterable, NamedTuple, Sequence, Union
+
+import numpy as np
+from typing_extensions import Literal
+
+from .batch import VisualAcuityBatch
+from .exceptions import VisualAcuityError
+from .visual_acuity import VisualAcuity
+
+# Removes floating point noise from summing letters, e.g. a logMAR of
+# -0.30000000000000004 becomes -0.3.
+ROUND_PLACES = 10
+
+ArrayLike = Union[np.ndarray, Sequence[Sequence[int]]]
+StartLine = Union[int, np.ndarray, Sequence[int]]
+
+
+class LetterScore(NamedTuple):
+    """Score of one chart reading.
+
+    `logmar` has the same sign as `VisualAcuity.logmar`, so worse acuity is
+    negative.
+    """
+
+    letters: int
+    logmar: float
+    distance: float
+    unit: Literal["ft", "m"]
+
+    @property
+    def etdrs_score(self) -> float:
+        """ETDRS letter score, 85 at 6/6 (20/20) and 100 at 6/3 (20/10)."""
+        return round(85 + 50 * self.logmar, ROUND_PLACES)
+
+    def to_visual_acuity(self) -> VisualAcuity:
+        """Give the score as a Snellen fraction at the test distance.
+
+        Returns:
+            (VisualAcuity): Visual acuity with the same logMAR.
+        """
+        return VisualAcuity(
+            numerator=self.distance,
+            denominator=self.distance / 10**self.logmar,
+            unit=self.unit,
+        )
+
+
+class LetterScores(NamedTuple):
+    """Scores of many chart readings, one row each. See `LetterScore`."""
+
+    letters: np.ndarray
+    logmar: np.ndarray
+    distance: float
+    unit: Literal["ft", "m"]
+
+    @property
+    def etdrs_score(self) -> np.ndarray:
+        """ETDRS letter scores, see `LetterScore.etdrs_score`."""
+        return np.round(85 + 50 * self.logmar, ROUND_PLACES)
+
+    def to_batch(self) -> VisualAcuityBatch:
+        """Give the scores as Snellen fractions at the test distance.
+
+        Returns:
+            (VisualAcuityBatch): Visual acuities with the same logMAR.
+        """
+        return VisualAcuityBatch.from_logmar(
+            self.logmar, numerator=self.distance, unit=self.unit
+        )
+
+
+class LetterChart(NamedTuple):
+    """A logMAR chart with the same number of letters on every line.
+
+    Letters are scored one by one, each worth `line_step / letters_per_line`
+    logMAR. Lines above the starting line are credited as read.
+
+    Args:
+        top_logmar (float): logMAR of the top line at the test distance, with the sign of `VisualAcuity.logmar`. Defaults to -1 (20/200).
+        lines (int): Number of lines. Defaults to 14.
+        letters_per_line (int): Defaults to 5.
+        line_step (float): logMAR between lines. Defaults to 0.1.
+        distance (float): Test distance. Defaults to 4.
+        unit (Literal["ft", "m"]): Unit of the test distance. Defaults to 'm'.
+
+    Examples:
+        Reading the top 7 lines and 3 letters of the next:
+        >>> score = ETDRS.score_lines([5, 5, 5, 5, 5, 5, 5, 3])
+        >>> score.letters, score.logmar, score.etdrs_score
+        (38, -0.34, 68.0)
+
+        Starting on the fifth line of a chart tested at 1m:
+        >>> chart = ETDRS._replace(top_logmar=-1.6, distance=1)
+        >>> chart.score_lines([5, 2], start_line=4).logmar
+        -1.16
+    """
+
+    top_logmar: float = -1.0
+    lines: int = 14
+    letters_per_line: int = 5
+    line_step: float = 0.1
+    distance: float = 4
+    unit: Literal["ft", "m"] = "m"
+
+    @property
+    def letter_step(self) -> float:
+        """logMAR of one letter."""
+        return self.line_step / self.letters_per_line
+
+    def _check_start_line(self, start_line: int, read_lines: int) -> None:
+        """Check the lines read are on the chart."""
+        if start_line < 0 or start_line + read_lines > self.lines:
+            raise VisualAcuityError(
+                value=(start_line, read_lines),
+                message=f"Lines read must be within the {self.lines} lines of the chart",
+            )
+
+    def score_lines(
+        self, letters: Sequence[int], start_line: int = 0
+    ) -> LetterScore:
+        """Score the letters read on each line.
+
+        Args:
+            letters (Sequence[int]): Letters read on each line, from the starting line down.
+            start_line (int): Line the reading started on, 0 being the top line. Defaults to 0.
+
+        Returns:
+            (LetterScore): The score.
+
+        Raises:
+            VisualAcuityError: A count or line is not on the chart.
+        """
+        self._check_start_line(start_line, len(letters))
+        for count in letters:
+            if not 0 <= count <= self.letters_per_line:
+                raise VisualAcuityError(
+                    value=count,
+                    message=f"Letters read on a line must be from 0 to {self.letters_per_line}",
+                )
+        total = start_line * self.letters_per_line + sum(letters)
+        logmar = round(
+            self.top_logmar
+            + (total - self.letters_per_line) * self.letter_step,
+            ROUND_PLACES,
+        )
+        return LetterScore(total, logmar, self.distance, self.unit)
+
+    def score_letters(
+        self, correct: Iterable[bool], start_line: int = 0
+    ) -> LetterScore:
+        """Score letters marked correct or incorrect in reading order.
+
+        Args:
+            correct (Iterable[bool]): Whether each letter was read, from the first letter of the starting line on. Reading may stop part way through a line.
+            start_line (int): Line the reading started on, 0 being the top line. Defaults to 0.
+
+        Returns:
+            (LetterScore): The score.
+
+        Raises:
+            VisualAcuityError: More letters than there are on the chart.
+        """
+        marks = list(correct)
+        size = self.letters_per_line
+        letters = [
+            sum(bool(mark) for mark in marks[i : i + size])
+            for i in range(0, len(marks), size)
+        ]
+        return self.score_lines(letters, start_line)
+
+    def score_table(
+        self, letters: ArrayLike, start_line: StartLine = 0
+    ) -> LetterScores:
+        """Score a table of readings at once, one row per visit.
+
+        Gives the same scores as `score_lines()` for every row.
+
+        Args:
+            letters (ArrayLike): Letters read, one row per visit and one column per line from the starting line down.
+            start_line (StartLine): Line each reading started on, for all rows or row by row. Defaults to 0.
+
+        Returns:
+            (LetterScores): The scores.
+
+        Raises:
+            VisualAcuityError: A count or line is not on the chart.
+        """
+        table = np.asarray(letters)
+        if table.ndim != 2:
+            raise VisualAcuityError(
+                value=table.shape,
+                message="Letters must be a table of visits by lines",
+            )
+        start = np.broadcast_to(np.asarray(start_line), table.shape[:1])
+        if len(start):
+            self._check_start_line(int(start.min()), 0)
+            self._check_start_line(int(start.max()), table.shape[1])
+        invalid = (table < 0) | (table > self.letters_per_line)
+        if invalid.any():
+            raise VisualAcuityError(
+                value=table[invalid][0].item(),
+                message=f"Letters read on a line must be from 0 to {self.letters_per_line}",
+            )
+        total = start * self.letters_per_line + table.sum(axis=1)
+        logmar = np.round(
+            self.top_logmar
+            + (total - self.letters_per_line) * self.letter_step,
+            ROUND_PLACES,
+        )
+        return LetterScores(
+            total.astype(np.int64), logmar, self.distance, self.unit
+        )
+
+
+ETDRS = LetterChart()
@@ -1,22 +1,44 @@
 """Main Visual Acuity class for module."""
 
 import math
-from decimal import Decimal
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
 
 import pydantic
 from typing_extensions import Literal
 
 from optom_tools.utils import strip_decimal
-
+from optom_tools.utils.instrument import instrumentation
+
+from .chart import (
+    FT_DISTANCE,
+    KNOWN_FRACTIONS,
+    M_DISTANCE,
+    ChartLine,
+    nearest_line,
+)
 from .exceptions import VisualAcuityError
 from .models import BaseModel
+from .numeric import Number, numeric_backend
+from .parser import VaComponents, parse_va
+from .rules import DISTANCE
 
-D = Decimal
+if TYPE_CHECKING:
+    from .frozen import FrozenVisualAcuity
 
 FT_M = 0.3048  # 1 ft = 0.3048 m
 
 
+class _Derived(NamedTuple):
+    """Values derived from a fraction, computed once for chart lines."""
+
+    ft: str
+    m: str
+
+
+# Keyed by numerator, denominator and unit, filled in by `_precompute()`.
+_DERIVED: Dict[Tuple[float, float, str], _Derived] = {}
+
+
 class VisualAcuity(BaseModel):
     """The `visual_acuity` module contains methods in handling visual acuity measurements.
 
@@ -61,11 +83,7 @@ class VisualAcuity(BaseModel):
 
         Numerator must be a positive number.
         """
-        if value < 0:
-            raise VisualAcuityError(
-                value=value, message="Distance must be a positive value"
-            )
-        return value
+        return DISTANCE.check(value, VisualAcuityError)
 
     @pydantic.validator("denominator")
     @classmethod
@@ -74,11 +92,7 @@ class VisualAcuity(BaseModel):
 
         Denominator must be a positive number.
         """
-        if value < 0:
-            raise VisualAcuityError(
-                value=value, message="Distance must be a positive value"
-            )
-        return value
+        return DISTANCE.check(value, VisualAcuityError)
 
     def __init__(self, *args, **kwargs):
         """Init method."""
@@ -151,6 +165,9 @@ class VisualAcuity(BaseModel):
             >>> va.ft
             '20/20'
         """
+        derived = _DERIVED.get((self.numerator, self.denominator, self.unit))
+        if derived is not None:
+            return derived.ft
         numerator = self.numerator
         denominator = self.denominator
         if self.unit != "ft":
@@ -171,6 +188,9 @@ class VisualAcuity(BaseModel):
             >>> va.m
             '6/6'
         """
+        derived = _DERIVED.get((self.numerator, self.denominator, self.unit))
+        if derived is not None:
+            return derived.m
         numerator = self.numerator
         denominator = self.denominator
         if self.unit != "m":
@@ -193,52 +213,87 @@ class VisualAcuity(BaseModel):
         return f"{strip_decimal(self.numerator)}/{strip_decimal(self.denominator)}"
 
     @property
-    def decimal(self) -> Decimal:
+    def decimal(self) -> Number:
         """Return decimal form of visual acuity.
 
+        The number type is set by `numeric_backend`, float by default.
+
         Returns:
-            Decimal: Decimal form of visual acuity.
+            Number: Decimal form of visual acuity.
 
         Examples:
             Typical use:
             >>> VisualAcuity("6/12").decimal
             0.5
         """
-        return D(self.numerator / self.denominator)
+        return numeric_backend.decimal(self.numerator, self.denominator)
 
     @property
-    def logmar(self) -> Decimal:
+    def logmar(self) -> Number:
         """Return logmar value of the visual acuity.
 
+        The number type is set by `numeric_backend`, float by default.
+
         Returns:
-            Decimal: Logmar value of the visual acuity.
+            Number: Logmar value of the visual acuity.
 
         Examples:
             Typical use:
             >>> VisualAcuity("6/6").logmar
             0.0
         """
-        return D(math.log10(self.decimal))
+        return numeric_backend.logmar(self.numerator, self.denominator)
+
+    @property
+    def chart_line(self) -> ChartLine:
+        """Return the chart line of the visual acuity.
+
+        Known fractions (see `chart_line()`) are looked up directly, any
+        other fraction gives the line with the nearest logMAR value.
+
+        Returns:
+            ChartLine: The line on a logMAR chart.
+
+        Examples:
+            Typical use:
+            >>> VisualAcuity("6/10.5").chart_line.m
+            '6/9.5'
+        """
+        line = KNOWN_FRACTIONS.get((self.numerator, self.denominator))
+        if line is None:
+            line = nearest_line(math.log10(self.numerator / self.denominator))
+        return line
+
+    def snap_to_chart(self) -> None:
+        """Round the visual acuity to the nearest chart line.
 
-    def _simple_parse_va(self, va: str) -> Tuple[str, str, Literal["ft", "m"]]:
+        The unit is kept, with a test distance of 6m or 20ft.
+
+        Examples:
+            Typical use:
+            >>> va = VisualAcuity("6/10.5")
+            >>> va.snap_to_chart()
+            >>> str(va)
+            '6/9.5'
+            >>> va = VisualAcuity("20/35")
+            >>> va.snap_to_chart()
+            >>> str(va)
+            '20/32'
+        """
+        line = self.chart_line
+        if self.unit == "ft":
+            self.numerator = FT_DISTANCE
+            self.denominator = line.ft_denominator
+        else:
+            self.numerator = M_DISTANCE
+            self.denominator = line.m_denominator
+
+    def _simple_parse_va(self, va: str) -> VaComponents:
         """Parse va string into a tuple.
 
-        This tuple is numerator, denominator, unit.
+        This tuple is numerator, denominator, unit. See `parse_va()`.
         """
-        components = va.split("/")
-        if len(components) != 2:
-            raise VisualAcuityError(
-                value=va,
-                message="Input must contain one '/' and numbers (e.g. '6/6')",
-            )
-        numerator = components[0]
-        denominator = components[1]
-        unit: Literal["ft", "m"] = "m"
-        if numerator == "":
-            numerator = "6"
-        if float(numerator) > 6:
-            unit = "ft"
-        return (numerator, denominator, unit)
+        return parse_va(va)
 
     def parse(self, va: str) -> BaseModel:
         """Parse a string into a visual acuity.
@@ -268,6 +323,42 @@ class VisualAcuity(BaseModel):
 
         return self
 
+    def freeze(self) -> "FrozenVisualAcuity":
+        """Give the shared, immutable copy of the visual acuity.
+
+        Returns:
+            (FrozenVisualAcuity): The interned frozen visual acuity.
+
+        Examples:
+            Typical use:
+            >>> VisualAcuity("6/6").freeze() is VisualAcuity("6/6").freeze()
+            True
+        """
+        from .frozen import FrozenVisualAcuity
+
+        return FrozenVisualAcuity(**self.dict())
+
     def __str__(self) -> str:
         """Give string representation."""
         return self.snellen_fraction
+
+
+def _precompute() -> None:
+    """Compute the derived values of every known fraction once."""
+    for numerator, denominator in KNOWN_FRACTIONS:
+        for unit in ("ft", "m"):
+            va = VisualAcuity.from_trusted(
+                numerator=float(numerator),
+                denominator=float(denominator),
+                unit=unit,
+            )
+            _DERIVED[numerator, denominator, unit] = _Derived(va.ft, va.m)
+
+
+_precompute()
+
+instrumentation.register(VisualAcuity, "_simple_parse_va", "va.parse")
+instrumentation.register(VisualAcuity, "convert_unit", "va.convert_unit")
+instrumentation.register(VisualAcuity, "logmar", "va.logmar")
+instrumentation.register(VisualAcuity, "__str__", "va.str")
+instrumentation.register_validators(VisualAcuity, "va.validate")
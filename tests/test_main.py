@@ -1 +1,171 @@
 """Test for project."""
+
+import io
+import subprocess
+import sys
+
+import pytest
+
+import optom_tools
+from optom_tools.main import main
+
+
+class TestImport:
+    """Test importing the package."""
+
+    def test_import_is_lazy(self):
+        """Test importing the package loads no heavy modules or logging."""
+        code = (
+            "import logging, sys, optom_tools\n"
+            "assert not logging.getLogger().handlers\n"
+            "heavy = {'numpy', 'pydantic', 'rich'} & set(sys.modules)\n"
+            "assert not heavy, heavy\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            pytest.param("Prescription", id="Prescription"),
+            pytest.param("PrescriptionBatch", id="PrescriptionBatch"),
+            pytest.param("VisualAcuity", id="VisualAcuity"),
+            pytest.param("VisualAcuityBatch", id="VisualAcuityBatch"),
+        ],
+    )
+    def test_exports(self, name):
+        """Test lazy exports resolve and are listed."""
+        assert getattr(optom_tools, name).__name__ == name
+        assert name in dir(optom_tools)
+
+    def test_missing_attribute(self):
+        """Test unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            optom_tools.NotAThing
+
+
+class TestCommandLine:
+    """Test `python -m optom_tools`."""
+
+    def run(self, monkeypatch, capsys, argv, stdin=""):
+        """Run main() with `stdin`, giving the exit status and output."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+        status = main(argv)
+        captured = capsys.readouterr()
+        return status, captured.out, captured.err
+
+    @pytest.mark.parametrize(
+        "argv,stdin,expected",
+        [
+            pytest.param(
+                ["rx", "--transpose"],
+                "+1.00/-1.00x90\n\n-2.00/+1.00x10\n",
+                "rx\nplano / +1.00 x 180\n-1.00 / -1.00 x 100\n",
+                id="Transpose",
+            ),
+            pytest.param(
+                ["rx", "--transpose", "n"],
+                "+1.00/-1.00x90\n-2.00/+1.00x10\n",
+                "rx\n+1.00 / -1.00 x 90\n-1.00 / -1.00 x 100\n",
+                id="Transpose to negative cylinder",
+            ),
+            pytest.param(
+                ["rx", "--vertex", "0", "--round-to", "0.25"],
+                "-8.00/-2.00x180\n",
+                "rx\n-7.25 / -1.75 x 180\n",
+                id="Vertex compensate",
+            ),
+            pytest.param(
+                ["va", "--unit", "ft", "--output", "jsonl"],
+                "6/6\n6/12\n",
+                '{"va": "20/20"}\n{"va": "20/39"}\n',
+                id="Convert unit",
+            ),
+            pytest.param(
+                ["va", "--snap", "--logmar"],
+                "6/10.5\n",
+                "va,logmar\n6/9.5,-0.19957235490520414\n",
+                id="Snap and logMAR",
+            ),
+        ],
+    )
+    def test_stdin(self, monkeypatch, capsys, argv, stdin, expected):
+        """Test converting lines from stdin."""
+        status, out, _ = self.run(monkeypatch, capsys, argv, stdin)
+        assert status == 0
+        assert out == expected
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_files(self, monkeypatch, capsys, tmp_path, workers):
+        """Test converting files, skipping bad rows and reporting stats."""
+        export = tmp_path / "export.csv"
+        export.write_text("id,Rx\n1,+1.00/-1.00x90\n2,oops\n3,plano\n")
+        visits = tmp_path / "visits.txt"
+        visits.write_text("-2.00 DS\n")
+        argv = ["rx", str(export), str(visits), "--column", "Rx"]
+        status, out, err = self.run(
+            monkeypatch,
+            capsys,
+            argv + ["--on-error", "skip", "--workers", str(workers)],
+        )
+        assert status == 0
+        assert out == "rx\n+1.00 / -1.00 x 90\nplano\n-2.00 DS\n"
+        status, out, err = self.run(
+            monkeypatch,
+            capsys,
+            ["rx", str(visits), "--format", "text", "--stats"],
+        )
+        assert status == 0
+        assert err.startswith("1 rows, 0 skipped in ")
+
+    def test_bad_row(self, monkeypatch, capsys):
+        """Test a bad row stops the conversion with exit status 1."""
+        status, _, err = self.run(monkeypatch, capsys, ["va"], "6/6\nbad\n")
+        assert status == 1
+        assert err.startswith("optom_tools: error: Line 2: ")
+
+    def test_stdin_skipped_stats(self, monkeypatch, capsys):
+        """Test skipped rows are counted when no row of a chunk is good."""
+        status, out, err = self.run(
+            monkeypatch,
+            capsys,
+            ["rx", "--on-error", "skip", "--stats"],
+            "bad\nworse\n",
+        )
+        assert status == 0
+        assert out == "rx\n"
+        assert err.startswith("0 rows, 2 skipped in ")
+
+    def test_missing_file(self, monkeypatch, capsys, tmp_path):
+        """Test a file that cannot be read gives exit status 1."""
+        status, _, err = self.run(
+            monkeypatch, capsys, ["rx", str(tmp_path / "missing.csv")]
+        )
+        assert status == 1
+        assert err.startswith("optom_tools: error: [Errno 2] ")
+
+    def test_round_to_needs_vertex(self, monkeypatch, capsys):
+        """Test --round-to is refused without --vertex."""
+        with pytest.raises(SystemExit) as excinfo:
+            self.run(monkeypatch, capsys, ["rx", "--round-to", "0.25"])
+        assert excinfo.value.code == 2
+
+    def test_serve_error(self, monkeypatch, capsys):
+        """Test a bad server setting gives exit status 1."""
+        status, _, err = self.run(
+            monkeypatch, capsys, ["serve", "--max-batch-size", "0"]
+        )
+        assert status == 1
+        assert err == (
+            "optom_tools: error: max_batch_size must be at least 1\n"
+        )
+
+    def test_module(self):
+        """Test running the package as a module."""
+        result = subprocess.run(
+            [sys.executable, "-m", "optom_tools", "va", "--logmar"],
+            input="6/60\n",
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout == "va,logmar\n6/60,-1.0\n"
@@ -0,0 +1,156 @@
+"""Testing for the parallel execution layer."""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from optom_tools import PrescriptionBatch, VisualAcuityBatch
+from optom_tools.parallel import ParallelError, map_records, split_byte_ranges
+from optom_tools.reader import (
+    PrescriptionReader,
+    ReaderError,
+    VisualAcuityReader,
+)
+
+RX = ["+1.00/-1.00x90", "plano", "-2.25/-0.75x175 Add +2.00@40", "+0.50 DS"]
+
+
+def _transpose(batch):
+    """Transpose a batch to negative cylinder in a worker."""
+    batch.transpose("n")
+    return batch
+
+
+@pytest.fixture
+def rx_csv(tmp_path):
+    """Provide a CSV export of prescriptions."""
+    path = tmp_path / "export.csv"
+    rows = [f"{i},{RX[i % len(RX)]}" for i in range(500)]
+    path.write_text("id,rx\n" + "\n".join(rows) + "\n")
+    return path
+
+
+class TestMapRecords:
+    """Parallel map testing."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_reader(self, rx_csv, workers):
+        """Test results are merged in file order."""
+        chunks = list(map_records(rx_csv, chunk_bytes=97, workers=workers))
+        assert [chunk.number for chunk in chunks] == list(range(len(chunks)))
+        batch = PrescriptionBatch.concatenate(chunk.result for chunk in chunks)
+        expected = PrescriptionBatch.concatenate(PrescriptionReader(rx_csv))
+        for column in expected.columns:
+            np.testing.assert_array_equal(
+                getattr(batch, column), getattr(expected, column)
+            )
+
+    def test_bounded_window(self, rx_csv, monkeypatch):
+        """Test only two chunks per worker are in flight at a time."""
+        submitted = []
+
+        class Recording(ProcessPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args[1].number)
+                return super().submit(*args, **kwargs)
+
+        monkeypatch.setattr(
+            "optom_tools.parallel.parallel.ProcessPoolExecutor", Recording
+        )
+        chunks = map_records(rx_csv, chunk_bytes=97, workers=2)
+        assert next(chunks).number == 0
+        assert submitted == [0, 1, 2, 3]
+        assert next(chunks).number == 1
+        assert submitted == [0, 1, 2, 3, 4]
+        numbers = [chunk.number for chunk in chunks]
+        assert submitted == list(range(len(numbers) + 2))
+
+    def test_func(self, rx_csv):
+        """Test a function is applied to each chunk."""
+        batch = PrescriptionBatch.concatenate(
+            chunk.result
+            for chunk in map_records(
+                rx_csv, _transpose, chunk_bytes=200, workers=2
+            )
+        )
+        assert (batch.cylinder <= 0).all()
+        assert len(batch) == 500
+
+    def test_validate_collect(self, tmp_path):
+        """Test validation errors are collected per chunk."""
+        path = tmp_path / "visits.jsonl"
+        rows = [{"va": "6/6"}, {"va": "6/-6"}, {"va": "20/40"}]
+        path.write_text("\n".join(json.dumps(row) for row in rows))
+        chunks = list(
+            map_records(
+                path,
+                reader=VisualAcuityReader,
+                validate=True,
+                on_error="collect",
+                workers=1,
+            )
+        )
+        batch = VisualAcuityBatch.concatenate(chunk.result for chunk in chunks)
+        assert batch.to_strings().tolist() == ["6/6", "20/40"]
+        assert [
+            error.message for chunk in chunks for error in chunk.errors
+        ] == ["Distance must be a positive value"]
+
+    def test_raise(self, tmp_path):
+        """Test errors in workers reach the caller."""
+        path = tmp_path / "export.csv"
+        path.write_text("rx\n" + "+1.00\n" * 50 + "oops\n")
+        with pytest.raises(ReaderError) as excinfo:
+            list(map_records(path, chunk_bytes=64, workers=2))
+        assert excinfo.value.value.message == "Unable to parse prescription"
+        assert excinfo.value.message.startswith("Line 52: ")
+
+    @pytest.mark.parametrize(
+        "fmt,header,expected_lines",
+        [
+            pytest.param("csv", "rx\n", [9, 152, 301], id="csv"),
+            pytest.param("text", "", [8, 151, 300], id="text"),
+        ],
+    )
+    def test_error_lines(self, tmp_path, fmt, header, expected_lines):
+        """Test error lines count from the start of the file."""
+        path = tmp_path / "export"
+        rows = ["+1.00"] * 300
+        rows[7] = rows[150] = rows[299] = "oops"
+        path.write_text(header + "\n".join(rows) + "\n")
+        reader = PrescriptionReader(path, fmt=fmt, on_error="collect")
+        list(reader)
+        chunks = map_records(
+            path, chunk_bytes=61, workers=1, fmt=fmt, on_error="collect"
+        )
+        errors = [error for chunk in chunks for error in chunk.errors]
+        assert errors == reader.errors
+        assert [error.line for error in errors] == expected_lines
+
+    @pytest.mark.parametrize(
+        "kwargs,exception_message",
+        [
+            pytest.param(
+                {"workers": 0}, "workers must be at least 1", id="workers"
+            ),
+            pytest.param(
+                {"chunk_bytes": 0},
+                "chunk_bytes must be at least 1",
+                id="chunk_bytes",
+            ),
+        ],
+    )
+    def test_configuration_errors(self, rx_csv, kwargs, exception_message):
+        """Test configuration errors are raised straight away."""
+        with pytest.raises(ParallelError) as excinfo:
+            map_records(rx_csv, **kwargs)
+        assert excinfo.value.message == exception_message
+
+    def test_split_byte_ranges(self, rx_csv):
+        """Test byte ranges cover the file."""
+        ranges = split_byte_ranges(str(rx_csv), 1000, start=6)
+        assert ranges[0][0] == 6
+        assert ranges[-1][1] == rx_csv.stat().st_size
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
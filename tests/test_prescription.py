@@ -189,6 +189,19 @@ class TestPrescription:
                 None,
                 id="plano",
             ),
+            pytest.param(
+                "-2.00/-0.50x10 Add +2.00@33 2 BU",
+                Prescription(
+                    sphere=-2,
+                    cylinder=-0.5,
+                    axis=10,
+                    add={"add": 2, "working_distance_cm": 33},
+                    vertical_prism={"magnitude": 2, "direction": "U"},
+                ),
+                does_not_raise(),
+                None,
+                id="Add and prism",
+            ),
             pytest.param(
                 "plano/-1.00x90/",
                 Prescription(sphere=0, cylinder=-1, axis=90),
@@ -231,3 +244,141 @@ class TestPrescription:
         assert rx.vertical_prism.direction == "U"
         assert rx.horizontal_prism.magnitude == 5.0
         assert rx.horizontal_prism.direction == "I"
+
+    def test_shared_defaults(self):
+        """Test default sub-models are shared and copied on write."""
+        rx, other = Prescription(), Prescription(sphere=1)
+        assert rx.add.__dict__ is other.add.__dict__
+        assert rx.add.is_shared_default
+        rx.add.add = 2
+        assert not rx.add.is_shared_default
+        assert (rx.add.add, other.add.add) == (2, 0)
+        assert other.add.is_shared_default
+        with pytest.raises(PrescriptionError):
+            other.add.add = -1
+        assert other.add.add == 0
+        assert Prescription().add.is_shared_default
+        with pytest.raises(PrescriptionError):
+            Prescription.__fields__["add"].default.add = 2
+        rx.add.description = "Music"
+        assert rx.add.description == "Music"
+        rx.add = {"add": 3}
+        assert rx.add.add == 3
+        copied = rx.copy(deep=True)
+        assert copied.horizontal_prism.__dict__ is (
+            other.horizontal_prism.__dict__
+        )
+
+    def test_shared_default_references(self):
+        """Test changes through a kept reference reach only its model."""
+        first, second = Prescription(), Prescription()
+        add = first.add
+        assert second.add.add == 0
+        add.add = 2
+        assert (first.add.add, second.add.add) == (2, 0)
+        prism = second.vertical_prism
+        assert first.vertical_prism.magnitude == prism.magnitude == 0
+        prism.magnitude = 1
+        assert first.vertical_prism.magnitude == 0
+        assert second.vertical_prism.magnitude == 1
+        assert Prescription().vertical_prism.magnitude == 0
+
+    @pytest.mark.parametrize(
+        "test_input, expected",
+        [
+            pytest.param(
+                "+1.00/-1.00x90", (0.5, -0.5, 0), id="Against the rule"
+            ),
+            pytest.param("pl/-2.00x45", (-1, 0, 1), id="Oblique"),
+            pytest.param(
+                "-2.00/+1.00x180", (-1.5, -0.5, 0), id="Positive cylinder"
+            ),
+            pytest.param("+3.00 DS", (3, 0, 0), id="Sphere"),
+        ],
+    )
+    def test_power_vector(self, test_input, expected):
+        """Test conversion to and from power vectors."""
+        rx = Prescription(test_input)
+        assert rx.power_vector == pytest.approx(expected)
+        assert rx.power_vector.m == rx.mean_sphere
+        back = Prescription.from_power_vector(rx.power_vector)
+        rx.transpose("n")
+        assert (back.sphere, back.cylinder) == (rx.sphere, rx.cylinder)
+        if rx.cylinder:
+            assert back.axis == rx.axis
+
+    @pytest.mark.parametrize(
+        "test_input, vertex_mm, round_to, expected",
+        [
+            pytest.param(
+                "-5.00/-1.00x180",
+                0,
+                0.25,
+                "-4.75 / -0.75 x 180",
+                id="Myope to contact lens",
+            ),
+            pytest.param(
+                "+8.00/+2.00x90",
+                0,
+                0.25,
+                "+8.75 / +2.50 x 90",
+                id="Hyperope to contact lens",
+            ),
+            pytest.param("-4.00 DS", 0, None, "-3.82 DS", id="Unrounded"),
+            pytest.param("-4.00 DS", 12, None, "-4.00 DS", id="Same vertex"),
+        ],
+    )
+    def test_vertex_compensate(
+        self, test_input, vertex_mm, round_to, expected
+    ):
+        """Test vertex compensation of each meridian."""
+        rx = Prescription(test_input)
+        rx.vertex_compensate(vertex_mm, round_to=round_to)
+        assert str(rx) == expected
+        assert rx.back_vertex_mm == vertex_mm
+
+    def test_vertex_compensate_round_trip(self):
+        """Test moving a prescription away and back."""
+        rx = Prescription("-7.00/-2.50x35")
+        rx.vertex_compensate(0)
+        rx.vertex_compensate(12)
+        assert rx.sphere == pytest.approx(-7)
+        assert rx.cylinder == pytest.approx(-2.5)
+        with pytest.raises(PrescriptionError) as excinfo:
+            rx.vertex_compensate(0, round_to=0)
+        assert excinfo.value.message == "round_to must be a positive number"
+
+    @pytest.mark.parametrize(
+        "first,second,equivalent",
+        [
+            pytest.param(
+                "+1.00/-1.00x180", "plano/+1.00x90", True, id="Transposed"
+            ),
+            pytest.param(
+                "+1.00/-1.00x180", "+1.00/-1.00x0", True, id="Axis 0 and 180"
+            ),
+            pytest.param("+1.00 DS", "+1.00/-0.00x45", True, id="No cylinder"),
+            pytest.param(
+                "-2.00/-0.75x45", "-2.05/-0.70x45.4", True, id="Rounded"
+            ),
+            pytest.param(
+                "-2.00/-0.75x45 add +2.00",
+                "-2.00/-0.75x45 add +2.50",
+                False,
+                id="Different add",
+            ),
+            pytest.param(
+                "-2.00/-0.75x45", "-2.00/-0.75x135", False, id="Other axis"
+            ),
+        ],
+    )
+    def test_canonical(self, first, second, equivalent):
+        """Test equivalent lenses have the same canonical key and form."""
+        a, b = Prescription(first), Prescription(second)
+        assert (a.canonical_key() == b.canonical_key()) is equivalent
+        assert (a.canonical() == b.canonical()) is equivalent
+        assert a.canonical().canonical_key() == a.canonical_key()
+        assert a.canonical().cylinder <= 0
+        with pytest.raises(PrescriptionError) as excinfo:
+            a.canonical_key(step=0)
+        assert excinfo.value.message == "step must be a positive number"
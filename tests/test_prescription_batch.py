@@ -0,0 +1,230 @@
+"""Testing for prescription batches."""
+
+from contextlib import nullcontext as does_not_raise
+
+import numpy as np
+import pytest
+
+from optom_tools import Prescription, PrescriptionBatch
+from optom_tools.prescription.exceptions import PrescriptionError
+
+PRESCRIPTIONS = [
+    Prescription(sphere=1, cylinder=-1, axis=90),
+    Prescription(sphere=1, cylinder=+0.75, axis=180),
+    Prescription(sphere=0, cylinder=-1, axis=90.5),
+    Prescription(sphere=-2.25),
+    Prescription(),
+    Prescription(sphere=1, add={"add": 1.5, "working_distance_cm": 30}),
+]
+
+
+class TestPrescriptionBatch:
+    """Prescription batch testing."""
+
+    def test_round_trip(self):
+        """Test converting to and from prescriptions."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        assert len(batch) == len(PRESCRIPTIONS)
+        assert batch.to_prescriptions() == PRESCRIPTIONS
+        assert batch[3] == PRESCRIPTIONS[3]
+        assert batch[1:3].to_prescriptions() == PRESCRIPTIONS[1:3]
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_save_and_load(self, tmp_path, mmap):
+        """Test a saved batch loads with the same values."""
+        PrescriptionBatch.from_prescriptions(PRESCRIPTIONS).save(tmp_path)
+        batch = PrescriptionBatch.load(tmp_path, mmap=mmap)
+        assert batch.to_prescriptions() == PRESCRIPTIONS
+        assert batch[5] == PRESCRIPTIONS[5]
+        assert batch[1:3].to_prescriptions() == PRESCRIPTIONS[1:3]
+        assert not (tmp_path / "vertical_prism.npy").exists()
+
+    def test_loaded_batch_changes_in_memory(self, tmp_path):
+        """Test changing a memory mapped batch leaves the files unchanged."""
+        PrescriptionBatch.from_prescriptions(PRESCRIPTIONS).save(tmp_path)
+        batch = PrescriptionBatch.load(tmp_path)
+        batch.transpose()
+        batch.vertex_compensate(0)
+        assert PrescriptionBatch.load(tmp_path).to_prescriptions() == (
+            PRESCRIPTIONS
+        )
+
+    def test_load_error(self, tmp_path):
+        """Test loading a directory without a saved prescription batch."""
+        with pytest.raises(PrescriptionError) as excinfo:
+            PrescriptionBatch.load(tmp_path)
+        assert excinfo.value.message == "No saved batch found in directory"
+
+    def test_empty(self):
+        """Test an empty batch."""
+        batch = PrescriptionBatch.from_prescriptions([])
+        assert len(batch) == 0
+        assert batch.to_strings().tolist() == []
+
+    @pytest.mark.parametrize("flag", [None, "n", "p"])
+    def test_transpose(self, flag):
+        """Test transpose() matches the scalar method."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        batch.transpose(flag)
+        expected = [rx.copy(deep=True) for rx in PRESCRIPTIONS]
+        for rx in expected:
+            rx.transpose(flag)
+        assert batch.to_prescriptions() == expected
+
+    def test_transpose_flag_error(self):
+        """Test transpose() rejects unknown flags."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        with pytest.raises(PrescriptionError) as excinfo:
+            batch.transpose("wrong flag")
+        assert (
+            excinfo.value.message
+            == "Method transpose() only accepts 'n' and 'p' as input flags"
+        )
+
+    def test_mean_sphere(self):
+        """Test mean_sphere property."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        np.testing.assert_array_equal(
+            batch.mean_sphere, [rx.mean_sphere for rx in PRESCRIPTIONS]
+        )
+
+    def test_to_strings(self):
+        """Test string representation matches the scalar model."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        expected = [str(rx) for rx in PRESCRIPTIONS]
+        assert batch.to_strings().tolist() == expected
+        assert str(batch) == "\n".join(expected)
+
+    @pytest.mark.parametrize(
+        "prescriptions",
+        [
+            pytest.param(PRESCRIPTIONS, id="Fractional axis"),
+            pytest.param(PRESCRIPTIONS[:2], id="Whole degree axes"),
+        ],
+    )
+    def test_power_vectors(self, prescriptions):
+        """Test power vectors match the scalar model and convert back."""
+        batch = PrescriptionBatch.from_prescriptions(prescriptions)
+        np.testing.assert_array_equal(
+            batch.power_vectors, [rx.power_vector for rx in prescriptions]
+        )
+        np.testing.assert_allclose(
+            batch.blur_strength,
+            [rx.power_vector.blur_strength for rx in prescriptions],
+        )
+        back = PrescriptionBatch.from_power_vectors(batch.power_vectors)
+        batch.transpose("n")
+        np.testing.assert_array_equal(back.sphere, batch.sphere)
+        np.testing.assert_array_equal(back.cylinder, batch.cylinder)
+
+    def test_add_and_subtract(self):
+        """Test sphero-cylinder arithmetic."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        over_refraction = Prescription(sphere=0.5, cylinder=-0.5, axis=90)
+        total = batch + over_refraction
+        assert (over_refraction + batch).to_prescriptions() == (
+            total.to_prescriptions()
+        )
+        np.testing.assert_array_equal(total.add, batch.add)
+        np.testing.assert_allclose(
+            (total - over_refraction).mean_sphere, batch.mean_sphere
+        )
+        np.testing.assert_allclose(
+            (total - batch).power_vectors,
+            np.tile(over_refraction.power_vector, (len(batch), 1)),
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            batch.distance(batch + over_refraction),
+            over_refraction.power_vector.blur_strength,
+        )
+        with pytest.raises(PrescriptionError) as excinfo:
+            batch - batch[:2]
+        assert excinfo.value.message == "Batches must have the same length"
+
+    @pytest.mark.parametrize("round_to", [None, 0.25])
+    def test_vertex_compensate(self, round_to):
+        """Test vertex_compensate() matches the scalar method."""
+        prescriptions = PRESCRIPTIONS + [
+            Prescription("-8.00/-1.75x20", back_vertex_mm=14)
+        ]
+        batch = PrescriptionBatch.from_prescriptions(prescriptions)
+        batch.vertex_compensate(0, round_to=round_to)
+        expected = [rx.copy(deep=True) for rx in prescriptions]
+        for rx in expected:
+            rx.vertex_compensate(0, round_to=round_to)
+        assert batch.to_prescriptions() == expected
+
+    @pytest.mark.parametrize(
+        "column,value",
+        [
+            pytest.param("axis", 181, id="axis"),
+            pytest.param("axis", -1, id="negative axis"),
+            pytest.param("add", -1, id="add"),
+            pytest.param("working_distance_cm", 601, id="working distance"),
+            pytest.param("intermediate_add", -1, id="intermediate add"),
+            pytest.param(
+                "intermediate_working_distance_cm",
+                -1,
+                id="intermediate working distance",
+            ),
+            pytest.param("vertical_prism", -1, id="vertical prism"),
+            pytest.param("horizontal_prism", -1, id="horizontal prism"),
+        ],
+    )
+    def test_validate(self, column, value):
+        """Test each rule flags the same values the models reject."""
+        batch = PrescriptionBatch.from_prescriptions(PRESCRIPTIONS)
+        assert batch.validate().valid.all()
+        getattr(batch, column)[1] = value
+        report = batch.validate()
+        assert report.invalid_rows().tolist() == [1]
+        assert report.summary()[column] == 1
+        assert sum(report.summary().values()) == 1
+        with pytest.raises(PrescriptionError) as excinfo:
+            Prescription.parse_obj(batch[1].dict())
+        assert report.errors(1) == [excinfo.value.message]
+        assert len(batch[report.valid]) == len(PRESCRIPTIONS) - 1
+
+    def test_mean(self):
+        """Test averaging uses power vectors."""
+        batch = PrescriptionBatch.from_prescriptions(
+            [
+                Prescription(sphere=0, cylinder=-1, axis=10),
+                Prescription(sphere=0, cylinder=-1, axis=170),
+            ]
+        )
+        mean = batch.mean()
+        assert mean.axis == 180
+        assert mean.sphere == pytest.approx(
+            -0.5 + 0.5 * np.cos(np.radians(20))
+        )
+        assert mean.mean_sphere == pytest.approx(-0.5)
+        with pytest.raises(PrescriptionError):
+            batch[:0].mean()
+
+    @pytest.mark.parametrize(
+        "test_input,exception",
+        [
+            pytest.param(
+                {"sphere": [1, 2], "cylinder": -1},
+                does_not_raise(),
+                id="Broadcast",
+            ),
+            pytest.param(
+                {"sphere": [1, 2], "cylinder": [-1]},
+                pytest.raises(PrescriptionError),
+                id="ERROR length mismatch",
+            ),
+            pytest.param(
+                {"sphere": [[1, 2]]},
+                pytest.raises(PrescriptionError),
+                id="ERROR two dimensional",
+            ),
+        ],
+    )
+    def test_initialising_object(self, test_input, exception):
+        """Test creating a batch from columns."""
+        with exception:
+            batch = PrescriptionBatch(**test_input)
+            assert batch.cylinder.tolist() == [-1, -1]
@@ -0,0 +1,73 @@
+"""Testing the prescription generator."""
+
+import random
+
+import numpy as np
+import pytest
+
+from optom_tools import Prescription
+from optom_tools.prescription import PrescriptionGenerator
+from optom_tools.prescription.exceptions import PrescriptionError
+
+
+class TestPrescriptionGenerator:
+    """Test PrescriptionGenerator."""
+
+    def test_reproducible(self):
+        """Test the same seed gives the same batch."""
+        first = PrescriptionGenerator(seed=7).batch(100)
+        second = PrescriptionGenerator(seed=7).batch(100)
+        for name in first.columns:
+            np.testing.assert_array_equal(
+                getattr(first, name), getattr(second, name)
+            )
+
+    def test_spawn(self):
+        """Test spawned streams are independent and reproducible."""
+        first, second = PrescriptionGenerator(seed=7).spawn(2)
+        again = PrescriptionGenerator(seed=7).spawn(2)[0]
+        sphere = first.batch(1000).sphere
+        assert not np.array_equal(sphere, second.batch(1000).sphere)
+        np.testing.assert_array_equal(sphere, again.batch(1000).sphere)
+
+    @pytest.mark.parametrize(
+        "rx_range",
+        [
+            pytest.param(30, id="Default range"),
+            pytest.param(2, id="Narrow range"),
+        ],
+    )
+    def test_values_are_valid(self, rx_range):
+        """Test generated prescriptions are realistic and validate."""
+        batch = PrescriptionGenerator(seed=1, rx_range=rx_range).batch(5000)
+        assert len(batch) == 5000
+        for column in [batch.sphere, batch.cylinder, batch.add]:
+            np.testing.assert_array_equal(column % 0.25, 0)
+        assert np.abs(batch.sphere).max() <= rx_range
+        assert (batch.cylinder <= 0).all()
+        assert batch.axis.min() >= 0 and batch.axis.max() <= 180
+        assert set(batch.vertical_prism_direction.tolist()) == {"U", "D"}
+        assert set(batch.horizontal_prism_direction.tolist()) == {"I", "O"}
+        # Weighted towards low powers, as with Prescription.random().
+        assert abs(np.median(batch.sphere) + 1) <= 0.5
+        assert all(isinstance(rx, Prescription) for rx in batch[:50])
+
+    def test_batches(self):
+        """Test streaming batches."""
+        generator = PrescriptionGenerator(seed=1)
+        sizes = [len(batch) for batch in generator.batches(250, 100)]
+        assert sizes == [100, 100, 50]
+
+    def test_bad_range(self):
+        """Test a range too small to hold any powers."""
+        with pytest.raises(PrescriptionError) as excinfo:
+            PrescriptionGenerator(rx_range=0)
+        assert excinfo.value.message == "rx_range must be at least 0.25"
+
+    def test_random_keeps_global_state(self):
+        """Test a seeded Prescription.random() leaves `random` alone."""
+        random.seed(1)
+        expected = random.random()
+        random.seed(1)
+        Prescription().random(seed=42)
+        assert random.random() == expected
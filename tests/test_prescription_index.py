@@ -0,0 +1,106 @@
+"""Testing the index of equivalent prescriptions."""
+
+import numpy as np
+import pytest
+
+from optom_tools import Prescription, PrescriptionBatch
+from optom_tools.prescription import (
+    CanonicalKey,
+    PrescriptionGenerator,
+    PrescriptionIndex,
+)
+from optom_tools.prescription.exceptions import PrescriptionError
+
+ORDERS = [
+    "+1.00/-1.00x180",
+    "-2.00/-0.50x90 add +2.00",
+    "plano/+1.00x90",
+    "-3.00 DS",
+    "-2.50/+0.50x180 add +2.00",
+    "+1.00/-1.00x0",
+]
+
+
+class TestPrescriptionIndex:
+    """Prescription index testing."""
+
+    def test_groups(self):
+        """Test rows are grouped by lens, in order of first appearance."""
+        index = PrescriptionIndex.from_batch(
+            PrescriptionBatch.from_strings(ORDERS)
+        )
+        assert len(index) == 3
+        assert index.group_ids.tolist() == [0, 1, 0, 2, 1, 0]
+        assert index.first_rows.tolist() == [0, 1, 3]
+        assert index.counts.tolist() == [3, 2, 1]
+        assert index.duplicated().tolist() == [
+            False,
+            False,
+            True,
+            False,
+            True,
+            True,
+        ]
+        assert [rows.tolist() for rows in index.groups()] == [
+            [0, 2, 5],
+            [1, 4],
+            [3],
+        ]
+        assert index.keys()[0] == CanonicalKey(4, -4, 180, 0, 0, 0, "", 0, "")
+        assert index.find(Prescription("plano/+1.00x90")).tolist() == [
+            0,
+            2,
+            5,
+        ]
+        assert Prescription("-3.00/-0.12x10") in index
+        assert Prescription("-3.50 DS") not in index
+        assert index.find(Prescription("-3.50 DS")).tolist() == []
+
+    def test_add_in_chunks(self):
+        """Test adding batches one by one matches one batch."""
+        batch = PrescriptionGenerator(seed=1).batch(3000)
+        batch.axis = np.round(batch.axis / 45) * 45
+        batch.sphere = np.round(batch.sphere)
+        whole = PrescriptionIndex.from_batch(batch)
+        chunked = PrescriptionIndex()
+        for start in range(0, len(batch), 700):
+            chunked.add(batch[start : start + 700])
+        assert chunked.rows == whole.rows == 3000
+        assert len(whole) < 3000
+        np.testing.assert_array_equal(chunked.group_ids, whole.group_ids)
+        np.testing.assert_array_equal(chunked.first_rows, whole.first_rows)
+        assert chunked.keys() == whole.keys()
+        assert whole.keys() == [
+            rx.canonical_key() for rx in batch[whole.first_rows]
+        ]
+
+    def test_batch_matches_scalar(self):
+        """Test batch canonical form and keys match the scalar model."""
+        batch = PrescriptionGenerator(seed=2).batch(500)
+        rng = np.random.default_rng(0)
+        batch.sphere = batch.sphere + rng.normal(0, 0.1, len(batch))
+        batch.vertical_prism = np.abs(rng.normal(0, 0.3, len(batch)))
+        batch.vertical_prism_direction = rng.choice(["U", "D", ""], len(batch))
+        prescriptions = batch.to_prescriptions()
+        index = PrescriptionIndex.from_batch(batch)
+        assert [index.keys()[group] for group in index.group_ids] == [
+            rx.canonical_key() for rx in prescriptions
+        ]
+        batch.canonicalize()
+        assert batch.to_prescriptions() == [
+            rx.canonical() for rx in prescriptions
+        ]
+
+    def test_empty(self):
+        """Test an empty index."""
+        index = PrescriptionIndex()
+        index.add(PrescriptionBatch(sphere=[]))
+        assert (len(index), index.rows) == (0, 0)
+        assert index.groups() == []
+        assert index.counts.tolist() == []
+
+    def test_step_error(self):
+        """Test the step must be positive."""
+        with pytest.raises(PrescriptionError) as excinfo:
+            PrescriptionIndex(step=-0.25)
+        assert excinfo.value.message == "step must be a positive number"
@@ -0,0 +1,115 @@
+"""Testing nearest neighbour search over prescriptions."""
+
+import numpy as np
+import pytest
+
+from optom_tools import Prescription, PrescriptionBatch
+from optom_tools.prescription import NeighbourIndex, PrescriptionGenerator
+from optom_tools.prescription.exceptions import PrescriptionError
+
+STOCK = [
+    "-2.00/-1.00x1",
+    "-2.00/-1.00x90",
+    "-2.00/-1.00x175",
+    "-2.00/-1.00x180",
+    "+3.00 DS",
+]
+
+
+def brute_force(stock, queries):
+    """Give the distance of every query to every stock lens."""
+    return np.linalg.norm(
+        queries.power_vectors[:, None] - stock.power_vectors[None], axis=-1
+    )
+
+
+class TestNeighbourIndex:
+    """Neighbour index testing."""
+
+    def test_axis_wraparound(self):
+        """Test axes either side of 180 are neighbours."""
+        index = NeighbourIndex(PrescriptionBatch.from_strings(STOCK))
+        distances, rows = index.query(Prescription("-2.00/-1.00x179"), k=3)
+        assert rows.tolist() == [3, 0, 2]
+        np.testing.assert_allclose(
+            distances, [0.017452, 0.034899, 0.069756], atol=1e-6
+        )
+        distances, rows = index.query_radius(
+            Prescription("-2.00/-1.00x0"), 0.1
+        )
+        assert rows.tolist() == [3, 0, 2]
+        assert distances[0] == pytest.approx(0)
+
+    def test_missing_neighbours(self):
+        """Test queries asking for more neighbours than there are rows."""
+        index = NeighbourIndex(PrescriptionBatch.from_strings(STOCK[:2]))
+        distances, rows = index.query(
+            PrescriptionBatch.from_strings(["-2.00/-0.75x5"]), k=3
+        )
+        assert rows.tolist() == [[0, 1, -1]]
+        assert distances[0, 2] == np.inf
+        empty = NeighbourIndex(PrescriptionBatch.from_strings([]))
+        assert empty.query([0, 0, 0], k=2)[1].tolist() == [[-1, -1]]
+        assert empty.query_radius([0, 0, 0], 1)[1][0].tolist() == []
+
+    @pytest.mark.parametrize(
+        "cell_size",
+        [
+            pytest.param(0.05, id="default cells"),
+            pytest.param(0.25, id="quarter cells"),
+            pytest.param(2, id="large cells"),
+        ],
+    )
+    def test_matches_brute_force(self, cell_size):
+        """Test every query against a linear scan."""
+        stock = PrescriptionGenerator(seed=0).batch(2000)
+        queries = PrescriptionGenerator(seed=1).batch(100)
+        # A query far outside the stock too.
+        queries = PrescriptionBatch.concatenate(
+            [queries, PrescriptionBatch.from_strings(["+40.00/-10.00x45"])]
+        )
+        expected = brute_force(stock, queries)
+        index = NeighbourIndex(stock, cell_size)
+        distances, rows = index.query(queries, k=4)
+        np.testing.assert_allclose(distances, np.sort(expected)[:, :4])
+        np.testing.assert_allclose(
+            np.take_along_axis(expected, rows, axis=1), distances
+        )
+        distances, rows = index.query_radius(queries, 0.5)
+        for query, found in enumerate(rows):
+            assert sorted(found.tolist()) == (
+                np.flatnonzero(expected[query] <= 0.5).tolist()
+            )
+            assert (np.diff(distances[query]) >= 0).all()
+
+    @pytest.mark.parametrize(
+        "call,exception_message",
+        [
+            pytest.param(
+                lambda index: NeighbourIndex(index.batch, 0),
+                "cell_size must be a positive number",
+                id="ERROR cell_size",
+            ),
+            pytest.param(
+                lambda index: index.query([0, 0, 0], k=0),
+                "k must be at least 1",
+                id="ERROR k",
+            ),
+            pytest.param(
+                lambda index: index.query_radius([0, 0, 0], -1),
+                "radius must be zero or more",
+                id="ERROR radius",
+            ),
+            pytest.param(
+                lambda index: index.query([0, 0]),
+                "Power vectors must have 3 columns",
+                id="ERROR vectors",
+            ),
+        ],
+    )
+    def test_errors(self, call, exception_message):
+        """Test invalid arguments."""
+        index = NeighbourIndex(PrescriptionBatch.from_strings(STOCK))
+        with pytest.raises(PrescriptionError) as excinfo:
+            call(index)
+        assert excinfo.value.message == exception_message
@@ -0,0 +1,166 @@
+"""Testing for the prescription parser."""
+
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+from optom_tools import Prescription
+from optom_tools.prescription import RxComponents, parse_many, parse_rx
+from optom_tools.prescription.exceptions import PrescriptionError
+
+
+class TestParseRx:
+    """Prescription parser testing."""
+
+    @pytest.mark.parametrize(
+        "test_input,expected,exception,exception_message",
+        [
+            pytest.param(
+                "+1.00/-1.00x90",
+                RxComponents(1, -1, 90),
+                does_not_raise(),
+                None,
+                id="Normal input",
+            ),
+            pytest.param(
+                "plano", RxComponents(0), does_not_raise(), None, id="plano"
+            ),
+            pytest.param(
+                "pl/-0.50x180",
+                RxComponents(0, -0.5, 180),
+                does_not_raise(),
+                None,
+                id="pl",
+            ),
+            pytest.param(
+                "-3.00 DS", RxComponents(-3), does_not_raise(), None, id="DS"
+            ),
+            pytest.param(
+                "+1.00/DS", RxComponents(1), does_not_raise(), None, id="/DS"
+            ),
+            pytest.param(
+                ".50/-.25x5",
+                RxComponents(0.5, -0.25, 5),
+                does_not_raise(),
+                None,
+                id="No leading zero",
+            ),
+            pytest.param(
+                "−1.25 / −0.75 × 45",
+                RxComponents(-1.25, -0.75, 45),
+                does_not_raise(),
+                None,
+                id="Unicode signs",
+            ),
+            pytest.param(
+                "-2.00 -0.50 x 10",
+                RxComponents(-2, -0.5, 10),
+                does_not_raise(),
+                None,
+                id="No slash",
+            ),
+            pytest.param(
+                "+1.00/-1.00x90 Add +2.00@33",
+                RxComponents(1, -1, 90, add=2, working_distance_cm=33),
+                does_not_raise(),
+                None,
+                id="Add with working distance",
+            ),
+            pytest.param(
+                "+2.00 DS, add +2.50",
+                RxComponents(2, add=2.5),
+                does_not_raise(),
+                None,
+                id="Add without working distance",
+            ),
+            pytest.param(
+                "pl Int add +1.00 @ 66cm Add: +2.00 @ 40cm",
+                RxComponents(
+                    0,
+                    add=2,
+                    working_distance_cm=40,
+                    intermediate_add=1,
+                    intermediate_working_distance_cm=66,
+                ),
+                does_not_raise(),
+                None,
+                id="Intermediate add",
+            ),
+            pytest.param(
+                "-1.00 2Δ BU 1.5 base out",
+                RxComponents(
+                    -1,
+                    vertical_prism=2,
+                    vertical_prism_direction="U",
+                    horizontal_prism=1.5,
+                    horizontal_prism_direction="O",
+                ),
+                does_not_raise(),
+                None,
+                id="Prism",
+            ),
+            pytest.param(
+                "plano/-1.00x90/",
+                None,
+                pytest.raises(PrescriptionError),
+                "Only one '/' can be parsed.",
+                id="ERROR 2 '/'",
+            ),
+            pytest.param(
+                "+1.00/-1.00",
+                None,
+                pytest.raises(PrescriptionError),
+                "Unable to parse prescription",
+                id="ERROR No axis",
+            ),
+            pytest.param(
+                "+1.00 add +1 add +2",
+                None,
+                pytest.raises(PrescriptionError),
+                "Only one add can be parsed.",
+                id="ERROR 2 adds",
+            ),
+            pytest.param(
+                "+1.00 1 BU 2 BD",
+                None,
+                pytest.raises(PrescriptionError),
+                "Only one vertical prism can be parsed.",
+                id="ERROR 2 vertical prisms",
+            ),
+        ],
+    )
+    def test_parse_rx(
+        self, test_input, expected, exception, exception_message
+    ):
+        """Test parse_rx()."""
+        with exception as excinfo:
+            assert parse_rx(test_input) == expected
+        if excinfo is not None:
+            assert excinfo.value.message == exception_message
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            Prescription(sphere=0, cylinder=-1, axis=90.5),
+            Prescription(sphere=-2.25),
+            Prescription(
+                sphere=1, add={"add": 1.5, "working_distance_cm": 30}
+            ),
+        ],
+    )
+    def test_round_trip(self, test_input):
+        """Test parsing the string representation of a prescription."""
+        assert Prescription(str(test_input)) == test_input
+
+    def test_parse_many(self):
+        """Test parse_many() matches parsing one at a time."""
+        rx_strings = [
+            "+1.00/-1.00x90",
+            "pl Add +2.00@33 2 BU",
+            "-1.00 int add +1.00 1 BI",
+        ]
+        batch = parse_many(rx_strings)
+        assert batch.to_prescriptions() == [
+            Prescription(rx) for rx in rx_strings
+        ]
+        assert len(parse_many([])) == 0
@@ -0,0 +1,221 @@
+"""Testing for the streaming readers."""
+
+import io
+import json
+
+import pytest
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.reader import (
+    PrescriptionReader,
+    ReaderError,
+    RowError,
+    VisualAcuityReader,
+    format_for_path,
+)
+
+RX_CSV = """id,Rx
+1,+1.00/-1.00x90
+2,plano
+3,oops
+4,-2.00/-0.50x10 Add +2.00@33
+5,+1.00/-1.00x190
+"""
+
+
+@pytest.fixture
+def rx_csv(tmp_path):
+    """Provide a CSV export of prescriptions."""
+    path = tmp_path / "export.csv"
+    path.write_text(RX_CSV)
+    return path
+
+
+@pytest.fixture
+def va_jsonl(tmp_path):
+    """Provide a JSONL export of visual acuities."""
+    path = tmp_path / "visits.jsonl"
+    rows = [{"va": "6/6"}, {"va": "20/40"}, {"va": "6/x"}, {"va": "6/12"}]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n")
+    return path
+
+
+class TestPrescriptionReader:
+    """Prescription reader testing."""
+
+    def test_batches(self, rx_csv):
+        """Test chunking into batches, skipping bad rows."""
+        reader = PrescriptionReader(
+            rx_csv, column="Rx", chunk_size=2, on_error="skip"
+        )
+        batches = list(reader)
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert batches[1].add.tolist() == [2.0, 0.0]
+        assert reader.errors == []
+
+    def test_models_collect(self, rx_csv):
+        """Test models() validates and collects bad rows."""
+        reader = PrescriptionReader(rx_csv, column="Rx", on_error="collect")
+        models = list(reader.models())
+        assert models[0] == Prescription("+1.00/-1.00x90")
+        assert len(models) == 3
+        assert [error.line for error in reader.errors] == [4, 6]
+        assert reader.errors[0].message == "Unable to parse prescription"
+        assert (
+            reader.errors[1].message
+            == "Axis must be between 0 and 180 degrees"
+        )
+
+    def test_raise(self, rx_csv):
+        """Test the default error policy raises with the line number."""
+        with pytest.raises(ReaderError) as excinfo:
+            list(PrescriptionReader(rx_csv, column="Rx"))
+        assert excinfo.value.message == "Line 4: Unable to parse prescription"
+        assert isinstance(excinfo.value.value, RowError)
+
+    def test_column_mapping(self):
+        """Test mapping separate columns onto prescription fields."""
+        source = io.StringIO("Sph,Cyl,Ax\n-1.00,-0.50,180\n+2.00,,\n")
+        reader = PrescriptionReader(
+            source,
+            column={"sphere": "Sph", "cylinder": "Cyl", "axis": "Ax"},
+            fmt="csv",
+        )
+        assert [str(rx) for rx in reader.models()] == [
+            "-1.00 / -0.50 x 180",
+            "+2.00 DS",
+        ]
+
+    def test_text(self):
+        """Test text input with one prescription per line."""
+        reader = PrescriptionReader(
+            io.StringIO("+1.00/-1.00x90\n\n oops \nplano\n"),
+            fmt="text",
+            on_error="collect",
+        )
+        (batch,) = list(reader)
+        assert batch.to_strings().tolist() == ["+1.00 / -1.00 x 90", "plano"]
+        assert reader.errors == [
+            RowError(3, {"rx": "oops"}, "Unable to parse prescription")
+        ]
+
+    def test_missing_column(self, rx_csv):
+        """Test a missing column is reported."""
+        with pytest.raises(ReaderError) as excinfo:
+            list(PrescriptionReader(rx_csv, column="rx"))
+        assert excinfo.value.message == "Line 2: Column 'rx' not found"
+
+    @pytest.mark.parametrize(
+        "kwargs,exception_message",
+        [
+            pytest.param(
+                {"source": "export.txt"},
+                "Unable to infer the format, pass fmt='csv' or fmt='jsonl'",
+                id="ERROR format",
+            ),
+            pytest.param(
+                {"source": "export.txt", "fmt": "xml"},
+                "fmt only accepts 'csv', 'jsonl' and 'text'",
+                id="ERROR fmt",
+            ),
+            pytest.param(
+                {
+                    "source": "export.txt",
+                    "fmt": "text",
+                    "column": {"sphere": "Sph"},
+                },
+                "Text input needs a single column name",
+                id="ERROR text column mapping",
+            ),
+            pytest.param(
+                {"source": "export.csv", "on_error": "ignore"},
+                "on_error only accepts 'raise', 'skip' and 'collect'",
+                id="ERROR on_error",
+            ),
+            pytest.param(
+                {"source": "export.csv", "chunk_size": 0},
+                "chunk_size must be at least 1",
+                id="ERROR chunk_size",
+            ),
+        ],
+    )
+    def test_initialising_object(self, kwargs, exception_message):
+        """Test reader configuration errors."""
+        with pytest.raises(ReaderError) as excinfo:
+            PrescriptionReader(**kwargs)
+        assert excinfo.value.message == exception_message
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            pytest.param("export.csv", ("csv", ","), id="csv"),
+            pytest.param("dir/EXPORT.TSV", ("csv", "\t"), id="tsv"),
+            pytest.param("export.ndjson", ("jsonl", None), id="ndjson"),
+            pytest.param("export.txt", None, id="unknown"),
+            pytest.param("-", None, id="no extension"),
+        ],
+    )
+    def test_format_for_path(self, path, expected):
+        """Test formats are inferred from file extensions."""
+        assert format_for_path(path) == expected
+
+
+class TestVisualAcuityReader:
+    """Visual acuity reader testing."""
+
+    def test_batches(self, va_jsonl):
+        """Test JSONL batches and collecting bad rows."""
+        reader = VisualAcuityReader(va_jsonl, on_error="collect")
+        (batch,) = list(reader.batches())
+        assert batch.to_strings().tolist() == ["6/6", "20/40", "6/12"]
+        assert batch.unit.tolist() == ["m", "ft", "m"]
+        assert reader.errors == [
+            RowError(
+                3,
+                {"va": "6/x"},
+                "Input must contain one '/' and numbers (e.g. '6/6')",
+            )
+        ]
+
+    def test_validated_batches(self, tmp_path):
+        """Test invalid rows are dropped and reported in line order."""
+        path = tmp_path / "visits.txt"
+        path.write_text("6/6\n6/-6\n6/x\n20/40\n-6/6\n")
+        reader = VisualAcuityReader(
+            path, fmt="text", on_error="collect", chunk_size=4
+        )
+        (batch,) = list(reader.validated_batches())
+        assert batch.to_strings().tolist() == ["6/6", "20/40"]
+        assert [(error.line, error.message) for error in reader.errors] == [
+            (2, "Distance must be a positive value"),
+            (3, "Input must contain one '/' and numbers (e.g. '6/6')"),
+            (5, "Distance must be a positive value"),
+        ]
+
+    def test_models(self, va_jsonl):
+        """Test streaming models from an open file."""
+        with open(va_jsonl) as file:
+            reader = VisualAcuityReader(file, on_error="skip")
+            assert list(reader.models()) == [
+                VisualAcuity("6/6"),
+                VisualAcuity("20/40"),
+                VisualAcuity("6/12"),
+            ]
+
+    def test_column_mapping(self, tmp_path):
+        """Test mapped distances without a unit follow parse_va()."""
+        path = tmp_path / "visits.csv"
+        path.write_text("Num,Den,Unit\n20,40,\n6,12,\n6,20,ft\n10,20,m\n")
+        distances = {"numerator": "Num", "denominator": "Den"}
+        (batch,) = list(VisualAcuityReader(path, column=distances))
+        assert batch.to_strings().tolist() == [
+            "20/40",
+            "6/12",
+            "6/20",
+            "10/20",
+        ]
+        assert batch.unit.tolist() == ["ft", "m", "m", "ft"]
+        (batch,) = list(
+            VisualAcuityReader(path, column={**distances, "unit": "Unit"})
+        )
+        assert batch.unit.tolist() == ["ft", "m", "ft", "m"]
@@ -0,0 +1,297 @@
+"""Testing the micro-batching HTTP/JSON server."""
+
+import asyncio
+import json
+
+import pytest
+
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.server import MicroBatcher, OptomServer, ServerError
+from optom_tools.server.server import (
+    rx_parse,
+    rx_transpose,
+    va_convert,
+    va_logmar,
+)
+from optom_tools.utils import instrumentation
+from optom_tools.visual_acuity import VisualAcuity
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+
+async def request(connection, method, path, body=None):
+    """Send one request on an open connection, giving status and JSON."""
+    reader, writer = connection
+    data = b"" if body is None else body
+    if not isinstance(data, bytes):
+        data = json.dumps(data).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+        + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    if headers["content-type"].startswith("text/plain"):
+        return status, body.decode()
+    return status, json.loads(body)
+
+
+def run_server(client, **kwargs):
+    """Run `client(server, connect)` against a server on a free port."""
+
+    async def main():
+        async with OptomServer(port=0, **kwargs) as server:
+            host, port = server.address[:2]
+            return await client(
+                server, lambda: asyncio.open_connection(host, port)
+            )
+
+    return asyncio.run(main())
+
+
+class TestMicroBatcher:
+    """Testing `MicroBatcher`."""
+
+    def test_batches(self):
+        """Test concurrent items are processed together, in order."""
+        calls = []
+
+        def double(items):
+            calls.append(list(items))
+            return [
+                ServerError(value=item, message="Odd") if item % 2 else item
+                for item in items
+            ]
+
+        async def main():
+            batcher = MicroBatcher(double, max_batch_size=3)
+            return await asyncio.gather(
+                *(batcher.submit(i) for i in range(5)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(main())
+        assert calls == [[0, 1, 2], [3, 4]]
+        assert results[::2] == [0, 2, 4]
+        assert [error.message for error in results[1::2]] == ["Odd", "Odd"]
+
+    def test_func_error(self):
+        """Test an error from the batch function fails every item."""
+
+        def fail(items):
+            raise ValueError("broken")
+
+        async def main():
+            batcher = MicroBatcher(fail, max_wait_ms=0)
+            return await asyncio.gather(
+                batcher.submit(1), batcher.submit(2), return_exceptions=True
+            )
+
+        assert [str(error) for error in asyncio.run(main())] == [
+            "broken",
+            "broken",
+        ]
+
+    @pytest.mark.parametrize(
+        "kwargs,exception_message",
+        [
+            pytest.param(
+                {"max_batch_size": 0},
+                "max_batch_size must be at least 1",
+                id="ERROR max_batch_size",
+            ),
+            pytest.param(
+                {"max_wait_ms": -1},
+                "max_wait_ms must be zero or more",
+                id="ERROR max_wait_ms",
+            ),
+        ],
+    )
+    def test_initialising_object(self, kwargs, exception_message):
+        """Test configuration errors."""
+        with pytest.raises(ServerError) as excinfo:
+            MicroBatcher(list, **kwargs)
+        assert excinfo.value.message == exception_message
+
+
+class TestEndpoints:
+    """Testing the batch functions behind each endpoint."""
+
+    def test_rx_parse(self):
+        """Test parsing gives the batch columns and formatted text."""
+        result, error = rx_parse([{"rx": "+1.00/-1.00x90 add +2.00"}, {}])
+        assert result["rx"] == "+1.00 / -1.00 x 90 Add: +2.00 @ 40cm"
+        assert (result["sphere"], result["add"]) == (1.0, 2.0)
+        assert error.message == "Request must include 'rx'"
+
+    def test_rx_transpose(self):
+        """Test each request keeps its own flag."""
+        results = rx_transpose(
+            [
+                {"rx": "+1.00/-1.00x90"},
+                {"rx": "+1.00/-1.00x90", "flag": "n"},
+                {"rx": "+1.00/-1.00x90", "flag": "p"},
+                {"rx": "oops"},
+                {"rx": "+1.00/-1.00x90", "flag": "x"},
+            ]
+        )
+        assert results[:3] == [
+            {"rx": "plano / +1.00 x 180"},
+            {"rx": "+1.00 / -1.00 x 90"},
+            {"rx": "plano / +1.00 x 180"},
+        ]
+        assert results[3].message == "Unable to parse prescription"
+        assert results[4].message == "'flag' must be one of None, n, p"
+
+    def test_rx_validation(self):
+        """Test rows breaking the rules of `Prescription` fail on their own."""
+        items = [{"rx": "+1.00/-1.00x200"}, {"rx": "+1.00/-1.00x90"}]
+        for func in (rx_parse, rx_transpose):
+            error, result = func(items)
+            assert isinstance(error, PrescriptionError)
+            assert error.message == "Axis must be between 0 and 180 degrees"
+            assert isinstance(result, dict)
+
+    def test_va(self):
+        """Test unit conversion and logMAR."""
+        assert va_convert(
+            [{"va": "6/6", "unit": "ft"}, {"va": "20/40", "unit": "m"}]
+        ) == [{"va": "20/20"}, {"va": "6/12"}]
+        assert va_logmar([{"va": "6/60"}]) == [{"logmar": -1.0}]
+        (error,) = va_logmar([{"va": 6}])
+        assert error.message == "'va' must be a string"
+
+    def test_va_validation(self):
+        """Test acuities without both distances fail on their own."""
+        errors = va_logmar([{"va": "0/6"}, {"va": "6/6"}])
+        assert errors[0].message == "Distance must be a positive value"
+        assert errors[1] == {"logmar": 0.0}
+        errors = va_convert(
+            [{"va": "6/0", "unit": "ft"}, {"va": "6/6", "unit": "ft"}]
+        )
+        assert isinstance(errors[0], VisualAcuityError)
+        assert errors[1] == {"va": "20/20"}
+
+
+class TestOptomServer:
+    """Testing `OptomServer` over localhost."""
+
+    def test_concurrent_requests_are_batched(self):
+        """Test concurrent clients are answered from shared batches."""
+
+        async def client(server, connect):
+            async def one(va):
+                connection = await connect()
+                result = await request(
+                    connection, "POST", "/va/logmar", {"va": va}
+                )
+                connection[1].close()
+                return result
+
+            results = await asyncio.gather(
+                *(one(f"6/{6 * 10 ** (i % 2)}") for i in range(20))
+            )
+            return results, server.stats()
+
+        results, stats = run_server(client, max_wait_ms=20)
+        assert results[:2] == [(200, {"logmar": 0.0}), (200, {"logmar": -1.0})]
+        assert stats.requests == 20
+        assert stats.batches < 20
+        assert stats.mean_batch_size > 1
+        assert 0 < stats.p50_ms <= stats.p99_ms
+
+    def test_keep_alive_and_errors(self):
+        """Test one connection serving good and bad requests."""
+
+        async def client(server, connect):
+            connection = await connect()
+            responses = [
+                await request(connection, *args)
+                for args in [
+                    ("POST", "/rx/transpose", {"rx": "+1.00/-1.00x90"}),
+                    ("POST", "/va/convert", {"va": "6/6", "unit": "yd"}),
+                    ("POST", "/va/logmar", b"not json"),
+                    ("POST", "/va/logmar", [1]),
+                    ("GET", "/va/logmar"),
+                    ("POST", "/unknown", {}),
+                    ("GET", "/stats"),
+                ]
+            ]
+            connection[1].close()
+            return responses
+
+        responses = run_server(client)
+        assert responses[:6] == [
+            (200, {"rx": "plano / +1.00 x 180"}),
+            (422, {"error": "'unit' must be one of ft, m"}),
+            (400, {"error": "Request body must be JSON"}),
+            (400, {"error": "Request body must be an object"}),
+            (405, {"error": "Use POST"}),
+            (404, {"error": "Unknown endpoint /unknown"}),
+        ]
+        status, stats = responses[6]
+        assert status == 200
+        assert (stats["requests"], stats["errors"]) == (6, 5)
+
+    def test_bad_content_length(self):
+        """Test a Content-Length that is not a whole number is answered."""
+
+        async def client(server, connect):
+            responses = []
+            for length in ("abc", "-1"):
+                reader, writer = await connect()
+                writer.write(
+                    b"POST /va/logmar HTTP/1.1\r\n"
+                    + f"Content-Length: {length}\r\n\r\n".encode()
+                )
+                await writer.drain()
+                responses.append(await reader.read())
+                writer.close()
+            return responses
+
+        for response in run_server(client):
+            assert response.startswith(b"HTTP/1.1 400 Bad Request")
+            assert b"Content-Length must be a whole number" in response
+
+    def test_metrics(self):
+        """Test the instrumentation counters in the Prometheus format."""
+
+        async def client(server, connect):
+            connection = await connect()
+            with instrumentation.use():
+                instrumentation.reset()
+                VisualAcuity("6/6")
+                responses = [
+                    await request(connection, "GET", "/metrics"),
+                    await request(connection, "POST", "/metrics"),
+                ]
+            connection[1].close()
+            return responses
+
+        (status, text), error = run_server(client)
+        assert status == 200
+        assert 'optom_tools_calls_total{operation="va.parse"} 1\n' in text
+        assert error == (405, {"error": "Use GET"})
+
+    def test_unix_socket(self, tmp_path):
+        """Test serving on a Unix socket."""
+        path = str(tmp_path / "optom.sock")
+
+        async def main():
+            async with OptomServer(path=path) as server:
+                assert server.address == path
+                connection = await asyncio.open_unix_connection(path)
+                result = await request(
+                    connection, "POST", "/va/logmar", {"va": "6/60"}
+                )
+                connection[1].close()
+                return result
+
+        assert asyncio.run(main()) == (200, {"logmar": -1.0})
@@ -0,0 +1,208 @@
+"""Testing for streaming statistics."""
+
+import pickle
+import warnings
+
+import numpy as np
+import pytest
+
+from optom_tools import (
+    Prescription,
+    PrescriptionBatch,
+    VisualAcuity,
+    VisualAcuityBatch,
+)
+from optom_tools.prescription import PrescriptionGenerator
+from optom_tools.stats import (
+    Histogram,
+    PrescriptionStats,
+    QuantileSketch,
+    RunningStats,
+    StatsError,
+    VisualAcuityStats,
+)
+
+VALUES = np.random.default_rng(0).normal(-1, 2.5, 20_000)
+
+
+def _sharded(accumulator, values, shards=7):
+    """Accumulate shards separately, then merge them."""
+    total = accumulator()
+    for shard in np.array_split(values, shards):
+        state = accumulator()
+        for chunk in np.array_split(shard, 3):
+            state.update(chunk)
+        total.merge(pickle.loads(pickle.dumps(state)))
+    return total
+
+
+class TestAccumulators:
+    """Accumulator testing."""
+
+    def test_running_stats(self):
+        """Test merged moments match a single pass."""
+        stats = _sharded(RunningStats, np.append(VALUES, np.nan))
+        assert stats.count == len(VALUES)
+        assert stats.mean == pytest.approx(VALUES.mean())
+        assert stats.variance == pytest.approx(VALUES.var(ddof=1))
+        assert stats.min == VALUES.min()
+        assert stats.max == VALUES.max()
+
+    def test_running_stats_empty(self):
+        """Test an empty summary."""
+        stats = RunningStats()
+        stats.merge(RunningStats())
+        assert stats.count == 0
+        assert np.isnan(stats.variance)
+
+    def test_histogram(self):
+        """Test merged counts match a single pass exactly."""
+        histogram = _sharded(lambda: Histogram(-5, 5, 0.25), VALUES)
+        counts, _ = np.histogram(VALUES, bins=np.arange(-5, 5.25, 0.25))
+        np.testing.assert_array_equal(histogram.counts, counts)
+        assert histogram.underflow == (VALUES < -5).sum()
+        assert histogram.overflow == (VALUES >= 5).sum()
+        assert histogram.count == len(VALUES)
+
+    def test_histogram_not_finite(self):
+        """Test NaNs and infinities are not counted."""
+        histogram = Histogram(-5, 5, 0.25)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            histogram.update([np.inf, -np.inf, np.nan, 1])
+        assert (histogram.count, histogram.underflow, histogram.overflow) == (
+            1,
+            0,
+            0,
+        )
+
+    def test_histogram_merge_error(self):
+        """Test histograms with different bins are not merged."""
+        with pytest.raises(StatsError) as excinfo:
+            Histogram(-5, 5, 0.25).merge(Histogram(-5, 5, 0.5))
+        assert (
+            excinfo.value.message
+            == "Only histograms with the same bins can be merged"
+        )
+
+    @pytest.mark.parametrize("q", [0, 0.01, 0.25, 0.5, 0.75, 0.99, 1])
+    def test_quantile_sketch(self, q):
+        """Test quantiles are within the relative accuracy."""
+        sketch = _sharded(QuantileSketch, VALUES)
+        single = QuantileSketch()
+        single.update(VALUES)
+        assert sketch.quantile(q) == single.quantile(q)
+        expected = np.quantile(VALUES, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01)
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            pytest.param(lambda sketch: sketch.quantile(1.5), id="ERROR q"),
+            pytest.param(
+                lambda sketch: sketch.merge(QuantileSketch(0.02)),
+                id="ERROR accuracy",
+            ),
+            pytest.param(lambda sketch: QuantileSketch(1), id="ERROR sketch"),
+        ],
+    )
+    def test_quantile_sketch_errors(self, test_input):
+        """Test invalid quantiles and merges."""
+        with pytest.raises(StatsError):
+            test_input(QuantileSketch())
+
+
+class TestDomainStats:
+    """Prescription and visual acuity summary testing."""
+
+    def test_prescription_stats(self):
+        """Test models, batches and streams give the same summary."""
+        batch = PrescriptionGenerator(seed=0).batch(1000)
+        from_batch = PrescriptionStats()
+        from_batch.update(batch)
+        from_stream = PrescriptionStats()
+        from_stream.update(batch.to_prescriptions())
+        from_stream.merge(PrescriptionStats())
+        summary = from_stream.spherical_equivalent
+        assert summary.count == 1000
+        assert summary.mean == pytest.approx(batch.mean_sphere.mean())
+        np.testing.assert_array_equal(
+            summary.histogram.counts,
+            from_batch.spherical_equivalent.histogram.counts,
+        )
+        single = PrescriptionStats()
+        single.update(Prescription(sphere=-1))
+        assert single.spherical_equivalent.mean == -1
+
+    def test_anisometropia(self):
+        """Test pairs are counted across merged shards."""
+        right = PrescriptionBatch(sphere=[-1, -2, 0, 3])
+        left = [
+            Prescription(sphere=-1),
+            Prescription(sphere=-3),
+            Prescription(sphere=0, cylinder=-1.5),
+            Prescription(sphere=1),
+        ]
+        stats = PrescriptionStats()
+        stats.update_pairs(right[:2], left[:2])
+        other = PrescriptionStats()
+        other.update_pairs(right[2:], left[2:])
+        stats.merge(other)
+        assert stats.pairs == 4
+        assert stats.anisometropic == 2
+        assert stats.anisometropia_prevalence == 0.5
+        assert stats.spherical_equivalent.count == 8
+        with pytest.raises(StatsError):
+            stats.update_pairs(right, left[:3])
+        with pytest.raises(StatsError):
+            stats.update_pairs(right[:3], left)
+
+    def test_anisometropia_streams(self):
+        """Test streams of pairs are read side by side, chunk by chunk."""
+        right = PrescriptionBatch(sphere=[-1, -2, 0, 3, 1])
+        left = PrescriptionBatch(sphere=[-1, -3, 0, 1, 1])
+        read = []
+
+        def stream(batch, sizes):
+            first = 0
+            for size in sizes:
+                read.append(size)
+                yield batch[first : first + size]
+                first += size
+
+        stats = PrescriptionStats()
+        right_stream = stream(right, [1, 0, 4])
+        stats.update_pairs(right_stream, stream(left, [2, 2, 1]))
+        expected = PrescriptionStats()
+        expected.update_pairs(right, left)
+        assert (stats.pairs, stats.anisometropic) == (5, 2)
+        assert stats.spherical_equivalent.mean == pytest.approx(
+            expected.spherical_equivalent.mean
+        )
+        # Both streams are read side by side, not one after the other.
+        assert read == [1, 2, 0, 4, 2, 1]
+        with pytest.raises(StatsError):
+            stats.merge(PrescriptionStats(anisometropia_d=2))
+
+    def test_anisometropia_not_finite(self):
+        """Test pairs with a NaN or infinite eye are not counted."""
+        right = PrescriptionBatch(sphere=[-1, np.nan, 0, np.inf, 3])
+        left = PrescriptionBatch(sphere=[-3, -1, np.nan, 0, 3])
+        stats = PrescriptionStats()
+        stats.update_pairs(right, left)
+        assert (stats.pairs, stats.anisometropic) == (2, 1)
+        assert stats.anisometropia_prevalence == 0.5
+        assert stats.spherical_equivalent.count == 7
+
+    def test_visual_acuity_stats(self):
+        """Test models, batches and streams give the same summary."""
+        vas = ["6/6", "6/9", "6/12", "6/60", "20/20"]
+        stats = VisualAcuityStats()
+        stats.update(VisualAcuityBatch.from_strings(vas))
+        stats.update(VisualAcuity(vas[0]) for _ in range(3))
+        stats.update(VisualAcuity("6/6"))
+        assert stats.logmar.count == 9
+        assert stats.logmar.quantile(0.5) == pytest.approx(0, abs=1e-6)
+        assert stats.logmar.quantile(0) == pytest.approx(
+            float(VisualAcuity("6/60").logmar), rel=0.01
+        )
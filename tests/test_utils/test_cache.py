@@ -0,0 +1,113 @@
+"""Testing the parse cache."""
+
+import threading
+
+import pytest
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import parse_cache as rx_parse_cache
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.utils import CacheInfo, ParseCache
+from optom_tools.visual_acuity import parse_cache as va_parse_cache
+
+
+@pytest.fixture
+def cache():
+    """Give an enabled cache that counts calls to its parser."""
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        if text.strip() == "bad":
+            raise PrescriptionError(value=text, message="Bad text")
+        return text.upper()
+
+    cache = ParseCache(parse)
+    cache.enable(maxsize=2)
+    cache.calls = calls
+    return cache
+
+
+class TestParseCache:
+    """Test the LRU parse cache."""
+
+    def test_disabled_by_default(self):
+        """Test the cache does nothing until enabled."""
+        cache = ParseCache(str.upper)
+        assert not cache.enabled
+        assert cache("6/6") == "6/6".upper()
+        assert cache.info() == CacheInfo(0, 0, 0, 0)
+
+    def test_hits_and_misses(self, cache):
+        """Test hits, misses and whitespace normalisation."""
+        assert cache("6/6") == "6/6"
+        assert cache("  6/6 ") == "6/6"
+        assert cache("pl / -0.50x180\n") == "PL / -0.50X180"
+        assert cache("pl / -0.50x180") == "PL / -0.50X180"
+        assert cache.calls == ["6/6", "pl / -0.50x180"]
+        assert cache.info() == CacheInfo(
+            hits=2, misses=2, maxsize=2, currsize=2
+        )
+
+    def test_least_recently_used_is_evicted(self, cache):
+        """Test the cache is bounded."""
+        for text in ["a", "b", "a", "c", "a", "b"]:
+            cache(text)
+        assert cache.calls == ["a", "b", "c", "b"]
+        assert cache.info().currsize == 2
+
+    def test_errors_are_not_cached(self, cache):
+        """Test failures are raised for the original text every time."""
+        for _ in range(2):
+            with pytest.raises(PrescriptionError) as excinfo:
+                cache(" bad")
+            assert excinfo.value.value == " bad"
+        assert cache.calls == ["bad", "bad"]
+        assert cache.info().currsize == 0
+
+    def test_clear_and_disable(self, cache):
+        """Test clearing and disabling the cache."""
+        cache("a")
+        cache.clear()
+        assert cache.info() == CacheInfo(0, 0, 2, 0)
+        cache.disable()
+        cache("a")
+        cache("a")
+        assert cache.calls == ["a", "a", "a"]
+        assert cache.info() == CacheInfo(0, 0, 0, 0)
+
+    def test_threads(self):
+        """Test concurrent lookups while the cache is reset."""
+        cache = ParseCache(str.upper)
+        cache.enable()
+
+        def work():
+            for i in range(1000):
+                assert cache(f"{i % 10}/6") == f"{i % 10}/6"
+                if i % 100 == 0:
+                    cache.clear()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.info().currsize <= 10
+
+    def test_models_use_cache(self):
+        """Test models parse through the cache and keep their errors."""
+        rx_parse_cache.enable()
+        va_parse_cache.enable()
+        try:
+            assert Prescription("pl/-0.50x180") == Prescription(
+                " pl/-0.50x180"
+            )
+            assert VisualAcuity("6/9") == VisualAcuity("6/9")
+            assert rx_parse_cache.info().hits == 1
+            assert va_parse_cache.info().hits == 1
+            with pytest.raises(PrescriptionError) as excinfo:
+                Prescription("1/2/3 ")
+            assert excinfo.value.value == "1/2/3 "
+        finally:
+            rx_parse_cache.disable()
+            va_parse_cache.disable()
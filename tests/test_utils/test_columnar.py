@@ -0,0 +1,77 @@
+"""Testing on-disk columnar storage."""
+
+import json
+
+import numpy as np
+import pytest
+
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.utils import load_columns, save_columns
+
+COLUMNS = {
+    "sphere": np.array([1.0, -2.5, 0.0]),
+    "add": np.array([0.0, 0.0, 0.0]),
+    "direction": np.array(["U", "", "D"]),
+}
+
+
+class TestColumnar:
+    """Testing save_columns() and load_columns()."""
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_round_trip(self, tmp_path, mmap):
+        """Test columns load with the same values and dtypes."""
+        save_columns(tmp_path, "Batch", COLUMNS)
+        columns = load_columns(
+            tmp_path, "Batch", list(COLUMNS), PrescriptionError, mmap
+        )
+        for name, column in COLUMNS.items():
+            np.testing.assert_array_equal(columns[name], column)
+            assert columns[name].dtype == column.dtype
+            if mmap or name == "add":
+                assert not columns[name].flags.writeable
+
+    def test_repeated_values_in_header(self, tmp_path):
+        """Test a column of one repeated value is not written to a file."""
+        save_columns(tmp_path, "Batch", COLUMNS)
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "direction.npy",
+            "header.json",
+            "sphere.npy",
+        ]
+
+    @pytest.mark.parametrize(
+        "change,exception_message",
+        [
+            pytest.param(
+                {"version": 2},
+                "Saved batch format must be optom-tools-columns version 1",
+                id="ERROR version",
+            ),
+            pytest.param(
+                {"kind": "Other"},
+                "Saved batch is not a Batch",
+                id="ERROR kind",
+            ),
+            pytest.param(
+                {"length": 4},
+                "Saved column does not match the header",
+                id="ERROR length",
+            ),
+            pytest.param(
+                {"columns": {}},
+                "Saved batch is missing a column",
+                id="ERROR missing column",
+            ),
+        ],
+    )
+    def test_load_errors(self, tmp_path, change, exception_message):
+        """Test loading columns that do not match the header."""
+        save_columns(tmp_path, "Batch", COLUMNS)
+        header_path = tmp_path / "header.json"
+        header = json.loads(header_path.read_text())
+        header.update(change)
+        header_path.write_text(json.dumps(header))
+        with pytest.raises(PrescriptionError) as excinfo:
+            load_columns(tmp_path, "Batch", list(COLUMNS), PrescriptionError)
+        assert excinfo.value.message == exception_message
@@ -0,0 +1,144 @@
+"""Testing opt-in instrumentation of hot paths."""
+
+import json
+
+import pytest
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import FrozenPrescription
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.utils import Instrumentation, Metric, instrumentation
+
+
+@pytest.fixture
+def enabled():
+    """Give the shared instrumentation, enabled and reset."""
+    with instrumentation.use():
+        instrumentation.reset()
+        yield instrumentation
+    instrumentation.reset()
+
+
+def is_timed(func):
+    """Tell if a function is an instrumentation wrapper."""
+    return getattr(getattr(func, "__code__", None), "co_name", None) == "timed"
+
+
+class Counted:
+    """Class with every kind of registrable attribute."""
+
+    def method(self, value):
+        """Give the value."""
+        if value is None:
+            raise ValueError("No value")
+        return value
+
+    @property
+    def prop(self):
+        """Give a constant."""
+        return 1
+
+    @classmethod
+    def klass(cls):
+        """Give the class name."""
+        return cls.__name__
+
+    @staticmethod
+    def static():
+        """Give a constant."""
+        return 2
+
+
+class TestInstrumentation:
+    """Testing `Instrumentation`."""
+
+    def test_register(self):
+        """Test wrapping and restoring each kind of attribute."""
+        originals = dict(Counted.__dict__)
+        registry = Instrumentation()
+        for attribute in ("method", "prop", "klass", "static"):
+            registry.register(Counted, attribute, attribute)
+        assert registry.snapshot()["method"] == Metric(0, 0, 0.0)
+        with registry.use():
+            counted = Counted()
+            assert counted.method(3) == 3
+            with pytest.raises(ValueError):
+                counted.method(None)
+            assert (counted.prop, Counted.klass(), Counted.static()) == (
+                1,
+                "Counted",
+                2,
+            )
+        snapshot = registry.snapshot()
+        assert snapshot["method"][:2] == (2, 1)
+        assert snapshot["method"].seconds > 0
+        assert [
+            snapshot[name].calls for name in ("prop", "klass", "static")
+        ] == [
+            1,
+            1,
+            1,
+        ]
+        assert dict(Counted.__dict__) == originals
+        Counted().method(1)
+        assert registry.snapshot()["method"].calls == 2
+        registry.reset()
+        assert registry.snapshot()["method"] == Metric(0, 0, 0.0)
+
+    def test_register_while_enabled(self):
+        """Test registering while enabled wraps at once."""
+        registry = Instrumentation()
+        registry.enable()
+        registry.register(Counted, "static", "static")
+        Counted.static()
+        registry.disable()
+        Counted.static()
+        assert registry.snapshot()["static"].calls == 1
+        assert not is_timed(Counted.static)
+
+    def test_disabled_costs_nothing(self):
+        """Test nothing is wrapped while disabled."""
+        assert not instrumentation.enabled
+        assert not is_timed(Prescription.transpose)
+        assert not is_timed(Prescription.__fields__["axis"].post_validators[0])
+        with instrumentation.use():
+            assert is_timed(Prescription.transpose)
+            assert is_timed(Prescription.__fields__["axis"].post_validators[0])
+
+    def test_models(self, enabled):
+        """Test the registered hot paths of the models."""
+        rx = Prescription("+1.00/-1.00x90")
+        rx.transpose()
+        str(rx)
+        FrozenPrescription("+2.00/-1.00x90")
+        with pytest.raises(PrescriptionError):
+            Prescription("oops")
+        va = VisualAcuity("6/6")
+        va.convert_unit("ft")
+        va.logmar
+        str(va)
+        snapshot = enabled.snapshot()
+        assert snapshot["rx.parse"][:2] == (3, 1)
+        for name in (
+            "rx.transpose",
+            "rx.str",
+            "va.parse",
+            "va.convert_unit",
+            "va.logmar",
+            "va.str",
+        ):
+            assert snapshot[name].calls == 1, name
+        assert snapshot["rx.validate"].calls > 0
+        assert snapshot["va.validate"].calls > 0
+
+    def test_exporters(self, enabled):
+        """Test the JSON and Prometheus exports."""
+        VisualAcuity("6/6")
+        data = json.loads(enabled.to_json())
+        assert data["va.parse"]["calls"] == 1
+        assert set(data["va.parse"]) == {"calls", "errors", "seconds"}
+        text = enabled.to_prometheus(prefix="optom")
+        assert "# TYPE optom_calls_total counter\n" in text
+        assert 'optom_calls_total{operation="va.parse"} 1\n' in text
+        assert 'optom_errors_total{operation="va.parse"} 0\n' in text
+        assert 'optom_seconds_total{operation="va.parse"} ' in text
@@ -0,0 +1,129 @@
+"""Testing interning of frozen models."""
+
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription import FrozenPrescription
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.utils import InternPool, PoolInfo
+from optom_tools.visual_acuity import FrozenVisualAcuity
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+
+class TestInternPool:
+    """Intern pool testing."""
+
+    def test_eviction(self):
+        """Test the least recently used value is evicted."""
+        pool = InternPool(maxsize=2)
+        first = pool.intern((1,))
+        pool.intern((2,))
+        assert pool.intern((1,)) is first
+        pool.intern((3,))
+        assert pool.info() == PoolInfo(
+            hits=1, misses=3, evictions=1, maxsize=2, currsize=2
+        )
+        assert pool.intern((1,)) is first
+        assert pool.info().hits == 2
+        pool.resize(1)
+        assert len(pool) == 1
+        pool.clear()
+        assert pool.info() == PoolInfo(0, 0, 0, 1, 0)
+
+    def test_aliases(self):
+        """Test values are found by alias."""
+        pool = InternPool(maxsize=1)
+        value = pool.intern((1,), "one")
+        assert pool.get("one") is value
+        assert pool.intern((1,), "uno") is value
+        assert pool.get("one") is None
+        assert pool.get("uno") is value
+
+    def test_unbounded(self):
+        """Test nothing is evicted without a maximum size."""
+        pool = InternPool(maxsize=None)
+        for number in range(100):
+            pool.intern(number)
+        assert pool.info().currsize == 100
+        assert pool.info().evictions == 0
+
+
+class TestFrozenModels:
+    """Frozen visual acuity and prescription testing."""
+
+    @pytest.mark.parametrize(
+        "build,same",
+        [
+            pytest.param(
+                lambda: FrozenVisualAcuity("6/9"),
+                lambda: FrozenVisualAcuity(numerator=6, denominator=9),
+                id="Visual acuity",
+            ),
+            pytest.param(
+                lambda: FrozenPrescription("+1.00/-0.50x90 add +2.00"),
+                lambda: Prescription(
+                    sphere=1, cylinder=-0.5, axis=90, add={"add": 2}
+                ).freeze(),
+                id="Prescription",
+            ),
+        ],
+    )
+    def test_interned(self, build, same):
+        """Test equal values share one instance, also after pickling."""
+        model = build()
+        assert build() is model
+        assert same() is model
+        assert model.freeze() is model
+        assert deepcopy(model) is model
+        assert pickle.loads(pickle.dumps(model)) is model
+        assert model == model.thaw()
+        assert model.thaw() == model
+        assert hash(model) == hash(same())
+
+    def test_shared_sub_models(self):
+        """Test adds and prisms are frozen and shared too."""
+        rx = FrozenPrescription(sphere=-1, add={"add": 2})
+        other = FrozenPrescription(sphere=-2, add={"add": 2})
+        assert rx.add is other.add
+        assert rx.horizontal_prism is other.horizontal_prism
+        rx = FrozenPrescription(extra_adds=[{"add": 1}])
+        assert rx.extra_adds == (rx.add.__class__(add=1),)
+
+    @pytest.mark.parametrize(
+        "change,error,message",
+        [
+            pytest.param(
+                lambda: FrozenVisualAcuity("6/9").convert_unit("ft"),
+                VisualAcuityError,
+                "FrozenVisualAcuity cannot be changed, use thaw() for a mutable copy",
+                id="Visual acuity",
+            ),
+            pytest.param(
+                lambda: FrozenPrescription("-1.00/-1.00x90").transpose(),
+                PrescriptionError,
+                "FrozenPrescription cannot be changed, use thaw() for a mutable copy",
+                id="Prescription",
+            ),
+            pytest.param(
+                lambda: setattr(FrozenPrescription().add, "add", 1),
+                PrescriptionError,
+                "FrozenAdd cannot be changed, use thaw() for a mutable copy",
+                id="Add",
+            ),
+        ],
+    )
+    def test_immutable(self, change, error, message):
+        """Test frozen models cannot be changed."""
+        with pytest.raises(error) as excinfo:
+            change()
+        assert excinfo.value.message == message
+
+    def test_thaw(self):
+        """Test thawed copies are mutable and independent."""
+        va = VisualAcuity("6/6").freeze().thaw()
+        va.convert_unit("ft")
+        assert str(va) == "20/20"
+        assert str(FrozenVisualAcuity("6/6")) == "6/6"
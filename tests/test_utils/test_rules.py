@@ -0,0 +1,70 @@
+"""Testing validation rules shared by models and batches."""
+
+import numpy as np
+import pytest
+
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.prescription.rules import AXIS
+from optom_tools.utils import Rule, check_rules
+
+NEGATIVE = Rule(message="Must be positive", invalid=lambda value: value < 0)
+
+
+class Columns:
+    """A minimal batch."""
+
+    def __init__(self, **columns):
+        """Set each column as an attribute."""
+        self.__dict__.update(
+            {name: np.asarray(value) for name, value in columns.items()}
+        )
+
+
+class TestRule:
+    """Testing `Rule`."""
+
+    @pytest.mark.parametrize(
+        "value,expectation",
+        [
+            pytest.param(0, False, id="lower limit"),
+            pytest.param(180, False, id="upper limit"),
+            pytest.param(-0.5, True, id="ERROR below"),
+            pytest.param(180.5, True, id="ERROR above"),
+        ],
+    )
+    def test_scalar_and_array_agree(self, value, expectation):
+        """Test a rule gives the same answer for a value and a column."""
+        assert bool(AXIS.invalid(value)) is expectation
+        assert AXIS.invalid(np.array([value])).tolist() == [expectation]
+
+    def test_check(self):
+        """Test checking raises the package error with the rule message."""
+        assert AXIS.check(90, PrescriptionError) == 90
+        with pytest.raises(PrescriptionError) as excinfo:
+            AXIS.check(200, PrescriptionError)
+        assert excinfo.value.value == 200
+        assert excinfo.value.message == AXIS.message
+
+
+class TestCheckRules:
+    """Testing `check_rules` and `ValidationReport`."""
+
+    def test_report(self):
+        """Test codes, masks, summary and messages."""
+        batch = Columns(a=[1, -1, -1, 2], b=[1, 1, -1, np.nan])
+        report = check_rules(
+            batch, [("a", NEGATIVE), ("b", NEGATIVE._replace(message="B"))]
+        )
+        assert report.codes.tolist() == [0, 1, 3, 0]
+        assert report.valid.tolist() == [True, False, False, True]
+        assert report.invalid_rows().tolist() == [1, 2]
+        assert report.mask("b").tolist() == [False, False, True, False]
+        assert report.summary() == {"a": 2, "b": 1}
+        assert report.errors(0) == []
+        assert report.errors(2) == ["Must be positive", "B"]
+
+    def test_empty(self):
+        """Test an empty batch gives an empty report."""
+        report = check_rules(Columns(a=[]), [("a", NEGATIVE)])
+        assert report.codes.tolist() == []
+        assert report.summary() == {"a": 0}
@@ -0,0 +1,67 @@
+"""Testing trusted construction helpers."""
+
+import threading
+
+import pytest
+
+from optom_tools import Prescription, VisualAcuity
+from optom_tools.prescription.exceptions import PrescriptionError
+from optom_tools.prescription.models import Add
+from optom_tools.utils import no_assignment_validation
+
+
+class TestValidation:
+    """Test skipping validation for trusted data."""
+
+    def test_prescription_from_trusted(self):
+        """Test from_trusted() matches the validating constructor."""
+        kwargs = {
+            "sphere": 1.0,
+            "cylinder": -1.0,
+            "axis": 90.0,
+            "add": {"add": 2.0, "working_distance_cm": 33.0},
+            "extra_adds": [{"add": 1.0}],
+        }
+        rx = Prescription.from_trusted(**kwargs)
+        assert isinstance(rx.add, Add)
+        assert isinstance(rx.extra_adds[0], Add)
+        assert rx == Prescription(**kwargs)
+
+    def test_from_trusted_skips_validation(self):
+        """Test from_trusted() does not validate."""
+        assert Prescription.from_trusted(axis=190).axis == 190
+        assert VisualAcuity.from_trusted(numerator=-6).numerator == -6
+
+    def test_visual_acuity_from_trusted(self):
+        """Test from_trusted() for visual acuities."""
+        va = VisualAcuity.from_trusted(numerator=20, denominator=40, unit="ft")
+        assert va == VisualAcuity("20/40")
+
+    def test_no_assignment_validation(self):
+        """Test assignments are only validated outside the block."""
+        rx = Prescription()
+        with no_assignment_validation():
+            with no_assignment_validation():
+                rx.axis = 190
+            rx.add.add = -1
+            VisualAcuity().numerator = -1
+        assert rx.axis == 190
+        with pytest.raises(PrescriptionError):
+            rx.axis = 200
+
+    def test_no_assignment_validation_threads(self):
+        """Test other threads keep validating during the block."""
+        errors = []
+
+        def worker():
+            try:
+                Prescription().axis = 190
+            except PrescriptionError as exc:
+                errors.append(exc)
+
+        with no_assignment_validation():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        assert len(errors) == 1
+        assert Prescription.__config__.validate_assignment
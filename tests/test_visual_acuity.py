@@ -1,12 +1,16 @@
 """Tests for visual_acuity module."""
 
 import math
+import threading
 from contextlib import nullcontext as does_not_raise
 from decimal import Decimal
+from fractions import Fraction
 
 import pytest
 
 from optom_tools import VisualAcuity
+from optom_tools.visual_acuity import numeric_backend
+from optom_tools.visual_acuity import visual_acuity as visual_acuity_module
 from optom_tools.visual_acuity.exceptions import VisualAcuityError
 
 
@@ -205,3 +209,97 @@ class TestVisualAcuity:
         """Test visual acuity conversion to logmar."""
         va = VisualAcuity(**test_input)
         assert va.logmar == expected
+
+    @pytest.mark.parametrize(
+        "test_input,expected",
+        [
+            pytest.param("6/12", "6/12", id="Chart line"),
+            pytest.param("20/40", "20/40", id="Chart line in feet"),
+            pytest.param("6/9", "6/9.5", id="Snellen line"),
+            pytest.param("6/10.5", "6/9.5", id="Between lines"),
+            pytest.param("20/35", "20/32", id="Between lines in feet"),
+            pytest.param("3/6", "6/12", id="Other test distance"),
+            pytest.param("6/200", "6/120", id="Below the chart"),
+            pytest.param("6/2", "6/3", id="Above the chart"),
+        ],
+    )
+    def test_snap_to_chart(self, test_input, expected):
+        """Test snapping to the nearest chart line."""
+        va = VisualAcuity(test_input)
+        line = va.chart_line
+        va.snap_to_chart()
+        assert str(va) == expected
+        assert va.chart_line == line
+
+    def test_precomputed_chart_values(self, monkeypatch):
+        """Test values looked up for chart lines match computed ones."""
+        for (numerator, denominator, unit), derived in list(
+            visual_acuity_module._DERIVED.items()
+        ):
+            va = VisualAcuity(
+                numerator=numerator, denominator=denominator, unit=unit
+            )
+            with monkeypatch.context() as patch:
+                patch.setattr(visual_acuity_module, "_DERIVED", {})
+                assert (va.ft, va.m) == derived
+
+    @pytest.mark.parametrize(
+        "mode,places,expected",
+        [
+            pytest.param(
+                "float", None, (6 / 9, math.log10(6 / 9)), id="float"
+            ),
+            pytest.param(
+                "decimal",
+                None,
+                (Decimal("0.6667"), Decimal("-0.1761")),
+                id="decimal",
+            ),
+            pytest.param(
+                "decimal",
+                2,
+                (Decimal("0.67"), Decimal("-0.18")),
+                id="decimal places",
+            ),
+            pytest.param(
+                "fraction",
+                None,
+                (Fraction(2, 3), Fraction("-0.1761")),
+                id="fraction",
+            ),
+        ],
+    )
+    def test_numeric_backend(self, mode, places, expected):
+        """Test the number type of decimal and logmar values."""
+        va = VisualAcuity("6/9")
+        with numeric_backend.use(mode, places):
+            assert (va.decimal, va.logmar) == expected
+            assert type(va.decimal) is type(expected[0])
+        assert numeric_backend.mode == "float"
+        assert numeric_backend.places == 4
+
+    def test_numeric_backend_error(self):
+        """Test unknown modes are rejected."""
+        with pytest.raises(VisualAcuityError) as excinfo:
+            numeric_backend.set("double")
+        assert (
+            excinfo.value.message
+            == "Numeric mode must be 'float', 'decimal' or 'fraction'"
+        )
+        assert numeric_backend.mode == "float"
+
+    def test_numeric_backend_threads(self):
+        """Test a mode set in one thread does not leak into another."""
+        seen = []
+
+        def worker():
+            numeric_backend.set("fraction")
+            seen.append(VisualAcuity("6/9").decimal)
+
+        with numeric_backend.use("decimal", 2):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert VisualAcuity("6/9").decimal == Decimal("0.67")
+        assert seen == [Fraction(2, 3)]
+        assert numeric_backend.mode == "float"
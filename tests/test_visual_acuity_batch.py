@@ -0,0 +1,170 @@
+"""Tests for visual acuity batches."""
+
+import numpy as np
+import pytest
+
+from optom_tools import PrescriptionBatch, VisualAcuity, VisualAcuityBatch
+from optom_tools.visual_acuity import numeric_backend
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+VISUAL_ACUITIES = [
+    VisualAcuity("6/6"),
+    VisualAcuity("6/12"),
+    VisualAcuity("6/120"),
+    VisualAcuity("20/20"),
+    VisualAcuity("20/200"),
+    VisualAcuity(numerator=6, denominator=7.5),
+    VisualAcuity(numerator=20, denominator=10, unit="ft"),
+]
+
+
+class TestVisualAcuityBatch:
+    """Testing methods and attributes for `VisualAcuityBatch`."""
+
+    def test_round_trip(self):
+        """Test converting to and from visual acuities."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        assert len(batch) == len(VISUAL_ACUITIES)
+        assert batch.to_visual_acuities() == VISUAL_ACUITIES
+        assert batch[4] == VISUAL_ACUITIES[4]
+        assert batch[:2].to_visual_acuities() == VISUAL_ACUITIES[:2]
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_save_and_load(self, tmp_path, mmap):
+        """Test a saved batch loads with the same values."""
+        VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES).save(tmp_path)
+        batch = VisualAcuityBatch.load(tmp_path, mmap=mmap)
+        assert batch.to_visual_acuities() == VISUAL_ACUITIES
+        assert batch[6] == VISUAL_ACUITIES[6]
+        assert batch[2:4].to_visual_acuities() == VISUAL_ACUITIES[2:4]
+        batch.convert_unit("m")
+        assert VisualAcuityBatch.load(tmp_path).to_visual_acuities() == (
+            VISUAL_ACUITIES
+        )
+
+    def test_save_and_load_empty(self, tmp_path):
+        """Test saving an empty batch."""
+        VisualAcuityBatch.from_visual_acuities([]).save(tmp_path)
+        assert len(VisualAcuityBatch.load(tmp_path)) == 0
+
+    def test_load_other_batch_error(self, tmp_path):
+        """Test loading a saved prescription batch."""
+        PrescriptionBatch(sphere=[1]).save(tmp_path)
+        with pytest.raises(VisualAcuityError) as excinfo:
+            VisualAcuityBatch.load(tmp_path)
+        assert (
+            excinfo.value.message == "Saved batch is not a VisualAcuityBatch"
+        )
+
+    def test_empty(self):
+        """Test an empty batch."""
+        batch = VisualAcuityBatch.from_visual_acuities([])
+        assert len(batch) == 0
+        assert batch.ft.tolist() == []
+
+    def test_decimal_and_logmar(self):
+        """Test decimal and logmar match the scalar model exactly."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        assert batch.decimal.tolist() == [va.decimal for va in VISUAL_ACUITIES]
+        assert batch.logmar.tolist() == [va.logmar for va in VISUAL_ACUITIES]
+
+    @pytest.mark.parametrize("prop", ["ft", "m"])
+    def test_snellen_strings(self, prop):
+        """Test ft and m match the scalar model."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        assert getattr(batch, prop).tolist() == [
+            getattr(va, prop) for va in VISUAL_ACUITIES
+        ]
+        assert batch.to_strings().tolist() == [
+            str(va) for va in VISUAL_ACUITIES
+        ]
+
+    @pytest.mark.parametrize("flag", ["ft", "m"])
+    def test_convert_unit(self, flag):
+        """Test convert_unit() matches the scalar method."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        batch.convert_unit(flag)
+        expected = [va.copy() for va in VISUAL_ACUITIES]
+        for va in expected:
+            va.convert_unit(flag)
+        assert batch.to_visual_acuities() == expected
+
+    def test_convert_unit_flag_error(self):
+        """Test convert_unit() rejects unknown flags."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        with pytest.raises(VisualAcuityError) as excinfo:
+            batch.convert_unit("wrong flag")
+        assert (
+            excinfo.value.message
+            == "Method convert_unit() only accepts flags 'ft' and 'm'"
+        )
+
+    def test_from_logmar(self):
+        """Test building a batch from logmar values."""
+        logmar = np.array([0.0, -0.3, -1.0])
+        batch = VisualAcuityBatch.from_logmar(logmar)
+        np.testing.assert_allclose(batch.logmar, logmar)
+        assert batch.to_strings().tolist() == ["6/6", "6/12", "6/60"]
+
+    @pytest.mark.parametrize(
+        "test_input,exception_message",
+        [
+            pytest.param(
+                {"numerator": [6, 6], "denominator": [6, 6, 6]},
+                "All batch columns must have the same length",
+                id="ERROR length mismatch",
+            ),
+            pytest.param(
+                {"numerator": 6, "denominator": 6, "unit": "yd"},
+                "Unit must be either 'ft' or 'm'",
+                id="ERROR unit",
+            ),
+        ],
+    )
+    def test_initialising_object(self, test_input, exception_message):
+        """Test batch initialisation errors."""
+        with pytest.raises(VisualAcuityError) as excinfo:
+            VisualAcuityBatch(**test_input)
+        assert excinfo.value.message == exception_message
+
+    def test_validate(self):
+        """Test negative distances are flagged without raising."""
+        batch = VisualAcuityBatch([6, -6, 6], [6, 12, -1])
+        report = batch.validate()
+        assert report.valid.tolist() == [True, False, False]
+        assert report.codes.tolist() == [0, 1, 2]
+        assert report.summary() == {"numerator": 1, "denominator": 1}
+        assert report.mask("denominator").tolist() == [False, False, True]
+        with pytest.raises(VisualAcuityError) as excinfo:
+            VisualAcuity(numerator=-6, denominator=12)
+        assert report.errors(1) == [excinfo.value.message]
+
+    def test_snap_to_chart(self):
+        """Test snapping matches the scalar method."""
+        visual_acuities = VISUAL_ACUITIES + [
+            VisualAcuity(value)
+            for value in ["6/10.5", "20/35", "6/9", "3/6", "6/200", "6/2"]
+        ]
+        batch = VisualAcuityBatch.from_visual_acuities(visual_acuities)
+        np.testing.assert_array_equal(
+            batch.chart_logmar,
+            [va.chart_line.logmar for va in visual_acuities],
+        )
+        batch.snap_to_chart()
+        expected = [va.copy() for va in visual_acuities]
+        for va in expected:
+            va.snap_to_chart()
+        assert batch.to_visual_acuities() == expected
+
+    @pytest.mark.parametrize("mode", ["float", "decimal", "fraction"])
+    def test_numeric_backend(self, mode):
+        """Test every numeric mode matches the scalar model exactly."""
+        batch = VisualAcuityBatch.from_visual_acuities(VISUAL_ACUITIES)
+        with numeric_backend.use(mode):
+            assert batch.decimal.tolist() == [
+                va.decimal for va in VISUAL_ACUITIES
+            ]
+            assert batch.logmar.tolist() == [
+                va.logmar for va in VISUAL_ACUITIES
+            ]
+            assert batch[:0].logmar.tolist() == []
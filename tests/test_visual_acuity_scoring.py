@@ -0,0 +1,100 @@
+"""Tests for letter by letter chart scoring."""
+
+from contextlib import nullcontext as does_not_raise
+
+import numpy as np
+import pytest
+
+from optom_tools import VisualAcuity
+from optom_tools.visual_acuity import ETDRS
+from optom_tools.visual_acuity.exceptions import VisualAcuityError
+
+
+def _readings():
+    """Give a reading for every possible ETDRS letter total."""
+    table = np.zeros((71, 14), dtype=int)
+    for letters in range(71):
+        full, part = divmod(letters, 5)
+        table[letters, :full] = 5
+        if full < 14:
+            table[letters, full] = part
+    return table
+
+
+class TestLetterChart:
+    """Testing scoring of `LetterChart`."""
+
+    @pytest.mark.parametrize(
+        "letters,start_line,expected",
+        [
+            pytest.param([], 0, (0, -1.1, 30), id="No letters"),
+            pytest.param([5], 0, (5, -1.0, 35), id="Top line"),
+            pytest.param([5] * 7 + [3], 0, (38, -0.34, 68), id="Part line"),
+            pytest.param([5, 2], 12, (67, 0.24, 97), id="Start line"),
+            pytest.param([5] * 14, 0, (70, 0.3, 100), id="Whole chart"),
+        ],
+    )
+    def test_score_lines(self, letters, start_line, expected):
+        """Test scoring letters read per line."""
+        score = ETDRS.score_lines(letters, start_line=start_line)
+        assert (score.letters, score.logmar, score.etdrs_score) == expected
+
+    def test_score_letters(self):
+        """Test scoring letter by letter marks."""
+        marks = [True] * 5 + [True, False, True, False, False] + [True]
+        score = ETDRS.score_letters(marks, start_line=3)
+        assert score == ETDRS.score_lines([5, 2, 1], start_line=3)
+
+    @pytest.mark.parametrize(
+        "letters,start_line,exception",
+        [
+            pytest.param([5, 4], 12, does_not_raise(), id="Last lines"),
+            pytest.param(
+                [5, 4],
+                13,
+                pytest.raises(VisualAcuityError),
+                id="ERROR past chart",
+            ),
+            pytest.param(
+                [5],
+                -1,
+                pytest.raises(VisualAcuityError),
+                id="ERROR start line",
+            ),
+            pytest.param(
+                [6], 0, pytest.raises(VisualAcuityError), id="ERROR letters"
+            ),
+        ],
+    )
+    def test_errors(self, letters, start_line, exception):
+        """Test readings off the chart are rejected by both paths."""
+        with exception:
+            ETDRS.score_lines(letters, start_line=start_line)
+        with exception:
+            ETDRS.score_table([letters], start_line=start_line)
+
+    def test_score_table(self):
+        """Test table scores match scoring rows one by one."""
+        table = _readings()
+        scores = ETDRS.score_table(table)
+        expected = [ETDRS.score_lines(row.tolist()) for row in table]
+        assert scores.letters.tolist() == [s.letters for s in expected]
+        assert scores.logmar.tolist() == [s.logmar for s in expected]
+        np.testing.assert_array_equal(scores.etdrs_score, np.arange(30, 101))
+        starts = ETDRS.score_table(
+            table[:, :2], start_line=[0, 5, 12] * 23 + [0, 3]
+        )
+        assert starts.letters[1] == 25 + table[1, :2].sum()
+
+    def test_to_visual_acuity(self):
+        """Test scores convert to visual acuities with the same logMAR."""
+        score = ETDRS.score_lines([5] * 8)
+        assert score.to_visual_acuity() == VisualAcuity(
+            numerator=4, denominator=4 / 10**-0.3, unit="m"
+        )
+        chart = ETDRS._replace(top_logmar=-1.0, distance=20, unit="ft")
+        scores = chart.score_table(_readings()[::5])
+        batch = scores.to_batch()
+        assert batch.to_strings()[0] == "20/251.8"
+        assert batch.to_strings()[11] == "20/20"
+        np.testing.assert_allclose(batch.logmar, scores.logmar, atol=1e-12)